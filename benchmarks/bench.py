@@ -0,0 +1,338 @@
+"""
+Benchmarks of the robot engine, rendering and map files
+
+SYNTAX:
+    python benchmarks/bench.py [-o results.json] [-b baseline.json] [-t 1.5] [-f 5e-6] [--quick]
+    python benchmarks/bench.py --save-baseline
+
+The graphic window is rendered by the Agg backend ( no display is needed ).
+All values are seconds per operation ( less is better ). If the baseline file exists,
+the results are compared with it and the exit code is 1, when some benchmark
+is slower than the baseline more than threshold times.
+
+The results are written to benchmarks/bench_results.json by default ( not committed ).
+baseline.json is the reference of the engine after the optimizations, so it catches
+the regressions of the current code, it is not the measure of the original engine.
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tempfile
+import contextlib
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from robot import Robot
+from robot.bug import Bug
+from robot.robot_engine.model import FieldModel
+from robot.robot_engine.mapfile import save_map
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_results.json')
+
+
+def make_map(path, size, density=0.2, seed=0, frame=True):
+    """ Create map file with random partitions, the way from the upper left cell to the lower right one exists """
+
+    rng = np.random.RandomState(seed)
+    n, m = size
+    while True:
+        model = FieldModel.from_arrays(size, rng.rand(n, m) < density, rng.rand(n, m) < density,
+                                       np.zeros(size, bool), rng.randint(-10, 10, size=size), frame)
+        if model.is_reachable((0, m - 1), (n - 1, 0)):
+            break
+    save_map(path, model, 'Robot', [0, 0], 0.5)
+    return path
+
+
+def timeit(func, number=1, repeat=5):
+    """ Min time of one call of func ( seconds ) """
+
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - t) / number)
+    return best
+
+
+def close(r):
+    """ Close the window of the robot """
+    if not r.hRobotEngine.headless:
+        r.hRobotEngine.hField.close()
+
+
+def walker(r, sides='nosw'):
+    """ Returns the function of one robot command sequence: check the partition, step or turn, mark """
+
+    state = {'i': 0}
+
+    def commands():
+        side = sides[state['i'] % 4]
+        if r.is_bord(side):
+            state['i'] += 1
+        else:
+            r.step(side)
+        if not r.is_mark():
+            r.mark()
+
+    return commands
+
+
+def bench_commands(tmp, quick):
+    """ Throughput of the robot commands: headless, window without effects, window with effects """
+
+    results = {}
+    path = make_map(os.path.join(tmp, 'commands.map'), [30, 30])
+    empty = make_map(os.path.join(tmp, 'empty.map'), [30, 30], density=0)
+    number = 200 if quick else 1000
+
+    for mode in ['headless', 'noeffects', 'effects']:
+        r = Robot(empty, headless=(mode == 'headless'))
+        r._delay_off()
+        if mode == 'noeffects':
+            r._effects_off()
+
+        # the robot goes to and fro, the time of one step
+        results['commands.step.' + mode] = timeit(lambda: (r.step('o'), r.step('w')), number // 2) / 2
+        # the same steps as one batch, the time of one step
+        results['commands.run.' + mode] = timeit(lambda: r.run(['o', 'w'] * 50), max(number // 100, 1)) / 100
+        close(r)
+
+        r = Robot(path, headless=(mode == 'headless'))
+        r._delay_off()
+        if mode == 'noeffects':
+            r._effects_off()
+
+        results['commands.is_bord.' + mode] = timeit(lambda: r.is_bord('o'), number)
+        results['commands.is_mark.' + mode] = timeit(r.is_mark, number)
+        results['commands.sense.' + mode] = timeit(r.sense, number)
+        results['commands.mark.' + mode] = timeit(r.mark, number)
+        results['commands.walk.' + mode] = timeit(walker(r), number)
+        close(r)
+
+    return results
+
+
+def bench_render(tmp, quick):
+    """ Cost of the robot step and of the full redraw for different field sizes """
+
+    results = {}
+    sizes = [10, 50] if quick else [10, 50, 100, 200]
+
+    for size in sizes:
+        path = make_map(os.path.join(tmp, 'render%d.map' % size), [size, size], density=0.1)
+        r = Robot(path)
+        r._delay_off()
+        canvas = r.hRobotEngine.hField.hFig.canvas
+        body = r.hRobotEngine.hRobot
+
+        results['render.full_draw.%d' % size] = timeit(canvas.draw, 3)
+        results['render.robot_shift.%d' % size] = timeit(lambda: body.shift([0, 0], 'vector'), 50)
+        close(r)
+
+    return results
+
+
+def bench_layers(tmp, quick):
+    """ Clear and reload of the partitions and markers layers, edit of one partition and one marker """
+
+    results = {}
+    size = 100 if quick else 200
+    path = make_map(os.path.join(tmp, 'layers%d.map' % size), [size, size], density=0.3)
+    r = Robot(path)
+    field = r.hRobotEngine.hField
+    # the markers in the cells with the West partitions
+    for i, j in zip(*field.model.hVerBord.nonzero()):
+        field.model.set_mark(i, j)
+
+    def edit():
+        field.borders.add('ver', 1, 1)
+        field.borders.remove('ver', 1, 1)
+        field.markers.add(1, 1)
+        field.markers.remove(1, 1)
+
+    def reload():
+        field.borders.clear()
+        field.markers.clear()
+        field.borders_restore()
+        field.markers_restore()
+
+    results['layers.reload.%d' % size] = timeit(reload, 5)
+    results['layers.edit.%d' % size] = timeit(edit, 5)
+    close(r)
+
+    return results
+
+
+def bench_mapfiles(tmp, quick):
+    """ Save and restore of the field """
+
+    results = {}
+    sizes = [50] if quick else [50, 200, 1000]
+
+    for size in sizes:
+        path = make_map(os.path.join(tmp, 'io%d.map' % size), [size, size], density=0.1)
+        for mode in ['headless', 'window']:
+            r = Robot(path, headless=(mode == 'headless'))
+            field = r.hRobotEngine.hField
+            if mode == 'headless':
+                results['mapfile.save.%s.%d' % (mode, size)] = timeit(lambda: field.save(path), 5)
+            else:
+                results['mapfile.save.%s.%d' % (mode, size)] = timeit(lambda: field.save(False), 5)
+            results['mapfile.restore.%s.%d' % (mode, size)] = timeit(field.restore, 5)
+            close(r)
+
+    return results
+
+
+def bench_bug(tmp, quick):
+    """ Bug in the generated mazes """
+
+    results = {}
+    path = make_map(os.path.join(tmp, 'bug_small.map'), [15, 15], density=0.25, seed=1)
+    b = Bug(path, delay=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results['bug.go.15'] = timeit(b.go, 1, 1)
+    results['bug.go_fast.15'] = timeit(lambda: b.go(fast=True))
+    close(b.r)
+
+    size = 100 if quick else 300
+    path = make_map(os.path.join(tmp, 'bug_big.map'), [size, size], density=0.2, seed=3)
+    b = Bug(path, delay=0)
+    results['bug.go_fast.%d' % size] = timeit(lambda: b.go(fast=True))
+    close(b.r)
+
+    return results
+
+
+def bench_import(tmp, quick):
+    """ Import of the package and the first headless robot in the new interpreter ( without its start ) """
+
+    results = {}
+    path = make_map(os.path.join(tmp, 'import.map'), [10, 10])
+    scripts = {
+        'import.robot': 'import robot',
+        'import.headless': "import robot; robot.Robot(%r, headless=True).is_bord('n')" % path,
+    }
+    env = dict(os.environ, PYTHONPATH=ROOT, MPLBACKEND='Agg')
+    number = 3 if quick else 10
+
+    def interpreter(script):
+        return lambda: subprocess.run([sys.executable, '-c', script], env=env, cwd=tmp, check=True)
+
+    start = timeit(interpreter('pass'), number, 1)
+    for name, script in scripts.items():
+        results[name] = max(timeit(interpreter(script), number, 1) - start, 0)
+
+    return results
+
+
+BENCHMARKS = [bench_commands, bench_render, bench_layers, bench_mapfiles, bench_bug, bench_import]
+
+
+def run(quick=False, log=print):
+    """ Run all benchmarks, returns the dict of results """
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for bench in BENCHMARKS:
+            log(bench.__name__, '...')
+            results.update(bench(tmp, quick))
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'platform': platform.platform(),
+            'quick': quick,
+            'date': time.strftime('%Y-%m-%d %H:%M:%S')
+        },
+        'results': results
+    }
+
+
+def compare(results, baseline, threshold, floor=0):
+    """
+    Compare results with the baseline
+
+    :param threshold: - result / baseline ratio that is considered as a regression
+    :param floor: - difference of the times ( seconds ), that is considered as a noise
+
+    :return: list of ( name, value, baseline value, ratio, is regression )
+    """
+
+    rows = []
+    for name, value in sorted(results['results'].items()):
+        base = baseline['results'].get(name)
+        if base:
+            ratio = value / base
+            rows.append((name, value, base, ratio, ratio > threshold and value - base > floor))
+        else:
+            rows.append((name, value, None, None, False))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of the robot engine')
+    parser.add_argument('-o', '--output', default=RESULTS, help='JSON file for the results')
+    parser.add_argument('-b', '--baseline', default=BASELINE, help='JSON file of the baseline results')
+    parser.add_argument('-t', '--threshold', type=float, default=1.5,
+                        help='result / baseline ratio that is considered as a regression')
+    parser.add_argument('-f', '--floor', type=float, default=5e-6,
+                        help='difference of the times ( seconds ), that is considered as a noise')
+    parser.add_argument('--quick', action='store_true', help='smaller fields and fewer commands')
+    parser.add_argument('--save-baseline', action='store_true', help='save the results as the baseline')
+    args = parser.parse_args(argv)
+
+    results = run(args.quick)
+
+    output = args.baseline if args.save_baseline else args.output
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print('results are saved to', output)
+
+    if args.save_baseline or not os.path.isfile(args.baseline):
+        for name, value in sorted(results['results'].items()):
+            print('{:40} {:12.6f}'.format(name, value))
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    if baseline['meta'].get('quick') != results['meta']['quick']:
+        print('warning: the baseline was made with the other --quick option')
+
+    rows = compare(results, baseline, args.threshold, args.floor)
+    regressions = 0
+    for name, value, base, ratio, is_regression in rows:
+        if base is None:
+            print('{:40} {:12.6f} {:>12} {:>7}'.format(name, value, '-', '-'))
+        else:
+            print('{:40} {:12.6f} {:12.6f} {:7.2f} {}'.format(name, value, base, ratio,
+                                                             'REGRESSION' if is_regression else ''))
+        regressions += is_regression
+
+    if regressions:
+        print(regressions, 'regression(s) against', args.baseline)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,8 @@
+import time
 import numpy as np
 from ..robot import Robot
 from ..robot_engine.helpers import decode_side
+from ..robot_engine.model import BORD_N, BORD_O, BORD_S, BORD_W
 
 
 class BugException(Exception):
@@ -41,9 +43,9 @@ class Bug:
 
         self.hVerBord = self.r.hRobotEngine.hField.hVerBord
         self.hHorBord = self.r.hRobotEngine.hField.hHorBord
-        self.statusBar = self.r.hRobotEngine.hField.hFig.canvas.manager.statusbar
+        self.statusBar = getattr(getattr(self.r.hRobotEngine.hField.hFig.canvas, 'manager', None), 'statusbar', None)
 
-    def go(self):
+    def go(self, fast: bool = False, replay: bool = False, speed=None):
         """
         The bug always starts its movement from the upper left corner,
         and the exit is always in the lower right corner.
@@ -61,9 +63,22 @@ class Bug:
         It should be noted that moving according to this algorithm,
         the bug will always reach the output in the case, when there is a way out.
 
+        :param fast: - the way is computed on the partitions of the field ( see simulate ),
+                       the robot is placed to the exit without animation
+        :param replay: - ( with fast ) the computed way is shown by the robot ( see replay )
+        :param speed: - ( with replay ) number of steps per second
         :return: n - count of steps
         """
 
+        if fast:
+            n, path = self.simulate()
+            if replay:
+                self.replay(path, speed)
+            else:
+                self.r.hRobotEngine.hRobot.shift(path[-1], 'punct')
+                self._set_status(n)
+            return n
+
         self._check_field()
 
         self.r.hRobotEngine.hRobot.shift((0, self.field_size[1] - 1), 'punct')
@@ -81,22 +96,24 @@ class Bug:
                 ky2 = ky
                 n += 1
 
-                if not self.r.is_bord('s'):
+                bord = self.r.sense()
+
+                if not bord.s:
                     down = field[ky + 1][kx]
                 else:
                     down = big
 
-                if not self.r.is_bord('o'):
+                if not bord.o:
                     right = field[ky][kx + 1]
                 else:
                     right = big
 
-                if not self.r.is_bord('n'):
+                if not bord.n:
                     up = field[ky - 1][kx]
                 else:
                     up = big
 
-                if not self.r.is_bord('w'):
+                if not bord.w:
                     left = field[ky][kx - 1]
                 else:
                     left = big
@@ -136,9 +153,87 @@ class Bug:
                 ky = ky2
 
             self.r.step(decode_side(side))
-            self.statusBar.set_message('Steps count: ' + str(n))
+            self._set_status(n)
             print(n)
 
+    def simulate(self):
+        """
+        Runs the algorithm of the bug ( see go ) on the partitions of the field
+        without moving the robot
+
+        :return: n - count of steps,
+                 path - matrix (n + 1) x 2 of the cells of the bug way ( from the upper left cell to the exit )
+        """
+
+        self._check_field()
+
+        n, m = self.field_size
+        cells = self.r.hRobotEngine.hField.model.cells.ravel().tolist()
+        visits = [0] * (n * m)  # number of visits of the cell
+
+        # index of the cell x, y in the flattened matrix = x * m + y
+        k = m - 1
+        finish = (n - 1) * m
+        moves = (1, m, -1, -m)  # shifts of the index for the sides: North, East, South, West
+        side = 2
+        big = 1e+9
+        path = [k]
+        while k != finish:
+            c = cells[k]
+            up = big if c & BORD_N else visits[k + 1]
+            right = big if c & BORD_O else visits[k + m]
+            down = big if c & BORD_S else visits[k - 1]
+            left = big if c & BORD_W else visits[k - m]
+
+            cur = (up, right, down, left)[side]
+            if cur <= down and cur <= right and cur <= up and cur <= left:
+                pass
+            elif down <= right and down <= up and down <= left:
+                side = 2
+            elif right <= down and right <= up and right <= left:
+                side = 1
+            elif up <= right and up <= down and up <= left:
+                side = 0
+            else:
+                side = 3
+
+            visits[k] += 1
+            k += moves[side]
+            path.append(k)
+
+        path = np.array(path)
+        return len(path) - 1, np.stack((path // m, path % m), axis=1)
+
+    def replay(self, path, speed=None):
+        """
+        Shows the computed way of the bug ( see simulate ): the robot is moved along the path
+
+        :param path: - matrix of the cells of the way
+        :param speed: - number of steps per second ( None - as fast as possible ),
+                        the window is redrawn not more often than 25 frames per second
+        """
+
+        engine = self.r.hRobotEngine
+        engine.set_render_policy(fps=25)
+        try:
+            engine.hRobot.shift(path[0], 'punct')
+            t = time.perf_counter()
+            for n in range(1, len(path)):
+                engine.hRobot.shift(path[n] - path[n - 1], 'vector')
+                if speed:
+                    pause = t + n / speed - time.perf_counter()
+                    if pause > 0:
+                        time.sleep(pause)
+        finally:
+            engine.set_render_policy()
+
+        self._set_status(len(path) - 1)
+
+    def _set_status(self, n):
+        """ Show count of steps in the status bar of the window """
+        if self.statusBar:
+            self.statusBar.set_message('Steps count: ' + str(n))
+
     def _check_field(self):
         """
         Check if field is correct
@@ -157,23 +252,5 @@ class Bug:
         :return boolean
         """
 
-        field = np.zeros(self.field_size)
-        field[0][self.field_size[1] - 1] = 1
-        while True:
-            ok = False
-            for i in range(self.field_size[0]):
-                for j in range(self.field_size[1] - 1, -1, -1):
-                    if (not field[i][j]) and (
-                            (i > 0 and field[i - 1][j] == 1 and not self.hVerBord[i][j])
-                            or (i + 1 < self.field_size[0] and field[i + 1][j] == 1 and not self.hVerBord[i + 1][j])
-                            or (j > 0 and field[i][j - 1] == 1 and not self.hHorBord[i][j])
-                            or (j + 1 < self.field_size[1] and field[i][j + 1] == 1 and not self.hHorBord[i][j + 1])):
-
-                        ok = True
-                        field[i][j] = 1
-                        if (i == self.field_size[0] - 1) and (j == 0):
-                            return True
-            if not ok:
-                break
-
-        return False
+        # from the upper left cell to the lower right one
+        return self.r.hRobotEngine.hField.is_reachable((0, self.field_size[1] - 1), (self.field_size[0] - 1, 0))
@@ -37,6 +37,26 @@ class SideRotValueError(RobotException):
     message = __doc__
 
 
+class CollisionError(RobotException):
+    """The cell is occupied by another robot"""
+    message = __doc__
+
+
+class StepsValueError(RobotException):
+    """Not admissible number of steps, it must be a non-negative integer"""
+    message = __doc__
+
+
+class EndlessWalkError(RobotException):
+    """The robot would walk endlessly: there is no border ( marker ) in the given direction"""
+    message = __doc__
+
+
+class BatchCommandError(RobotException):
+    """Not admissible command of the batch"""
+    message = __doc__
+
+
 class RobotTypeValueError(RobotException):
     """Wrong value for robot_type parameter"""
     message = __doc__
@@ -80,3 +100,23 @@ class FieldSizeValueError(RobotException):
 class IsFrameValueError(RobotException):
     """ Field is_frame value must be bool """
     message = __doc__
+
+
+class MapfileFormatError(RobotException):
+    """ Wrong format of the map file """
+    message = __doc__
+
+
+class TraceFormatError(RobotException):
+    """ Wrong format of the trace file """
+    message = __doc__
+
+
+class ExportFormatError(RobotException):
+    """ Unknown format of the animation file ( .gif, .mp4 or .png are supported ) """
+    message = __doc__
+
+
+class ExportWriterError(RobotException):
+    """ The writer of the animation is not available ( GIF needs Pillow, MP4 needs ffmpeg ) """
+    message = __doc__
@@ -0,0 +1,90 @@
+"""
+Converter of map files to the version 2 format
+
+SYNTAX:
+    python -m robot.mapconvert path [path ...] [-o outdir] [-r]
+
+WHERE:
+    - path - map file or directory with map files ( *.map )
+    - outdir - directory for the converted files ( files are converted in place by default )
+    - -r - search map files in the subdirectories too
+"""
+
+import os
+import sys
+import shutil
+import argparse
+from .robot_engine.mapfile import convert_map
+from .exceptions import MapfileFormatError
+
+
+def find_maps(path, recursive=False):
+    """
+    Returns paths of the map files of the directory path relative to path
+    """
+
+    if not recursive:
+        return sorted(name for name in os.listdir(path)
+                      if name.endswith('.map') and os.path.isfile(os.path.join(path, name)))
+
+    maps = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.map'):
+                maps.append(os.path.relpath(os.path.join(root, name), path))
+    return maps
+
+
+def convert_path(path, outdir=None, recursive=False, log=print):
+    """
+    Convert map file or all map files of the directory
+
+    :return: numbers of the converted, skipped ( already of the version 2 ) and failed files
+    """
+
+    if os.path.isdir(path):
+        files = [(os.path.join(path, name), name) for name in find_maps(path, recursive)]
+    else:
+        files = [(path, os.path.basename(path))]
+
+    converted = skipped = failed = 0
+    for src, name in files:
+        dst = os.path.join(outdir, name) if outdir else src
+        try:
+            if dst != src:
+                os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+            if convert_map(src, dst):
+                converted += 1
+                log('converted:', src)
+            else:
+                if dst != src:
+                    shutil.copyfile(src, dst)
+                skipped += 1
+                log('skipped ( version 2 ):', src)
+        except (MapfileFormatError, OSError) as e:
+            failed += 1
+            log('failed:', src, '-', e)
+
+    return converted, skipped, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m robot.mapconvert',
+                                     description='Convert robot map files to the version 2 format')
+    parser.add_argument('paths', nargs='+', help='map files or directories with map files')
+    parser.add_argument('-o', '--outdir', help='directory for the converted files ( in place by default )')
+    parser.add_argument('-r', '--recursive', action='store_true', help='search map files in subdirectories')
+    args = parser.parse_args(argv)
+
+    total = [0, 0, 0]
+    for path in args.paths:
+        counts = convert_path(path, args.outdir, args.recursive)
+        total = [t + c for t, c in zip(total, counts)]
+
+    print('converted: {}, skipped: {}, failed: {}'.format(*total))
+    return 1 if total[2] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,26 @@
-import matplotlib.pyplot as plt
+import inspect
+import contextlib
 from .robot_engine import RobotEngine
+from .robot_engine.robot_engine import SurroundingsRel
 from .exceptions import (WindowClosedError,
                          NotSaveError,
-                         SideRotValueError)
+                         SideRotValueError,
+                         BatchCommandError)
 from .robot_engine.helpers import mapfile_check
-from .robot_engine import star_control
 from .robot_engine.helpers import decode_side, encode_side
 
 
+# Sides of the commands of the robots ( see RobotBase.COMMANDS )
+SIDES = ('n', 'o', 's', 'w')
+ROT_SIDES = ('l', 'left', 'r', 'right', 'b', 'back')
+REL_SIDES = ('f', 'forward', 'l', 'left', 'r', 'right')
+
+
 class RobotBase:
 
+    # Commands of the batch ( see run ): name - admissible values of the side argument ( None - no side )
+    COMMANDS = {}
+
     def __init__(self, mapfile=None, delay=None, **params):
         """
         Robot - The constructor of a class
@@ -17,13 +28,15 @@ class RobotBase:
         SYNTAX:
            r = Robot()
            r = Robot( mapfile )
+           r = Robot( mapfile, headless=True )
+           r2 = RobotOrt( field=r, position=[ 3, 1 ], side=1 )
         WHERE:
         - mapfile = Name of a mat-file with initial conditions
         - r = The reference to the created object
 
         -------------------------------------------------------------
         All methods of a class Robot:
-         step, is_bord, mark, is_mark, get_tmpr
+         step, is_bord, mark, is_mark, get_tmpr, sense
 
         :param mapfile: Name of a mat-file with initial conditions
 
@@ -35,12 +48,19 @@ class RobotBase:
         In the 2nd case:
         - mapfile - the name of the file where the field situation is stored
 
+        In the 3rd case the robot works without graphic window ( no dialogs,
+        visual effects and delays ), the commands and their errors are the same
+
+        In the 4th case one more robot is put on the field of the robot r into the free cell:
+        the robots share the partitions and the markers, they are drawn in one window,
+        the robot can not move into the cell of another robot ( CollisionError )
+
         RESULT:
         - r = reference (handle ) to the created Robot class object
 
         -------------------------------------------------------------
         Robot command interface ( class methods ):
-            step, is_bord, mark, is_mark, get_tmpr
+            step, is_bord, mark, is_mark, get_tmpr, sense
 
         --------------------------------------------------------------
         Change ( install or edit ) the initial situation
@@ -103,7 +123,7 @@ class RobotBase:
 
         self.hRobotEngine = RobotEngine(self.mapfile, self.robot_type, delay, **params)
 
-        if self.hRobotEngine:
+        if self.hRobotEngine and not self.hRobotEngine.headless and self.hRobotEngine.number == 1:
             self.hRobotEngine.hField.hFig.robotdata = self
 
     def init_data(self):
@@ -176,14 +196,98 @@ class RobotBase:
         self._robot_check()
         return self.hRobotEngine.get_tmpr()
 
+    def sense(self):
+        """
+        Returns partitions on all sides, marker and temperature of a current cage
+        by one command ( one check of the robot, one visual effect and one delay )
+
+        SYNTAX:
+                res = r.sense()
+                if not res.o and not res.mark: ...
+
+        WHERE:
+         - r = The handle to object of class Robot
+         - res = ( n, o, s, w, mark, tmpr ) - named tuple
+
+        :return Surroundings
+        """
+
+        self._robot_check()
+        return self.hRobotEngine.sense()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Execute the commands without delays and visual effects, the window is rendered once at the end
+
+        SYNTAX:
+                with r.batch():
+                    r.step( 'n' )
+                    ...
+        """
+
+        self._robot_check()
+        with self.hRobotEngine.batch():
+            yield self
+
+    def run(self, commands):
+        """
+        Check and execute the list of the commands as one batch ( see batch )
+
+        SYNTAX:
+                res = r.run( ['s', 's', 'o', 'mark', ('walk', 'n', 3), 'is_mark'] )
+
+        WHERE:
+         - commands = list of the commands: name of the command | ( name, arguments ... ),
+           for Robot the side 'n' | 's' | 'o' | 'w' is the step to the side
+         - res = list of the results of the commands
+
+        All commands are checked before the execution ( BatchCommandError )
+        """
+
+        calls = [self._batch_command(command) for command in commands]
+
+        with self.batch():
+            return [method(*args) for method, args in calls]
+
+    def _batch_command(self, command):
+        """ Method and arguments of the command of the batch, raise errors """
+
+        if isinstance(command, str):
+            name, args = command, ()
+            if name.lower() in SIDES and 'step' in self.COMMANDS:
+                name, args = 'step', (name,)
+        elif isinstance(command, (tuple, list)) and command and isinstance(command[0], str):
+            name, args = command[0], tuple(command[1:])
+        else:
+            raise BatchCommandError('Not admissible command of the batch: {!r}'.format(command))
+
+        if name not in self.COMMANDS:
+            raise BatchCommandError('Unknown command of the batch: {!r}'.format(command))
+
+        method = getattr(self, name)
+        try:
+            inspect.signature(method).bind(*args)
+        except TypeError:
+            raise BatchCommandError('Wrong arguments of the command of the batch: {!r}'.format(command))
+
+        sides = self.COMMANDS[name]
+        if sides is not None and not (args and isinstance(args[0], str) and args[0].lower() in sides):
+            raise BatchCommandError('Wrong side of the command of the batch: {!r}'.format(command))
+
+        return method, args
+
     def _robot_check(self):
         """
         Make checks for correct robot work
         """
-        if not plt.fignum_exists(self.hRobotEngine.hField.hFig.number):
+        if self.hRobotEngine.headless or self.hRobotEngine.batchDepth:
+            return
+
+        if not self.hRobotEngine.hField.is_open():
             raise WindowClosedError
 
-        if star_control.is_star_to_end(self.hRobotEngine.hField.hFig):
+        if self.hRobotEngine.hField.isModified:
             raise NotSaveError
 
     def _is_frame(self):
@@ -280,6 +384,54 @@ class RobotBase:
         """ Enable visual effects """
         return self.hRobotEngine.effects_off()
 
+    def _set_render_policy(self, every: int = 1, fps: float = None):
+        """
+        Render every K-th frame and / or not more often than fps frames per second
+        """
+        return self.hRobotEngine.set_render_policy(every, fps)
+
+    def _render(self):
+        """
+        Render the pending frame
+        """
+        return self.hRobotEngine.render()
+
+    def _trace_on(self, filepath):
+        """
+        Record the commands into the trace file
+        """
+        return self.hRobotEngine.trace_on(filepath)
+
+    def _trace_off(self):
+        """
+        Stop recording of the commands
+        """
+        return self.hRobotEngine.trace_off()
+
+    def _profile_on(self, reset: bool = False):
+        """
+        Count the commands and measure their model, render and sleep time
+        """
+        return self.hRobotEngine.profile_on(reset)
+
+    def _profile_off(self):
+        """
+        Stop measuring the commands
+        """
+        return self.hRobotEngine.profile_off()
+
+    def _profile_stats(self):
+        """
+        Statistics of the commands
+        """
+        return self.hRobotEngine.profile_stats()
+
+    def _profile_dump(self, filepath):
+        """
+        Save statistics of the commands to the JSON file
+        """
+        return self.hRobotEngine.profile_dump(filepath)
+
 
 class Robot(RobotBase):
     """
@@ -288,6 +440,9 @@ class Robot(RobotBase):
     Directions of movement and obstacle checks are set ABSOLUTE values: North, South, West, East
     """
 
+    COMMANDS = {'step': SIDES, 'is_bord': SIDES, 'mark': None, 'is_mark': None, 'get_tmpr': None, 'sense': None,
+                'walk_until_border': SIDES, 'walk': SIDES, 'walk_until_mark': SIDES}
+
     def init_data(self):
         """
         Initialize data
@@ -327,6 +482,62 @@ class Robot(RobotBase):
         self._robot_check()
         return self.hRobotEngine.is_bord(side)
 
+    def walk_until_border(self, side=None):
+        """
+        walk_until_border - Moves the Robot to the set side until a border
+
+            SYNTAX:
+                      k = r.walk_until_border( side )
+
+            WHERE:
+             - side = 'n' | 's' | 'o' | 'w'
+             - r = The handle to object of class Robot
+             - k = number of the passed cells
+
+        The same as: while not r.is_bord( side ): r.step( side ), but the robot
+        moves by one smooth shift with one delay
+        """
+
+        self._robot_check()
+        return self.hRobotEngine.walk_until_border(side)
+
+    def walk(self, side=None, n: int = 1):
+        """
+        walk - Moves the Robot on n steps to the set side
+
+            SYNTAX:
+                      k = r.walk( side, n )
+
+            WHERE:
+             - side = 'n' | 's' | 'o' | 'w'
+             - n = number of the steps
+             - r = The handle to object of class Robot
+             - k = n - number of the passed cells
+
+        The same as: for _ in range( n ): r.step( side )
+        """
+
+        self._robot_check()
+        return self.hRobotEngine.walk(side, n)
+
+    def walk_until_mark(self, side=None):
+        """
+        walk_until_mark - Moves the Robot to the set side until a cell with a marker
+
+            SYNTAX:
+                      k = r.walk_until_mark( side )
+
+            WHERE:
+             - side = 'n' | 's' | 'o' | 'w'
+             - r = The handle to object of class Robot
+             - k = number of the passed cells
+
+        The same as: while not r.is_mark(): r.step( side )
+        """
+
+        self._robot_check()
+        return self.hRobotEngine.walk_until_mark(side)
+
 
 class RobotRelBase(RobotBase):
     """
@@ -375,6 +586,74 @@ class RobotRelBase(RobotBase):
         self._robot_check()
         return self.hRobotEngine.get_side()
 
+    def walk_until_border(self):
+        """
+        walk_until_border - command to move the robot forward until a partition
+
+        SYNTAX:
+            k = r.walk_until_border( )
+
+        RESULT:
+            - k = number of the passed cells
+            ( the same as: while not r.is_bord(): r.forward() for RobotOrt,
+            but the robot moves by one smooth shift with one delay )
+        """
+
+        self._robot_check()
+        return self.hRobotEngine.walk_until_border(self.hRobotEngine.get_side_())
+
+    def walk(self, n: int = 1):
+        """
+        walk - command to move the robot forward on n cells
+
+        SYNTAX:
+            k = r.walk( n )
+
+        RESULT:
+            - k = n - number of the passed cells ( the same as: for _ in range( n ): r.forward() )
+        """
+
+        self._robot_check()
+        return self.hRobotEngine.walk(self.hRobotEngine.get_side_(), n)
+
+    def walk_until_mark(self):
+        """
+        walk_until_mark - command to move the robot forward until a cell with a marker
+
+        SYNTAX:
+            k = r.walk_until_mark( )
+
+        RESULT:
+            - k = number of the passed cells ( the same as: while not r.is_mark(): r.forward() )
+        """
+
+        self._robot_check()
+        return self.hRobotEngine.walk_until_mark(self.hRobotEngine.get_side_())
+
+    def sense(self):
+        """
+        sense - command to check partitions around the robot, marker and temperature at once
+
+        SYNTAX:
+            res = r.sense()
+            if not res.forward: r.forward()
+
+        GIVEN:
+            - r = reference to an object of class Rob_roy:
+            a robot in a cage
+
+        RESULT:
+            - res = ( forward, right, back, left, mark, tmpr ) - named tuple,
+            partitions are set relative to the course of the robot
+        """
+
+        self._robot_check()
+
+        res = self.hRobotEngine.sense()
+        side = encode_side(self.hRobotEngine.get_side_())
+
+        return SurroundingsRel(*(res[(side + i) % 4] for i in range(4)), res.mark, res.tmpr)
+
 
 class RobotOrt(RobotRelBase):
     """
@@ -382,7 +661,8 @@ class RobotOrt(RobotRelBase):
         a reference (handle ) to an object representing an EXECUTOR of a " oriented robot on a cellular field"
 
     Command interface ( class methods ):
-        forward, right, left, is_born, mark, is_mark, get_side, get_tmpr
+        forward, right, left, is_born, mark, is_mark, get_side, get_tmpr, sense,
+        walk, walk_until_border, walk_until_mark
 
     The direction of travel, turns and check for obstacles are set
     ON:
@@ -392,6 +672,10 @@ class RobotOrt(RobotRelBase):
         See also a SIMILAR Robotron class
     """
 
+    COMMANDS = {'forward': None, 'left': None, 'right': None, 'is_bord': None, 'mark': None, 'is_mark': None,
+                'get_side': None, 'get_tmpr': None, 'sense': None,
+                'walk_until_border': None, 'walk': None, 'walk_until_mark': None}
+
     def init_data(self):
         """
         Initialize data
@@ -466,7 +750,8 @@ class RobotRot(RobotRelBase):
             CONTRACTOR " oriented robot on a cellular field"
 
     Command interface ( class methods ):
-        forward, rat, is_born, mark, is_mark, get_side, get_tmp
+        forward, rat, is_born, mark, is_mark, get_side, get_tmp, sense,
+        walk, walk_until_border, walk_until_mark
 
     The direction of travel, turns and check for obstacles are set
     ON:
@@ -483,6 +768,10 @@ class RobotRot(RobotRelBase):
 
     """
 
+    COMMANDS = {'forward': None, 'rot': ROT_SIDES, 'is_bord': REL_SIDES, 'mark': None, 'is_mark': None,
+                'get_side': None, 'get_tmpr': None, 'sense': None,
+                'walk_until_border': None, 'walk': None, 'walk_until_mark': None}
+
     def init_data(self):
         """
         Initialize data
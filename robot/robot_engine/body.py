@@ -1,7 +1,6 @@
 import time
 import numpy as np
 import matplotlib.patches as mpatches
-import matplotlib.pyplot as plt
 from .helpers import encode_side
 
 
@@ -38,15 +37,17 @@ class BodyBase:
     robot's
 
     Public method:
-        shift, mark, is_mark, is_bord, meas
+        shift, tween, mark, is_mark, is_bord, meas, sense
     Protected-methods:
         sond_data_init ( virtual method )
 
     Properties:
-        position, delay, moved
+        position, xy, delay, moved
     """
 
-    def __init__(self, coordinates, hFig):
+    FPS = 25  # frames per second of the smooth shift ( see tween )
+
+    def __init__(self, coordinates, hFig, renderer=None):
         """
         Designer of the oriented robot and its graphical image
 
@@ -57,6 +58,8 @@ class BodyBase:
 
         :param coordinates: initial robot position on the field
         :param hFig: reference to plot Figure
+        :param renderer: Renderer object of the field ( the robot is redrawn by blitting ),
+                         if None - the whole figure is redrawn
         """
 
         self.delay = 0
@@ -78,6 +81,7 @@ class BodyBase:
         self.L = 0.15
 
         self.hFig = hFig
+        self.renderer = renderer
 
         # indices of the field cell containing the robot ( the lower left cell is indexed: [0,0] )
         self.position = np.array(coordinates)
@@ -96,7 +100,7 @@ class BodyBase:
                                      clip_on=False,
                                      zorder=15)
 
-        self.hAxes = plt.gca()
+        self.hAxes = renderer.hAxes if renderer else hFig.axes[0]
         self.hAxes.add_patch(self.hCorp)
 
         self.sond_data_init()
@@ -112,14 +116,29 @@ class BodyBase:
                 zorder=16)
             self.hAxes.add_patch(self.hL[i])
 
+        if self.renderer:
+            self.renderer.add_artist(self.hCorp)
+            for i in range(4):
+                self.renderer.add_artist(self.hL[i])
+
         self.dr = Draggable(self.hCorp, self.hL, self.hFig, self)
 
+    @property
+    def xy(self):
+        """ Position of the robot as the list of Python numbers ( see HeadlessBody ) """
+        return self.position.tolist()
+
     def delete(self):
         """ Delete robot """
         self.hAxes.patches.remove(self.hCorp)
         for i in range(4):
             self.hAxes.patches.remove(self.hL[i])
 
+        if self.renderer:
+            self.renderer.remove_artist(self.hCorp)
+            for i in range(4):
+                self.renderer.remove_artist(self.hL[i])
+
     def shift(self, coord=None, mode=None):
         """
         without delay shifts the image of the robot on the vector of coord or coord point
@@ -164,11 +183,44 @@ class BodyBase:
                     self.x_0 + self.xData_0_L[i] + x,
                     self.y_0 + self.yData_0_L[i] + y)
 
-            self.position = np.int8(np.array(coord) + 0.5)
+            self.position = np.array(np.array(coord) + 0.5, dtype=int)
         else:
             raise ValueError()
 
-        self.hFig.canvas.draw()
+        self.redraw()
+
+    def tween(self, coord=None):
+        """
+        Shifts the image of the robot on the vector coord smoothly during the set time delay
+        ( one animation instead of the steps through every cell )
+
+        - coord = 2-vector int = coordinates of the displacement vector
+        """
+
+        corp = self.hCorp.center
+        legs = [leg.xy for leg in self.hL]
+        frames = max(int(self.delay * self.FPS), 1)
+
+        for f in range(1, frames + 1):
+            if self.delay:
+                self.hold(self.delay / frames)
+            dx = coord[0] * f / frames if f < frames else coord[0]
+            dy = coord[1] * f / frames if f < frames else coord[1]
+
+            self.hCorp.center = (corp[0] + dx, corp[1] + dy)
+            for i in range(0, 4):
+                self.hL[i].xy = (legs[i][0] + dx, legs[i][1] + dy)
+            if f == frames:
+                # the camera and the overlay of the last frame see the new cell of the robot
+                self.position = self.position + np.array(coord)
+            self.redraw()
+
+    def redraw(self):
+        """ Redraw the robot """
+        if self.renderer:
+            self.renderer.update()
+        else:
+            self.hFig.canvas.draw()
 
     def meas(self):
         """
@@ -201,6 +253,29 @@ class BodyBase:
 
         self.update_facecolor_p(self.hL[encode_side(side)], 'g')
 
+    def sense(self):
+        """
+        Visualizes the checks of the partitions, the marker and the temperature
+        together with the set time delay
+        """
+
+        face = self.hCorp.get_facecolor()
+        edge = self.hCorp.get_edgecolor()
+        legs = [leg.get_facecolor() for leg in self.hL]
+
+        self.hCorp.set_facecolor('m')
+        self.hCorp.set_edgecolor('b')
+        for leg in self.hL:
+            leg.set_facecolor('g')
+        self.redraw()
+        self.hold()
+
+        self.hCorp.set_facecolor(face)
+        self.hCorp.set_edgecolor(edge)
+        for leg, clr in zip(self.hL, legs):
+            leg.set_facecolor(clr)
+        self.redraw()
+
     def sond_data_init(self):
         """
         Create data sets for robot legs, the center of which
@@ -217,24 +292,33 @@ class BodyBase:
             self.xData_0_L[i - 1] -= self.L / 2
             self.yData_0_L[i - 1] -= self.L / 2
 
+    def hold(self, seconds=None):
+        """ Wait with the set time delay ( or the given time ), the visual effect is shown """
+        if seconds is None:
+            seconds = self.delay
+        if self.renderer:
+            self.renderer.hold(seconds)
+        else:
+            time.sleep(seconds)
+
     def update_facecolor(self, uclr):
         self.update_facecolor_p(self.hCorp, uclr)
 
     def update_edgecolor(self, uclr):
         clr = self.hCorp.get_edgecolor()
         self.hCorp.set_edgecolor(uclr)
-        self.hFig.canvas.draw()
-        time.sleep(self.delay)
+        self.redraw()
+        self.hold()
         self.hCorp.set_edgecolor(clr)
-        self.hFig.canvas.draw()
+        self.redraw()
 
     def update_facecolor_p(self, patch, uclr):
         clr = patch.get_facecolor()
         patch.set_facecolor(uclr)
-        self.hFig.canvas.draw()
-        time.sleep(self.delay)
+        self.redraw()
+        self.hold()
         patch.set_facecolor(clr)
-        self.hFig.canvas.draw()
+        self.redraw()
 
 
 class Draggable:
@@ -248,7 +332,7 @@ class Draggable:
         self.hands = hands
         self.press = None
         self.f = figure
-        self.r = plt.gca().robotdata['r']
+        self.r = corp.axes.robotdata['r']
         self.rob = rob
         self.connect()
 
@@ -286,7 +370,7 @@ class Draggable:
         for indx, hand in enumerate(self.hands):
             hand.xy = (hands_coord[indx][0] + dx, hands_coord[indx][1] + dy)
 
-        self.rect.figure.canvas.draw()
+        self.rob.redraw()
 
     def on_release(self, event):
         """on release we reset the press data"""
@@ -309,7 +393,7 @@ class Draggable:
         if newy < self.rect_init['y']:
             newy = self.rect_init['y']
 
-        r = plt.gca().robotdata['r']
+        r = self.r
         if newx > r.hField.size[0]:
             newx = r.hField.size[0] - self.rect_init['x']
         if newy > r.hField.size[1]:
@@ -323,6 +407,7 @@ class Draggable:
         self.rob.side = 0
         self.rect.set_facecolor('y')
         self.press = None
+        r.hField.robots_sync()
         self.rect.figure.canvas.draw()
 
     def disconnect(self):
@@ -340,7 +425,7 @@ class BodyOriented(BodyBase):
         shift, riot, mark, is_mark, is_bond, meas
     """
 
-    def __init__(self, coordinates=None, fig=None, side=None):
+    def __init__(self, coordinates=None, fig=None, side=None, renderer=None):
         """
         Designer of the oriented robot and its graphical image
 
@@ -349,12 +434,13 @@ class BodyOriented(BodyBase):
         - coordinates = [x, y] - Cartesian coordinates of the lower left corner of the cell
         - fig = descriptor of the robot's graphical window
         - side = 0 | 1 | 2 | 3
+        - renderer = Renderer object of the field
 
                             r = Body 1( R, hFig )
         - - R = Robot class object.Body 1 / Robot class object.Body 4
         """
 
-        super().__init__(coordinates, fig)
+        super().__init__(coordinates, fig, renderer)
 
         self.side = 0  # = 0 | 1 | 2 | 3
 
@@ -435,11 +521,11 @@ class BodyOriented(BodyBase):
         clr = self.hL[1].get_facecolor()
         for idx in hli:
             self.hL[idx].set_facecolor(uclr)
-        self.hFig.canvas.draw()
-        time.sleep(self.delay)
+        self.redraw()
+        self.hold()
         for idx in hli:
             self.hL[idx].set_facecolor(clr)
-        self.hFig.canvas.draw()
+        self.redraw()
 
     def rot_(self, side=None, fig=None):
         """
@@ -468,7 +554,7 @@ class BodyUndirected(BodyBase):
       position, delay, moved ( inherited from Robot.Body )
     """
 
-    def __init__(self, coordinates, fig):
+    def __init__(self, coordinates, fig, renderer=None):
         """
         Designer of the oriented robot and its graphical image
 
@@ -479,6 +565,7 @@ class BodyUndirected(BodyBase):
 
         :param coordinates:
         :param fig:
+        :param renderer:
         """
 
-        super().__init__(coordinates, fig)
+        super().__init__(coordinates, fig, renderer)
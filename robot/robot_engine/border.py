@@ -1,35 +1,99 @@
-import matplotlib.lines as mlines
-from .star_control import add_star_to_end
+import numpy as np
+from matplotlib.collections import LineCollection
+from .layer import LayerRows
 
+NAN_ROW = [np.nan, np.nan]
 
-class Border:
+
+class Borders:
     """
-    The Border class is an element of partitions
+    The Borders class - partitions of the field
+
+    All partitions are drawn by one LineCollection as one path, the segments
+    of the partitions are separated by NaN points. The segments are kept in
+    the vertices of the path ( see LayerRows.share ), so a partition is added
+    or removed in place in constant time, the path is created again only when
+    the array grows or all partitions are replaced
 
-    Methods: constructor, destructor - delete
-    Has the hLine property-the descriptor of the corresponding graphic object
+    Methods: add, remove, restore, clear
+    Has the hLines property-the descriptor of the corresponding graphic object
     """
 
-    def __init__(self, xdata, ydata, fig, axes):
+    def __init__(self, axes, width=4, color='b'):
         """
-        :param xdata, ydata: - line points
-        :param fig: - matplotlib figure
         :param axes: - matplotlib axes
+        :param width: - line width of the partitions
+        :param color: - color of the partitions
         """
-        self.hLine = mlines.Line2D(xdata, ydata,
-                                   linewidth=4,
-                                   color='b',
-                                   picker=5,
-                                   zorder=10)
-        self.hFig = fig
+        self.hLines = LineCollection([],
+                                     linewidths=width,
+                                     colors=color,
+                                     picker=5,
+                                     snap=True,
+                                     zorder=10)
         self.hAxes = axes
-        self.hAxes.add_line(self.hLine)
+        self.segments = LayerRows((3, 2))  # ('ver' | 'hor', i, j): [[x0, y0], [x1, y1], [nan, nan]]
+        self.shown = None  # the array of the segments, that is drawn by the path
+        self.hAxes.add_collection(self.hLines, autolim=False)
+
+    def __contains__(self, key):
+        return key in self.segments
+
+    def __len__(self):
+        return len(self.segments)
 
-    def delete(self):
+    def add(self, ort, i, j):
         """
-        Removes the border
-        Records the change of scene (adds * to the end of the window title)
+        Add the partition
+        ort = 'ver' - on the West side of the cell i, j | 'hor' - on the South side of the cell i, j
+        """
+        if self.segments.add((ort, i, j), self._segment(ort, i, j)):
+            self._update()
+
+    def remove(self, ort, i, j):
+        """ Remove the partition """
+        if self.segments.remove((ort, i, j)):
+            self._update()
+
+    def restore(self, ver_bord, hor_bord, x0=0, y0=0):
         """
+        Replace all partitions by the partitions of the boolean matrices
+        ( see FieldModel.hVerBord, FieldModel.hHorBord ),
+        the matrices can be a part of the field starting from the cell x0, y0
+        """
+
+        keys = []
+        rows = []
+        for ort, bord, end in (('ver', ver_bord, [0, 1]), ('hor', hor_bord, [1, 0])):
+            cells = np.transpose(np.nonzero(bord)) + [x0, y0]
+            keys += [(ort, i, j) for i, j in cells.tolist()]
+
+            segments = np.empty((len(cells), 3, 2))
+            segments[:, 0] = cells
+            segments[:, 1] = cells + end
+            segments[:, 2] = NAN_ROW
+            rows.append(segments)
+
+        self.segments.replace(keys, np.concatenate(rows))
+        self._update()
+
+    def clear(self):
+        """ Remove all partitions """
+        self.segments.clear()
+        self._update()
+
+    @staticmethod
+    def _segment(ort, i, j):
+        if ort == 'ver':
+            return [[i, j], [i, j + 1], NAN_ROW]
+        else:
+            return [[i, j], [i + 1, j], NAN_ROW]
 
-        self.hAxes.lines.remove(self.hLine)
-        add_star_to_end(self.hFig)
+    def _update(self):
+        data = self.segments.data
+        if data is not self.shown:
+            # the new array is passed to the path once, the next edits change the vertices of the path
+            self.hLines.set_segments([data.reshape(-1, 2)])
+            if self.segments.share(self.hLines.get_paths()[0].vertices):
+                self.shown = self.segments.data
+        self.hLines.stale = True
@@ -0,0 +1,261 @@
+"""
+Offscreen export of the robot runs into animations
+
+The run ( the trace of the commands or the robot program ) is rendered frame by frame
+by the player of the trace ( see player ), the frames are taken from the canvas
+and written into:
+    *.gif - animated GIF ( needs Pillow )
+    *.mp4 - video ( needs ffmpeg, see rcParams['animation.ffmpeg_path'] )
+    *.png - frames name-000000.png, name-000001.png, ...
+
+Exporter runs the export in the pool of the worker processes by the Agg backend,
+so the exports proceed in parallel and do not block the interactive session
+"""
+
+import os
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+import matplotlib.image as mimage
+from ..exceptions import RobotException, ExportFormatError, ExportWriterError
+
+FORMATS = ('.gif', '.mp4', '.png')
+
+
+def export_trace(trace, filepath, fps: float = 25, speed: float = 1, frames: int = None, dpi: float = None):
+    """
+    Write the animation of the trace of the robot commands
+    ( the figure is rendered by the current backend, Exporter renders it offscreen by Agg )
+
+    :param trace: - path to the trace file
+    :param filepath: - path to the *.gif | *.mp4 | *.png file
+    :param fps: - frames per second of the animation
+    :param speed: - speed of the run, 1x - the run with the delay of the trace ( the commands
+                    between the frames are skipped )
+    :param frames: - number of frames of the whole run ( instead of speed )
+    :param dpi: - resolution of the frames ( the resolution of the figure by default )
+    :return: number of the written frames
+    """
+
+    from .player import TracePlayer
+
+    sink = _sink(filepath, fps)
+    player = TracePlayer(trace)
+    fig = player.engine.hField.hFig
+    try:
+        if dpi:
+            fig.set_dpi(dpi)
+            player.engine.hField.renderer.draw()
+
+        # number of commands between the frames
+        if frames:
+            per = player.total / max(int(frames) - 1, 1)
+        else:
+            per = max(speed, 1) * player.rate / fps
+
+        i = 0
+        while True:
+            k = min(int(round(i * per)), player.total)
+            player.seek(k)
+            sink.add(np.asarray(fig.canvas.buffer_rgba()))
+            if k >= player.total:
+                break
+            i += 1
+    finally:
+        player.engine.hField.close()
+        sink.close()
+
+    return sink.count
+
+
+def export_program(program, mapfile, filepath, robot_class='Robot', **options):
+    """
+    Run the robot program without graphic window and write the animation of the run
+
+    :param program: - function program( r ), r - the robot
+    :param mapfile: - map file of the field
+    :param filepath: - path to the *.gif | *.mp4 | *.png file
+    :param robot_class: - 'Robot' | 'RobotOrt' | 'RobotRot' or the class of the robot
+    :param options: - fps, speed, frames, dpi ( see export_trace )
+    :return: number of the written frames
+    """
+
+    from .. import robot as robots
+
+    _check_format(filepath)
+    cls = getattr(robots, robot_class) if isinstance(robot_class, str) else robot_class
+
+    fd, trace = tempfile.mkstemp(suffix='.trace')
+    os.close(fd)
+    try:
+        r = cls(mapfile, headless=True)
+        r._trace_on(trace)
+        try:
+            program(r)
+        except RobotException:
+            pass  # the run is exported up to the error
+        finally:
+            r._trace_off()
+
+        return export_trace(trace, filepath, **options)
+    finally:
+        os.remove(trace)
+
+
+class Exporter:
+    """
+    Pool of the worker processes, that export the runs offscreen ( Agg backend )
+
+    SYNTAX:
+        ex = Exporter( workers=4 )
+        f = ex.trace( 'run.trace', 'run.gif', speed=100 )
+        f = ex.program( solve, 'maze.map', 'run.mp4', frames=500 )
+        f.result() - number of the written frames ( see concurrent.futures.Future )
+        ex.shutdown()
+
+    The processes are started by 'spawn': the program must be a function of a module
+    ( not lambda ) and the main module of the script must be guarded by if __name__ == '__main__'
+    """
+
+    def __init__(self, workers: int = None):
+        """
+        :param workers: - number of the processes ( the number of processors by default )
+        """
+        self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def trace(self, trace, filepath, **options):
+        """
+        Export the trace ( see export_trace )
+
+        :return: Future
+        """
+        _check_format(filepath)
+        return self.pool.submit(_job, export_trace, trace, filepath, **options)
+
+    def program(self, program, mapfile, filepath, robot_class='Robot', **options):
+        """
+        Export the run of the program ( see export_program )
+
+        :return: Future
+        """
+        _check_format(filepath)
+        return self.pool.submit(_job, export_program, program, mapfile, filepath, robot_class, **options)
+
+    def shutdown(self, wait: bool = True):
+        """ Stop the processes ( after the submitted exports, if wait ) """
+        self.pool.shutdown(wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+
+def _job(func, *args, **kwargs):
+    """ Export in the worker process """
+
+    plt.switch_backend('Agg')
+    try:
+        return func(*args, **kwargs)
+    finally:
+        plt.close('all')
+
+
+def _check_format(filepath):
+    """ Checks the extension of the animation file, raise errors """
+
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext not in FORMATS:
+        raise ExportFormatError
+    return ext
+
+
+def _sink(filepath, fps):
+    """ Writer of the frames by the extension of the file """
+
+    ext = _check_format(filepath)
+    if ext == '.gif':
+        return _GifSink(filepath, fps)
+    if ext == '.mp4':
+        return _Mp4Sink(filepath, fps)
+    return _PngSink(filepath)
+
+
+class _PngSink:
+    """ Frames in the png files name-000000.png, ... """
+
+    def __init__(self, filepath):
+        root, ext = os.path.splitext(filepath)
+        self.pattern = root + '-{:06d}' + ext
+        self.count = 0
+
+    def add(self, rgba):
+        mimage.imsave(self.pattern.format(self.count), rgba)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class _GifSink:
+    """ Animated GIF, the frames are kept in memory till the end """
+
+    def __init__(self, filepath, fps):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ExportWriterError
+
+        self.image = Image
+        self.filepath = filepath
+        self.duration = int(round(1000 / fps))
+        self.frames = []
+        self.count = 0
+
+    def add(self, rgba):
+        self.frames.append(self.image.fromarray(np.array(rgba)).convert('RGB'))
+        self.count += 1
+
+    def close(self):
+        if self.frames:
+            self.frames[0].save(self.filepath, save_all=True, append_images=self.frames[1:],
+                                duration=self.duration, loop=0)
+        self.frames = []
+
+
+class _Mp4Sink:
+    """ Video, the frames are piped into ffmpeg """
+
+    def __init__(self, filepath, fps):
+        self.ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+        if not self.ffmpeg:
+            raise ExportWriterError
+
+        self.filepath = filepath
+        self.fps = fps
+        self.process = None
+        self.count = 0
+
+    def add(self, rgba):
+        if self.process is None:
+            h, w = rgba.shape[:2]
+            self.process = subprocess.Popen(
+                [self.ffmpeg, '-y', '-loglevel', 'error',
+                 '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', '{}x{}'.format(w, h), '-r', str(self.fps), '-i', '-',
+                 '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', '-vcodec', 'libx264', self.filepath],
+                stdin=subprocess.PIPE)
+        self.process.stdin.write(np.ascontiguousarray(rgba).data)
+        self.count += 1
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            if self.process.wait():
+                raise ExportWriterError
+            self.process = None
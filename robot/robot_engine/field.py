@@ -1,25 +1,50 @@
 import os
 import os.path
-import pickle
 import numpy as np
 import matplotlib
 import matplotlib.lines as mlines
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from .body import BodyUndirected
 from .body import BodyOriented
-from .border import Border
-from .gridline import GridLine
-from .marker import Marker
-from .tools.controls import add_tool_to_navigation, default_tools, clear_toolbar
-from .star_control import *
-from .dialog import save_file, open_file, input_integer
-from ..exceptions import RobotTypeError, EditFieldOutError, FieldSizeTypeError, FieldSizeValueError
+from .border import Borders
+from .gridline import GridLines
+from .marker import Markers
+from .model import FieldModel, Occupancy
+from .mapfile import load_map, save_map
+from .renderer import Renderer
+from ..exceptions import RobotTypeError, EditFieldOutError, FieldSizeTypeError, FieldSizeValueError, CollisionError
 
-matplotlib.rcParams['toolbar'] = 'toolmanager'
+# the builtin non-interactive backends of matplotlib ( rcsetup.non_interactive_bk is gone in 3.11 )
+NON_INTERACTIVE = ('agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template')
+
+
+def new_figure():
+    """
+    Create the figure of the field
+
+    For the interactive backend the figure is the window created by pyplot,
+    for the non-interactive backend ( Agg, pdf, svg, ... ) it is the offscreen figure
+    with its own Agg canvas, it is not registered in pyplot, so the fields can be
+    created and driven in several threads
+
+    :return: figure, axes, True - if the figure is offscreen
+    """
+
+    backend = matplotlib.get_backend()
+    if backend.lower() in NON_INTERACTIVE:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        return fig, fig.add_subplot(111), True
+
+    matplotlib.rcParams['toolbar'] = 'toolmanager'
+    fig, axes = plt.subplots()
+    return fig, axes, False
 
 
 class Field(object):
-    def __init__(self, obj, body=None, size=None, frame: bool = True):
+    def __init__(self, obj, body=None, size=None, frame: bool = True, view=None):
         """
         Creates a field and initiates the properties of the generated obj object
 
@@ -42,6 +67,8 @@ class Field(object):
 
         - [fSize = 2-vector double = number of rows and columns
         cellular field ]
+        - [view = 2-vector int = max number of columns and rows of the visible
+        window of the field, the window follows the robot ]
 
         RESULT:
         - initialized the values of the properties of obj
@@ -63,16 +90,22 @@ class Field(object):
         self.borderWidth = 4
         self.borderColor = 'b'
         self.size = [5, 3]
+        self.viewSize = [100, 100]  # max size of the visible window of the field
+        self.view = [0, 0, 5, 3]  # visible window: [x0, y0, number of columns, number of rows]
         self.obj = obj
         self.hFrame = False
         self.is_texts = False
-        self.hTexts = None
-        self.hVerBord = None
-        self.hHorBord = None
-        self.hMark = None
-        self.tMap = []
+        self.hTexts = {}  # texts with temperature of the visible cells: {(i, j): Text}
+        self.model = None
+        self.borders = None  # partitions layer ( object of class Borders )
+        self.markers = None  # markers layer ( object of class Markers )
         self.hRobot = None
         self.body = body
+        self.robots = [obj]  # objects of class RobotEngine on the field, the first one owns the field
+        self.occupancy = None  # cells of the robots ( object of class Occupancy )
+        self.title = ''  # title of the window without the mark of the changes
+        self.isModified = False  # the field is changed and is not saved
+        self.revision = 0  # number of the changes of the field
 
         if size is not None:
             if len(size) == 2:
@@ -82,15 +115,28 @@ class Field(object):
                     raise FieldSizeValueError
                 self.size = size
 
+        if view is not None:
+            if len(view) != 2 or not isinstance(view[0], int) or not isinstance(view[1], int):
+                raise FieldSizeTypeError
+            if view[0] < 1 or view[1] < 1:
+                raise FieldSizeValueError
+            self.viewSize = list(view)
+
         # create Figure
-        self.hFig, self.hAxes = plt.subplots()
-        self.hFig.canvas.set_window_title(self.obj.robotType)
+        self.hFig, self.hAxes, self.isOffscreen = new_figure()
+        self.set_title(self.obj.robotType)
         self.hAxes.set_aspect('equal')  # save field scale
-        self.gridLines = []
+        self.gridLines = None
+
+        # robot is drawn over the cached image of the field
+        self.renderer = Renderer(self.hFig, self.hAxes)
+        self.renderer.overlay = self.robot_overlay
+        self.renderer.camera = self.view_follow
 
         # setup Toolbar
-        if self.hFig.canvas.manager.toolmanager:
-            clear_toolbar(self.hFig.canvas.manager.toolmanager)
+        if self._toolmanager():
+            from .tools.controls import add_tool_to_navigation, default_tools, clear_toolbar
+            clear_toolbar(self._toolmanager())
             for tool in default_tools:
                 add_tool_to_navigation(tool, self.hFig)
 
@@ -109,13 +155,36 @@ class Field(object):
             else:
                 self.frame_create()
 
+    @property
+    def hVerBord(self):
+        """ Boolean matrix of vertical partitions """
+        return self.model.hVerBord
+
+    @property
+    def hHorBord(self):
+        """ Boolean matrix of horizontal partitions """
+        return self.model.hHorBord
+
+    @property
+    def hMark(self):
+        """ Boolean matrix of markers """
+        return self.model.hMark
+
+    @property
+    def tMap(self):
+        """ Matrix of temperatures """
+        return self.model.tMap
+
     def draw(self):
         """ Create and draw field """
-        self.hTexts = np.empty(self.size, dtype=object)
-        self.hVerBord = np.empty(self.size, dtype=object)
-        self.hHorBord = np.empty(self.size, dtype=object)
-        self.hMark = np.empty(self.size, dtype=object)
-        self.tMap = np.random.randint(-10, 10, size=self.size)
+        self.hTexts = {}
+        self.model = FieldModel(self.size)
+        self.hFrame = False
+
+        # layers of the field, each one is drawn by one collection
+        self.gridLines = [GridLines('ver', self.hAxes), GridLines('hor', self.hAxes)]
+        self.borders = Borders(self.hAxes, self.borderWidth, self.borderColor)
+        self.markers = Markers(self.hAxes)
 
         # scale the axis area to fill the whole figure
         self.hAxes.set_position([0, 0, 1, 1])
@@ -124,11 +193,15 @@ class Field(object):
         self.hAxes.set_axis_off()
 
         # scale the plot area conveniently (the board is in 0,0..18,18)
-        self.hAxes.set_xlim(-0.1, self.size[0] + 0.1)
-        self.hAxes.set_ylim(-0.1, self.size[1] + 0.1)
-        self.hRobot = self.body([0, 0], self.hFig)
+        self.view_create()
+        self.renderer.clear()
+        self.hRobot = self.body([0, 0], self.hFig, renderer=self.renderer)
 
         self.obj.hRobot = self.hRobot
+        for robot in self.robots[1:]:
+            # the axes were cleared, the other robots are created again in their cells
+            robot.hRobot = self._robot_body(robot, robot.hRobot.position, getattr(robot.hRobot, 'side', 0))
+        self.robots_sync()
         self.grid_create()
 
     def restore(self, is_delay=False, **params):
@@ -138,63 +211,78 @@ class Field(object):
             self.load(is_delay)
             return
 
-        with open(os.path.join(self.obj.fPath, self.obj.fName), 'rb') as f:
-            r = pickle.load(f)
+        # the field is redrawn once, when it is restored
+        self.renderer.pause()
+        try:
+            # the matrices are mapped into memory, only the used pages of the file are read
+            r = load_map(os.path.join(self.obj.fPath, self.obj.fName), mmap_mode='c')
 
-        self.size = r.get('size')
+            self.size = list(r.get('size'))
 
-        if not is_delay:
-            if r.get('delay'):
-                if self.obj.delay != 0:
-                    self.set_delay(r.get('delay'))
-                else:
-                    self.obj.delay_def = r.get('delay')
+            if not is_delay:
+                if r.get('delay'):
+                    if self.obj.delay != 0:
+                        self.set_delay(r.get('delay'))
+                    else:
+                        self.obj.delay_def = r.get('delay')
 
-        self.grid_delete()
-        self.markers_delete()
-        self.borders_delete()
+            self.grid_delete()
+            self.markers_delete()
+            self.borders_delete()
 
-        tool = self._get_tool('FrameTool')
-        if tool and tool.toggled is True:
-            tool.image = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icons8-text-box-32.png')
-            self._trigger_tool('FrameTool')  # call self.frame_delete()
+            tool = self._get_tool('FrameTool')
+            if tool and tool.toggled is True:
+                tool.image = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icons8-text-box-32.png')
+                self._trigger_tool('FrameTool')  # call self.frame_delete()
 
-        if r.get('isFrame') is True:
-            self._trigger_tool('FrameTool')
+            if r.get('isFrame') is True:
+                self._trigger_tool('FrameTool')
 
-        self.hAxes.set_xlim(-0.1, self.size[0] + 0.1)
-        self.hAxes.set_ylim(-0.1, self.size[1] + 0.1)
-        self.grid_create()
+            if tool is None:
+                # there is no toolbar ( non-interactive backend ), the frame is recreated for the new size
+                self.frame_delete()
+                if r.get('isFrame') is True:
+                    self.frame_create()
 
-        self.obj.isServiceable = True
+            self.view_create()
+            self.hTexts = {}
+            self.grid_create()
 
-        if r.get('robot_type') == 'Robot':
-            if not isinstance(self.obj.hRobot, BodyUndirected):
-                self.obj.hRobot.delete()
-                self.obj.hRobot = BodyUndirected([0, 0], self.hFig)
-        elif r.get('robot_type') in ['RobotOrt', 'RobotRot']:
-            if not isinstance(self.obj.hRobot, BodyOriented):
-                self.obj.hRobot.delete()
-                self.obj.hRobot = BodyOriented([0, 0], self.hFig)
-        else:
-            raise RobotTypeError
+            self.model = FieldModel.from_cells(self.size, r.get('cells'), r.get('tMap'), r.get('isFrame'))
+            if self.is_frame():
+                self.model.frame_create()
+            else:
+                self.model.frame_delete()
+
+            self.obj.isServiceable = True
+
+            if r.get('robot_type') == 'Robot':
+                if not isinstance(self.obj.hRobot, BodyUndirected):
+                    self.obj.hRobot.delete()
+                    self.obj.hRobot = BodyUndirected([0, 0], self.hFig, renderer=self.renderer)
+            elif r.get('robot_type') in ['RobotOrt', 'RobotRot']:
+                if not isinstance(self.obj.hRobot, BodyOriented):
+                    self.obj.hRobot.delete()
+                    self.obj.hRobot = BodyOriented([0, 0], self.hFig, renderer=self.renderer)
+            else:
+                raise RobotTypeError
 
-        # restore robot object on the field
-        self.obj.hRobot.shift(r.get('hRobot_position', (0, 0)), 'punct')
+            # restore robot object on the field
+            self.obj.hRobot.shift(r.get('hRobot_position', (0, 0)), 'punct')
+            self.view_follow()
 
-        # restore initial borders
-        self.hVerBord = r.get('hVerBord')
-        self.hHorBord = r.get('hHorBord')
-        self.borders_restore()
+            # restore initial borders
+            self.borders_restore()
 
-        # restore initial markers
-        self.obj.outMarkPos = np.empty((0, 2), int)
-        self.hMark = r.get('hMark')
-        self.markers_restore()
+            # restore initial markers
+            self.obj.outMarkPos.clear()
+            self.markers_restore()
+            self.robots_sync()
 
-        self.tMap = r.get('tMap')
-
-        del_star_to_end(self.hFig)
+            self.renderer.draw()
+        finally:
+            self.renderer.resume()
+        self.set_modified(False)
 
     def save(self, dialog=True):
         """
@@ -205,20 +293,9 @@ class Field(object):
         If you select a different file, the selected file name is saved
         in the obj object, and in the name field ( p = frames )
         """
-        r = {
-            'hVerBord': self.copy_for_restore(self.hVerBord),
-            'hHorBord': self.copy_for_restore(self.hHorBord),
-            'hMark': self.copy_for_restore(self.hMark),
-            'tMap': self.tMap,
-            'hRobot_position': self.hRobot.position,
-            'robot_type': self.obj.robotType,
-            'isFrame': True if self.hFrame else False,
-            'size': self.size,
-            'delay': self.obj.delay_def
-        }
-
         if dialog or not self.obj.is_init_save:
 
+            from .dialog import save_file
             filepath = save_file(self.obj.fName)
 
             if not filepath:
@@ -230,11 +307,10 @@ class Field(object):
         else:
             filepath = os.path.join(self.obj.fPath, self.obj.fName)
 
-        with open(filepath, 'wb') as f:
-            pickle.dump(r, f)
+        save_map(filepath, self.model, self.obj.robotType, self.obj.hRobot.position, self.obj.delay_def)
 
-        self.hFig.canvas.set_window_title(self.obj.robotType + ' - ' + filepath)
-        del_star_to_end(self.hFig)
+        self.set_title(self.obj.robotType + ' - ' + filepath)
+        self.set_modified(False)
         self.obj.is_init_save = True
 
         return True
@@ -242,6 +318,7 @@ class Field(object):
     def load(self, is_delay=False):
         """ Load field state from a map file """
 
+        from .dialog import open_file
         filepath = open_file(self.obj.fName, self.obj.fPath)
 
         if not filepath:
@@ -250,98 +327,181 @@ class Field(object):
         self.obj.fPath = os.path.dirname(filepath)
         self.obj.fName = os.path.basename(filepath)
 
-        self.hFig.canvas.set_window_title(self.obj.robotType + ' - ' + filepath)
+        self.set_title(self.obj.robotType + ' - ' + filepath)
 
         self.restore(is_delay)
 
-        del_star_to_end(self.hFig)
+        self.set_modified(False)
 
         return True
 
+    def robot_add(self, robot, position=(0, 0), side=0):
+        """
+        Put one more robot on the field, the robots share the partitions, the markers
+        and the window, all of them are drawn by one render pass
+
+        :param robot: - object of class RobotEngine ( not yet formed finally )
+        :param position: - cell of the robot, it must be free
+        :param side: - direction of the oriented robot = 0 | 1 | 2 | 3
+        """
+
+        x, y = (int(v) for v in position)
+        if self.occupancy.get(x, y):
+            raise CollisionError
+
+        robot.hRobot = self._robot_body(robot, [x, y], side)
+        self.robots.append(robot)
+        self.occupancy.move(len(self.robots), x, y)
+        self.renderer.update()
+
+    def robots_sync(self):
+        """ Put the cells of all robots into the occupancy ( after the editing of the field ) """
+
+        self.occupancy = Occupancy()
+        for number, robot in enumerate(self.robots, 1):
+            if robot.hRobot is not None:
+                self.occupancy.move(number, *robot.cell())
+
+    def _robot_body(self, robot, position, side=0):
+        """ Create the body of the robot on the field """
+
+        if robot.fhBody is BodyOriented:
+            return BodyOriented(position, self.hFig, int(side), renderer=self.renderer)
+        return robot.fhBody(position, self.hFig, renderer=self.renderer)
+
     def grid_create(self):
         """ Create lines for grid """
 
-        n = self.size[0]
-        m = self.size[1]
-        # draw the grid
-        for x in range(n + 1):
-            line = GridLine([x, x], [0, m], 'ver', self.hFig, self.hAxes)
-            self.gridLines.append(line)
-
-        for y in range(m + 1):
-            line = GridLine([0, n], [y, y], 'hor', self.hFig, self.hAxes)
-            self.gridLines.append(line)
+        for lines in self.gridLines:
+            lines.set_view(*self.view)
 
     def borders_restore(self):
-        """ Restore borders """
-
-        for ix in range(self.hHorBord.shape[0]):
-            for iy in range(self.hHorBord.shape[1]):
-                if self.hHorBord[ix][iy]:
-                    xdata = [ix, ix + 1]
-                    ydata = [iy, iy]
-                    self.hHorBord[ix][iy] = Border(xdata, ydata, self.hFig, self.hAxes)
-
-        for ix in range(self.hVerBord.shape[0]):
-            for iy in range(self.hVerBord.shape[1]):
-                if self.hVerBord[ix][iy]:
-                    xdata = [ix, ix]
-                    ydata = [iy, iy + 1]
-                    self.hVerBord[ix][iy] = Border(xdata, ydata, self.hFig, self.hAxes)
-
-    def copy_for_restore(self, arr):
-        """ Create an array with boolean values """
-        dest = np.empty(arr.shape, dtype=object)
-        for i in range(arr.shape[0]):
-            for j in range(arr.shape[1]):
-                if arr[i][j]:
-                    dest[i][j] = True
-                else:
-                    dest[i][j] = False
-        return dest
+        """ Show the partitions of the model in the visible window """
+        x0, y0, w, h = self.view
+        ver, hor, mark = self.model.window(x0, y0, w, h)
+        self.borders.restore(ver, hor, x0, y0)
 
     def markers_restore(self):
-        """ Restore markers on the field """
+        """ Show the markers of the model in the visible window """
+        x0, y0, w, h = self.view
+        ver, hor, mark = self.model.window(x0, y0, w, h)
+        self.markers.restore(mark, x0, y0)
+
+    def view_create(self):
+        """
+        Set the visible window to the lower left part of the field
+        ( the whole field, if it is not bigger than viewSize )
+        """
+        self.view = [0, 0, min(self.size[0], self.viewSize[0]), min(self.size[1], self.viewSize[1])]
+        self._view_limits()
+
+    def view_follow(self):
+        """
+        Camera: if the robot has left the visible window, the window is moved
+        so that the robot is in its center
+
+        :return: True - if the window was moved
+        """
+
+        if self.obj.hRobot is None:
+            return False
+
+        x0, y0, w, h = self.view
+        x, y = self.obj.hRobot.position.tolist()
+        if x0 <= x < x0 + w and y0 <= y < y0 + h:
+            return False
+
+        return self.view_move(int(x) - w // 2, int(y) - h // 2)
 
-        for i in range(self.hMark.shape[0]):
-            for j in range(self.hMark.shape[1]):
-                if self.hMark[i][j]:
-                    self.hMark[i][j] = Marker(i, j, self.hAxes)
+    def view_move(self, x0, y0):
+        """
+        Move the visible window to the cell x0, y0 ( lower left cell of the window ),
+        the artists of the field are created only for the cells of the window
+
+        :return: True - if the window was moved
+        """
+
+        w, h = self.view[2:]
+        x0 = min(max(x0, 0), self.size[0] - w)
+        y0 = min(max(y0, 0), self.size[1] - h)
+        if [x0, y0] == self.view[:2]:
+            return False
+
+        if self.is_texts:
+            self.texts_delete()
+
+        self.view = [x0, y0, w, h]
+        self._view_limits()
+        self.grid_create()
+        self.borders_restore()
+        self.markers_restore()
+
+        if self.is_texts:
+            self.texts_create()
+
+        return True
+
+    def _view_limits(self):
+        """ Set limits of the axes by the visible window """
+        x0, y0, w, h = self.view
+        self.hAxes.set_xlim(x0 - 0.1, x0 + w + 0.1)
+        self.hAxes.set_ylim(y0 - 0.1, y0 + h + 0.1)
+
+    def marker_create(self, i, j):
+        """ Set marker in the cell """
+
+        self.model.set_mark(i, j)
+        self.markers.add(i, j)
+        if self.is_texts:
+            # the texts are drawn over the markers
+            self.renderer.draw()
+        else:
+            self.renderer.draw_static(self.markers.new(i, j))
+
+    def robot_overlay(self):
+        """ Markers and temperature texts of the robot cells, they are drawn over the robots """
+
+        if self.obj.hRobot is None:
+            return []
+
+        if len(self.robots) == 1:
+            x, y = self.obj.hRobot.position.tolist()
+            artists = self.markers.overlay(x, y)
+            cells = [(x, y)]
+        else:
+            cells = [tuple(robot.hRobot.position.tolist()) for robot in self.robots]
+            artists = self.markers.overlay_cells(cells)
+
+        if self.is_texts:
+            for x, y in cells:
+                if 0 <= x < self.size[0] and 0 <= y < self.size[1] and x == int(x) and y == int(y):
+                    text = self.hTexts.get((int(x), int(y)))
+                    if text is not None:
+                        artists.append(text)
+
+        return artists
 
     def grid_delete(self):
         """ Remove all grid lines from the field """
 
-        for i in range(len(self.gridLines)):
-            self.gridLines[i].delete()
-        self.gridLines = []
+        for lines in self.gridLines:
+            lines.delete()
 
     def borders_delete(self):
         """ Remove all borders from the field """
 
-        for iy in range(self.hHorBord.shape[0]):
-            for ix in range(self.hHorBord.shape[1]):
-                if self.hHorBord[iy][ix]:
-                    self.hHorBord[iy][ix].delete()
-                    self.hHorBord[iy][ix] = False
-
-        for iy in range(self.hVerBord.shape[0]):
-            for ix in range(self.hVerBord.shape[1]):
-                if self.hVerBord[iy][ix]:
-                    self.hVerBord[iy][ix].delete()
-                    self.hVerBord[iy][ix] = False
-        self.hFig.canvas.draw()
-        add_star_to_end(self.hFig)
+        self.borders.clear()
+        self.model.borders_clear()
+        self.renderer.draw()
+        self.set_modified()
 
     def markers_delete(self):
         """ Remove all markers from the field """
 
-        for i in range(self.hMark.shape[0]):
-            for j in range(self.hMark.shape[1]):
-                if self.hMark[i][j]:
-                    self.hMark[i][j].delete()
-                    self.hMark[i][j] = False
-        self.hFig.canvas.draw()
-        add_star_to_end(self.hFig)
+        self.markers.clear()
+        self.model.markers_clear()
+        self.renderer.draw()
+        self.set_modified()
 
     def frame_create(self):
         """ Show field frame """
@@ -352,14 +512,16 @@ class Field(object):
                                         color='b', zorder=10)
 
             self.hAxes.add_line(self.hFrame)
-        self.hFig.canvas.draw()
+        self.model.frame_create()
+        self.renderer.draw()
 
     def frame_delete(self):
         """ Hide field frame """
         if self.hFrame:
             self.hAxes.lines.remove(self.hFrame)
             self.hFrame = False
-        self.hFig.canvas.draw()
+        self.model.frame_delete()
+        self.renderer.draw()
 
     def window_key_press(self, eventdata=None):
         """
@@ -381,6 +543,7 @@ class Field(object):
             print('Set delay time:', str(self.hRobot.delay), 'sec.')
         if eventdata.key == 'ctrl+r':
             self.obj.hRobot.shift([0, 0], 'punct')
+            self.robots_sync()
             print('Robot moved to left bottom corner')
 
     def _check_out_state(self):
@@ -390,7 +553,7 @@ class Field(object):
         out of the visible field
         """
 
-        if self.obj.is_out() or self.obj.outMarkPos.size:
+        if self.obj.is_out() or len(self.obj.outMarkPos):
             raise EditFieldOutError
 
     def restore_serviceable(self):
@@ -399,7 +562,7 @@ class Field(object):
         """
 
         self.obj.isServiceable = True
-        add_star_to_end(self.hFig)
+        self.set_modified()
 
     def button_down_to_grid(self, event):
         """
@@ -436,14 +599,12 @@ class Field(object):
 
             self._check_out_state()
 
-            xdata = [x, x]
-            ydata = [y, y + 1]
-
-            if not self.hVerBord[i][j]:
-                self.hVerBord[i][j] = Border(xdata, ydata, self.hFig, self.hAxes)
+            if not self.model.is_ver_bord(i, j):
+                self.model.set_ver_bord(i, j)
+                self.borders.add('ver', i, j)
             else:
-                self.hVerBord[i][j].delete()
-                self.hVerBord[i][j] = False
+                self.model.set_ver_bord(i, j, False)
+                self.borders.remove('ver', i, j)
 
         elif ort == 'hor':
             y = round(y)
@@ -460,19 +621,18 @@ class Field(object):
 
             self._check_out_state()
 
-            xdata = [x, x + 1]
-            ydata = [y, y]
-            if not self.hHorBord[i][j]:
-                self.hHorBord[i][j] = Border(xdata, ydata, self.hFig, self.hAxes)
+            if not self.model.is_hor_bord(i, j):
+                self.model.set_hor_bord(i, j)
+                self.borders.add('hor', i, j)
             else:
-                self.hHorBord[i][j].delete()
-                self.hHorBord[i][j] = False
+                self.model.set_hor_bord(i, j, False)
+                self.borders.remove('hor', i, j)
 
         else:
             raise ValueError()
 
         self.hFig.canvas.draw()
-        add_star_to_end(self.hFig)
+        self.set_modified()
         return True
 
     def button_down_to_cage(self, event=None):
@@ -513,15 +673,16 @@ class Field(object):
 
         self._check_out_state()
 
-        if not self.hMark[i][j]:
-            self.hMark[i][j] = Marker(xf, yf, self.hAxes)
+        if not self.model.is_mark(i, j):
+            self.model.set_mark(i, j)
+            self.markers.add(i, j)
         else:
-            self.hMark[i][j].delete()
-            self.hMark[i][j] = False
+            self.model.set_mark(i, j, False)
+            self.markers.remove(i, j)
 
         self.hFig.canvas.draw()
 
-        add_star_to_end(self.hFig)
+        self.set_modified()
         return True
 
     def button_down_to_text(self, event=None):
@@ -565,28 +726,38 @@ class Field(object):
         """ Create/remove text with temperature in caves from values in self.tMap """
 
         if not self.is_texts:
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    t = self.tMap[i][j]
-                    self.hTexts[i][j] = self.hAxes.text(i + 0.4, j + 0.35, str(t),
-                                                        color='b',
-                                                        bbox={'fill': True,
-                                                              'edgecolor': 'k',
-                                                              'facecolor': 'w',
-                                                              'linewidth': 0,
-                                                              'boxstyle': 'round'},
-                                                        zorder=100)
+            self.texts_create()
             self.is_texts = True
 
         else:
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    if self.hTexts[i][j]:
-                        self.hTexts[i][j].remove()
+            self.texts_delete()
             self.is_texts = False
 
         self.hFig.canvas.draw()
 
+    def texts_create(self):
+        """ Create texts with temperature for the cells of the visible window """
+
+        x0, y0, w, h = self.view
+        for i in range(x0, x0 + w):
+            for j in range(y0, y0 + h):
+                t = self.tMap[i][j]
+                self.hTexts[(i, j)] = self.hAxes.text(i + 0.4, j + 0.35, str(t),
+                                                      color='b',
+                                                      bbox={'fill': True,
+                                                            'edgecolor': 'k',
+                                                            'facecolor': 'w',
+                                                            'linewidth': 0,
+                                                            'boxstyle': 'round'},
+                                                      zorder=100)
+
+    def texts_delete(self):
+        """ Remove texts with temperature of the visible window """
+
+        for text in self.hTexts.values():
+            text.remove()
+        self.hTexts = {}
+
     def is_tmpr_text_on(self):
         """ Check if text with temperature in caves from values in self.tMap """
         return True if self.is_texts else False
@@ -600,19 +771,24 @@ class Field(object):
         window title)
         """
 
-        add_star_to_end(self.hFig)
+        text = self.hTexts.get((i, j))
+        if text is None:
+            return
+
+        self.set_modified()
 
-        self.hTexts[i][j].set_color('r')
+        text.set_color('r')
 
+        from .dialog import input_integer
         t = input_integer(self.tMap[i][j])
 
         if not t and t != 0:
-            self.hTexts[i][j].set_color('b')
+            text.set_color('b')
             return
 
-        self.hTexts[i][j].set_text(t)
-        self.hTexts[i][j].set_color('b')
-        self.tMap[i][j] = t
+        text.set_text(t)
+        text.set_color('b')
+        self.model.set_tmpr(i, j, t)
 
     def set_delay(self, delay):
         """
@@ -642,13 +818,13 @@ class Field(object):
         frame = True if self.is_frame() else False
         self.frame_off(frame)
 
-        plt.cla()
+        self.hAxes.cla()
         self.size = [coln, rown]
         self.draw()
 
         self.frame_on(frame)
         self.hFig.canvas.draw()
-        add_star_to_end(self.hFig)
+        self.set_modified()
 
     def add_grid_column(self):
         """ Add one column to the field """
@@ -657,13 +833,13 @@ class Field(object):
             frame = True if self.is_frame() else False
             self.frame_off(frame)
 
-            plt.cla()
+            self.hAxes.cla()
             self.size[0] += 1
             self.draw()
 
             self.frame_on(frame)
             self.hFig.canvas.draw()
-            add_star_to_end(self.hFig)
+            self.set_modified()
 
     def remove_grid_column(self):
         """ Remove one column from the field """
@@ -672,12 +848,12 @@ class Field(object):
             self.frame_off(frame)
 
             self.size[0] -= 1
-            plt.cla()
+            self.hAxes.cla()
             self.draw()
 
             self.frame_on(frame)
             self.hFig.canvas.draw()
-            add_star_to_end(self.hFig)
+            self.set_modified()
 
     def add_grid_row(self):
         """ Add one row to the field """
@@ -685,11 +861,11 @@ class Field(object):
         frame = True if self.is_frame() else False
         self.frame_off(frame)
 
-        plt.cla()
+        self.hAxes.cla()
         self.size[1] += 1
         self.draw()
         self.hFig.canvas.draw()
-        add_star_to_end(self.hFig)
+        self.set_modified()
 
     def remove_grid_row(self):
         """ Remove one row from the field """
@@ -699,33 +875,84 @@ class Field(object):
             self.frame_off(frame)
 
             self.size[1] -= 1
-            plt.cla()
+            self.hAxes.cla()
             self.draw()
 
             self.frame_on(frame)
             self.hFig.canvas.draw()
-            add_star_to_end(self.hFig)
+            self.set_modified()
+
+    def _toolmanager(self):
+        """ Tool manager of the window ( None - the window has no toolbar or the figure is offscreen ) """
+        manager = getattr(self.hFig.canvas, 'manager', None)
+        return getattr(manager, 'toolmanager', None)
 
     def _trigger_tool(self, name):
         """ Trigger tool by name """
-        if self.hFig.canvas.manager.toolmanager:
-            return self.hFig.canvas.manager.toolmanager.trigger_tool(name)
+        if self._toolmanager():
+            return self._toolmanager().trigger_tool(name)
         else:
             return None
 
     def _get_tool(self, name):
         """ Get tool by name """
-        if self.hFig.canvas.manager.toolmanager:
-            return self.hFig.canvas.manager.toolmanager.get_tool(name)
+        if self._toolmanager():
+            return self._toolmanager().get_tool(name)
         else:
             return None
 
+    def show(self):
+        """ Show the window of the field ( the offscreen figure is only rendered ) """
+        if self.isOffscreen:
+            self.hFig.canvas.draw()
+        else:
+            plt.show(block=False)
+
+    def is_open(self):
+        """ True - if the window of the field is not closed ( the offscreen figure is always open ) """
+        return self.isOffscreen or plt.fignum_exists(self.hFig.number)
+
+    def close(self):
+        """ Close the window of the field """
+        if not self.isOffscreen:
+            plt.close(self.hFig)
+
+    def set_title(self, title):
+        """ Set the title of the window, '*' is added to its end while the field is not saved """
+        self.title = title
+        self.hFig.canvas.set_window_title(title + '*' if self.isModified else title)
+
+    def set_modified(self, modified: bool = True):
+        """
+        Mark the field as changed ( modified = True ) or saved
+
+        The state is kept in memory ( isModified, revision ), the title of the window
+        is updated only when the state flips
+        """
+
+        if modified:
+            self.revision += 1
+        if modified != self.isModified:
+            self.isModified = modified
+            self.set_title(self.title)
+
     def is_frame(self):
         """
         Make checks for field frame active
         """
         return True if self.hFrame else False
 
+    def reachable(self, x, y):
+        """
+        Cells reachable from the cell x, y without crossing partitions
+        :return: boolean matrix of the field size
+        """
+        return self.model.reachable(x, y)
+
+    def is_reachable(self, start, finish):
+        """ Check the way from the cell start = (x, y) to the cell finish = (x, y) """
+        return self.model.is_reachable(start, finish)
+
     def frame_redraw(self):
         """
         Redraw field frame
@@ -1,34 +1,52 @@
-import matplotlib.lines as mlines
+import numpy as np
+from matplotlib.collections import LineCollection
 
 
-class GridLine:
+class GridLines:
     """
-    GridLine - line of the field's grid
+    GridLines - lines of the field's grid of one orientation
+
+    All lines are drawn by one LineCollection, only the lines of the visible
+    window of the field are created ( see Field.view )
     """
 
-    def __init__(self, xdata, ydata, ort, fig, axes):
+    def __init__(self, ort, axes):
         """
-        :param xdata, ydata: - line points
-        :param ort: - line orientation = 'ver' | 'hor'
-        :param fig: - matplotlib figure
+        :param ort: - lines orientation = 'ver' | 'hor'
         :param axes: - matplotlib axes
         """
-        self.hLine = mlines.Line2D(xdata, ydata,
-                                   color='b',
-                                   linestyle=':',
-                                   linewidth=0.5,
-                                   pickradius=0.1,
-                                   picker=5,
-                                   zorder=1)
-        self.hFig = fig
+        self.hLines = LineCollection([],
+                                     colors='b',
+                                     linestyles=':',
+                                     linewidths=0.5,
+                                     picker=5,
+                                     zorder=1)
         self.hAxes = axes
-        self.hLine.robotdata = ort
-        self.hAxes.add_line(self.hLine)
+        self.ort = ort
+        self.hLines.robotdata = ort
+        self.hAxes.add_collection(self.hLines, autolim=False)
+
+    def set_view(self, x0, y0, w, h):
+        """
+        Set lines for the visible window of the grid:
+        w columns and h rows starting from the cell x0, y0
+        """
+
+        if self.ort == 'ver':
+            segments = np.zeros((w + 1, 2, 2))
+            segments[:, :, 0] = np.arange(x0, x0 + w + 1)[:, None]
+            segments[:, 0, 1] = y0
+            segments[:, 1, 1] = y0 + h
+        else:
+            segments = np.zeros((h + 1, 2, 2))
+            segments[:, :, 1] = np.arange(y0, y0 + h + 1)[:, None]
+            segments[:, 0, 0] = x0
+            segments[:, 1, 0] = x0 + w
+
+        self.hLines.set_segments(segments)
 
     def delete(self):
         """
-        Removes the grid
+        Removes the grid lines
         """
-        if self.hLine in self.hAxes.lines:
-            self.hAxes.lines.remove(self.hLine)
-        self.hFig.canvas.draw()
+        self.hLines.set_segments([])
@@ -0,0 +1,320 @@
+import os
+import numpy as np
+from .model import FieldModel, Occupancy
+from .mapfile import load_map, save_map
+from ..exceptions import RobotTypeError, FieldSizeTypeError, FieldSizeValueError, CollisionError
+
+
+class HeadlessBody:
+    """
+    Robot body without graphical image
+
+    Keeps only the state of the robot ( position and direction ),
+    all visualization methods do nothing
+
+    The position is kept as the list of Python numbers xy, the commands
+    do not create numpy arrays ( position - the numpy array of xy )
+
+    Properties:
+        xy, position, side, delay
+    """
+
+    def __init__(self, coordinates, side=0):
+        """
+        :param coordinates: initial robot position on the field
+        :param side: initial direction of the robot = 0 | 1 | 2 | 3
+        """
+
+        # indices of the field cell containing the robot ( the lower left cell is indexed: [0,0] )
+        self.xy = np.asarray(coordinates).tolist()
+        self.side = side
+
+    @property
+    def position(self):
+        """ Position of the robot as the numpy array """
+        return np.array(self.xy)
+
+    @position.setter
+    def position(self, value):
+        self.xy = np.asarray(value).tolist()
+
+    @property
+    def delay(self):
+        """ Headless robot never waits """
+        return 0
+
+    @delay.setter
+    def delay(self, value):
+        pass
+
+    def delete(self):
+        """ Delete robot """
+        pass
+
+    def shift(self, coord=None, mode=None):
+        """
+        Shifts the robot on the vector of coord or to the coord point
+        - depending on the mode parameter value
+
+        - coord = 2-vector double = coordinates of the displacement vector | coordinates of the cell
+        - mode = 'vector' (for software movement) / 'punct' (for manual movement)
+        """
+
+        if mode == 'vector':
+            x, y = self.xy
+            self.xy = [x + coord[0], y + coord[1]]
+        elif mode == 'punct':
+            self.xy = [int(coord[0] + 0.5), int(coord[1] + 0.5)]
+            self.side = 0
+        else:
+            raise ValueError()
+
+    def tween(self, coord=None):
+        """ Shifts the robot on the vector coord """
+        x, y = self.xy
+        self.xy = [x + coord[0], y + coord[1]]
+
+    def rot(self, side=None):
+        """
+        Rotates 90 or 180 degrees left or right
+        - side = 'Left' | 'Right' / 'Back' (register value does not matter )
+        """
+
+        side = str.upper(side)
+        if side in ('LEFT', 'L'):
+            self.side = (self.side - 1) % 4
+        elif side in ('RIGHT', 'R'):
+            self.side = (self.side + 1) % 4
+        elif side in ('BACK', 'B'):
+            self.side = (self.side + 2) % 4
+        else:
+            raise ValueError()
+
+    def meas(self):
+        pass
+
+    def mark(self):
+        pass
+
+    def is_mark(self):
+        pass
+
+    def is_bord(self, side=None):
+        pass
+
+    def get_side(self):
+        pass
+
+    def sense(self):
+        pass
+
+
+class HeadlessField(object):
+    """
+    Field without graphic window
+
+    The situation is stored only in the model ( object of class FieldModel ),
+    there are no figures, dialogs and delays
+    """
+
+    def __init__(self, obj, body=None, size=None, frame: bool = True):
+        """
+        :param obj: - object of class RobotEngine ( not yet formed finally )
+        :param body: - reference to the constructor of the robot body ( not used )
+        :param size: - [ number of columns, number of rows ]
+        :param frame: - whether the field frame is enabled
+        """
+
+        self.size = [5, 3]
+        self.obj = obj
+        self.hFig = None
+        self.frame = frame
+        self.is_texts = False
+        self.model = None
+        self.hRobot = None
+        self.body = body
+        self.robots = [obj]  # objects of class RobotEngine on the field, the first one owns the field
+        self.occupancy = None  # cells of the robots ( object of class Occupancy )
+
+        if size is not None:
+            if len(size) == 2:
+                if not isinstance(size[0], int) or not isinstance(size[1], int):
+                    raise FieldSizeTypeError
+                if size[0] < 1 or size[1] < 1:
+                    raise FieldSizeValueError
+                self.size = list(size)
+
+        self.draw()
+
+    @property
+    def hVerBord(self):
+        """ Boolean matrix of vertical partitions """
+        return self.model.hVerBord
+
+    @property
+    def hHorBord(self):
+        """ Boolean matrix of horizontal partitions """
+        return self.model.hHorBord
+
+    @property
+    def hMark(self):
+        """ Boolean matrix of markers """
+        return self.model.hMark
+
+    @property
+    def tMap(self):
+        """ Matrix of temperatures """
+        return self.model.tMap
+
+    def draw(self):
+        """ Create empty field """
+        self.model = FieldModel(self.size, self.frame)
+        self.hRobot = HeadlessBody([0, 0])
+
+        self.obj.hRobot = self.hRobot
+        self.robots_sync()
+
+    def restore(self, is_delay=False, **params):
+        """ Create field from saved data """
+
+        if not self.obj.is_init_save:
+            return
+
+        r = load_map(os.path.join(self.obj.fPath, self.obj.fName), mmap_mode='c')
+
+        if r.get('robot_type') not in ['Robot', 'RobotOrt', 'RobotRot']:
+            raise RobotTypeError
+
+        self.size = list(r.get('size'))
+
+        if not is_delay:
+            if r.get('delay'):
+                if self.obj.delay != 0:
+                    self.set_delay(r.get('delay'))
+                else:
+                    self.obj.delay_def = r.get('delay')
+
+        self.frame = r.get('isFrame') is True
+        self.obj.isServiceable = True
+
+        self.hRobot.shift(r.get('hRobot_position', (0, 0)), 'punct')
+
+        self.model = FieldModel.from_cells(self.size, r.get('cells'), r.get('tMap'), self.frame)
+        self.obj.outMarkPos.clear()
+        self.robots_sync()
+
+    def robot_add(self, robot, position=(0, 0), side=0):
+        """
+        Put one more robot on the field ( see Field.robot_add )
+
+        :param robot: - object of class RobotEngine ( not yet formed finally )
+        :param position: - cell of the robot, it must be free
+        :param side: - direction of the oriented robot = 0 | 1 | 2 | 3
+        """
+
+        x, y = (int(v) for v in position)
+        if self.occupancy.get(x, y):
+            raise CollisionError
+
+        robot.hRobot = HeadlessBody([x, y], int(side))
+        self.robots.append(robot)
+        self.occupancy.move(len(self.robots), x, y)
+
+    def robots_sync(self):
+        """ Put the cells of all robots into the occupancy """
+
+        self.occupancy = Occupancy()
+        for number, robot in enumerate(self.robots, 1):
+            if robot.hRobot is not None:
+                self.occupancy.move(number, *robot.cell())
+
+    def save(self, filepath=None):
+        """
+        Saves the current situation in the map file of the robot object
+        ( or in the file filepath )
+        """
+
+        if filepath:
+            self.obj.fPath = os.path.dirname(filepath)
+            self.obj.fName = os.path.basename(filepath)
+        else:
+            filepath = os.path.join(self.obj.fPath, self.obj.fName)
+
+        save_map(filepath, self.model, self.obj.robotType, self.hRobot.position, self.obj.delay_def)
+
+        self.obj.is_init_save = True
+
+        return True
+
+    def marker_create(self, i, j):
+        """ Set marker in the cell """
+        self.model.set_mark(i, j)
+
+    def borders_delete(self):
+        """ Remove all borders from the field """
+        self.model.borders_clear()
+
+    def markers_delete(self):
+        """ Remove all markers from the field """
+        self.model.markers_clear()
+
+    def frame_create(self):
+        """ Enable field frame """
+        self.frame = True
+        self.model.frame_create()
+
+    def frame_delete(self):
+        """ Disable field frame """
+        self.frame = False
+        self.model.frame_delete()
+
+    def is_frame(self):
+        """
+        Make checks for field frame active
+        """
+        return self.model.isFrame
+
+    def reachable(self, x, y):
+        """
+        Cells reachable from the cell x, y without crossing partitions
+        :return: boolean matrix of the field size
+        """
+        return self.model.reachable(x, y)
+
+    def is_reachable(self, start, finish):
+        """ Check the way from the cell start = (x, y) to the cell finish = (x, y) """
+        return self.model.is_reachable(start, finish)
+
+    def is_tmpr_text_on(self):
+        """ Temperature is never shown on the headless field """
+        return False
+
+    def tmpr_text_trigger(self):
+        pass
+
+    def set_delay(self, delay):
+        """
+        Set delay for operations
+        :param delay:
+        """
+        self.obj.delay = delay
+        self.obj.delay_def = delay
+
+    def set_size(self, coln: int = None, rown: int = None):
+        """
+        Set field size ( the field is cleared )
+        :param coln:int number of columns
+        :param rown:int number of rows
+        """
+        if coln is None:
+            coln = self.size[0]
+        if rown is None:
+            rown = self.size[1]
+
+        if not isinstance(coln, int) or not isinstance(rown, int):
+            raise FieldSizeTypeError
+        if coln < 1 or rown < 1:
+            raise FieldSizeValueError
+
+        self.size = [coln, rown]
+        self.draw()
@@ -0,0 +1,115 @@
+import numpy as np
+
+
+class LayerRows:
+    """
+    Rows of the array of a field layer ( partitions, markers ), addressed by the keys
+
+    A row is appended to the end of the array and is removed by moving the last row
+    into its place, so the add and the remove take constant time. The whole layer
+    is replaced or cleared at once by replace and clear
+
+    The free rows at the end of the array are filled by the fill value ( NaN - the rows
+    are not drawn ), so the whole array can be drawn, and the array can be shared
+    with the artist of the layer ( see share )
+
+    Methods: add, remove, replace, clear, array, share
+    """
+
+    def __init__(self, shape, fill=np.nan):
+        """
+        :param shape: - shape of one row, for example ( 2, ) - point, ( 3, 2 ) - segment
+        :param fill: - value of the free rows
+        """
+        self.shape = tuple(shape)
+        self.fill = fill
+        self.index = {}  # {key: number of the row}
+        self.keys = []  # keys of the rows
+        self.data = np.empty((0,) + self.shape)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def add(self, key, row):
+        """
+        Add the row of the key ( the row of the existing key is replaced )
+
+        :return: True - if the key is new
+        """
+
+        k = self.index.get(key)
+        if k is not None:
+            self.data[k] = row
+            return False
+
+        n = len(self.keys)
+        if n == len(self.data):
+            # the array is doubled, so the append takes constant time on average
+            self.data = np.concatenate([self.data, np.full((max(n, 16),) + self.shape, self.fill)])
+        self.data[n] = row
+        self.index[key] = n
+        self.keys.append(key)
+        return True
+
+    def remove(self, key):
+        """
+        Remove the row of the key
+
+        :return: True - if the key existed
+        """
+
+        k = self.index.pop(key, None)
+        if k is None:
+            return False
+
+        last = self.keys.pop()
+        n = len(self.keys)
+        if k != n:
+            # the last row takes the place of the removed one
+            self.data[k] = self.data[n]
+            self.keys[k] = last
+            self.index[last] = k
+        self.data[n] = self.fill
+        return True
+
+    def replace(self, keys, rows):
+        """
+        Replace all rows
+
+        :param keys: - list of the keys
+        :param rows: - array of the rows ( len( keys ) x shape )
+        """
+        self.keys = list(keys)
+        self.index = dict(zip(self.keys, range(len(self.keys))))
+        self.data = np.array(rows, dtype=float).reshape((len(self.keys),) + self.shape)
+
+    def clear(self):
+        """ Remove all rows ( the array is kept for the next rows ) """
+        self.index = {}
+        self.keys = []
+        self.data[:] = self.fill
+
+    def array(self):
+        """ Rows of the keys as the array N x shape ( the view of the data ) """
+        return self.data[:len(self.keys)]
+
+    def share(self, array):
+        """
+        Keep the rows in the array of the artist, that draws the whole data array
+        ( the artist can copy the array, that is passed to it ), so the next edits are
+        written into the artist in place
+
+        :param array: - array of the artist with the same values as the data array
+        :return: True - if the rows are kept in the array of the artist
+        """
+
+        if array.size != self.data.size or not array.flags.writeable or not array.flags.c_contiguous:
+            return False
+        self.data = array.reshape(self.data.shape)
+        return True
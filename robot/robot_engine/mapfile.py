@@ -0,0 +1,248 @@
+"""
+Map file of the field
+
+Version 2 - npz-container ( zip of .npy arrays, numpy.load with allow_pickle=False ):
+    header - json in the uint8 array:
+        format = 'robot-map', version = 2,
+        size, isFrame, robot_type, hRobot_position, delay
+    cells - uint8 matrix of the cell masks ( partitions, markers and frame, see FieldModel )
+    tMap - int8 matrix of temperatures ( wider integer type, if the values do not fit )
+    The arrays are stored without compression, so they can be mapped into memory
+    ( load_map with mmap_mode ): only the pages of the cells, that are used, are read
+
+Version 1 ( legacy ) - pickled dict with the boolean matrices hVerBord, hHorBord, hMark,
+it is read by the restricted unpickler ( only numpy arrays and builtin values )
+"""
+
+import json
+import numbers
+import struct
+import pickle
+import zipfile
+import numpy as np
+from .model import FieldModel
+from ..exceptions import MapfileFormatError
+
+MAP_FORMAT = 'robot-map'
+MAP_VERSION = 2
+ROBOT_TYPES = ('Robot', 'RobotOrt', 'RobotRot')
+
+
+def save_map(filepath, model, robot_type, position, delay):
+    """
+    Save the situation on the field in the map file of the version 2
+
+    :param filepath: - path to the map file or binary file object
+    :param model: - object of class FieldModel
+    :param robot_type: - 'Robot' | 'RobotOrt' | 'RobotRot'
+    :param position: - position of the robot ( the cell of the broken robot is saved )
+    :param delay: - delay of the robot commands
+    """
+
+    # the matrices can be mapped from the same file
+    model.load_arrays()
+
+    header = {
+        'format': MAP_FORMAT,
+        'version': MAP_VERSION,
+        'size': list(model.size),
+        'isFrame': bool(model.isFrame),
+        'robot_type': robot_type,
+        'hRobot_position': [int(round(v)) for v in np.asarray(position).tolist()],
+        'delay': delay
+    }
+
+    tmap = np.asarray(model.tMap)
+    if tmap.size and np.iinfo(np.int8).min <= tmap.min() and tmap.max() <= np.iinfo(np.int8).max:
+        tmap = tmap.astype(np.int8)
+
+    arrays = {
+        'header': np.frombuffer(json.dumps(header).encode(), dtype=np.uint8),
+        'cells': model.cells,
+        'tMap': tmap
+    }
+
+    if hasattr(filepath, 'write'):
+        np.savez(filepath, **arrays)
+        return
+
+    with open(filepath, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def load_map(filepath, mmap_mode=None):
+    """
+    Load the map file of any version
+
+    :param filepath: - path to the map file or binary file object ( the version 2 only )
+    :param mmap_mode: - None | 'r' | 'c' - the matrices of the map file of the version 2
+                        are mapped into memory ( see numpy.memmap ), 'c' - changes are not written to the file
+    :return: dict with the keys: version, size, isFrame, robot_type, hRobot_position, delay,
+             cells ( see FieldModel.from_cells ), tMap
+    """
+
+    if hasattr(filepath, 'read'):
+        mmap_mode = None
+    elif is_legacy_map(filepath):
+        return load_legacy_map(filepath)
+
+    try:
+        # the members of npz-container are read only on access
+        with np.load(filepath, allow_pickle=False) as data:
+            header = json.loads(data['header'].tobytes().decode())
+            if mmap_mode:
+                r = dict(header, cells=_memmap_npy(filepath, 'cells.npy', mmap_mode),
+                         tMap=_memmap_npy(filepath, 'tMap.npy', mmap_mode))
+            else:
+                r = dict(header, cells=data['cells'], tMap=data['tMap'])
+    except (ValueError, KeyError, OSError, zipfile.BadZipFile):
+        raise MapfileFormatError
+
+    if not isinstance(header, dict) or header.get('format') != MAP_FORMAT or header.get('version') != MAP_VERSION:
+        raise MapfileFormatError
+
+    _check_map(r)
+    return r
+
+
+def load_legacy_map(filepath):
+    """
+    Load the map file of the version 1 ( pickled dict )
+
+    :return: dict as load_map
+    """
+
+    try:
+        with open(filepath, 'rb') as f:
+            r = _MapUnpickler(f).load()
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError):
+        raise MapfileFormatError
+
+    if not isinstance(r, dict):
+        raise MapfileFormatError
+
+    try:
+        size = [int(v) for v in r.get('size')]
+        model = FieldModel.from_arrays(size, r.get('hVerBord'), r.get('hHorBord'),
+                                       r.get('hMark'), np.array(r.get('tMap')), r.get('isFrame') is True)
+        position = [int(round(v)) for v in np.asarray(r.get('hRobot_position', (0, 0))).tolist()]
+    except (TypeError, ValueError, IndexError):
+        raise MapfileFormatError
+
+    r = {
+        'version': 1,
+        'size': size,
+        'isFrame': r.get('isFrame') is True,
+        'robot_type': r.get('robot_type'),
+        'hRobot_position': position,
+        'delay': r.get('delay'),
+        'cells': model.cells,
+        'tMap': model.tMap
+    }
+
+    _check_map(r)
+    return r
+
+
+def is_legacy_map(filepath):
+    """ True - if the map file is of the version 1 ( pickled dict ) """
+
+    with open(filepath, 'rb') as f:
+        return not zipfile.is_zipfile(f)
+
+
+def convert_map(src, dst=None):
+    """
+    Convert the map file to the version 2
+
+    :param src: - path to the map file
+    :param dst: - path to the converted file ( src by default )
+    :return: True - if the file was converted, False - if it is already of the version 2
+    """
+
+    if dst is None:
+        dst = src
+
+    if not is_legacy_map(src):
+        return False
+
+    r = load_legacy_map(src)
+    model = FieldModel.from_cells(r['size'], r['cells'], r['tMap'], r['isFrame'])
+    save_map(dst, model, r['robot_type'], r['hRobot_position'], r['delay'])
+
+    return True
+
+
+def _memmap_npy(filepath, name, mode):
+    """ Map the array of the npz-container ( stored without compression ) into memory """
+
+    with zipfile.ZipFile(filepath) as zf:
+        info = zf.getinfo(name)
+        if info.compress_type != zipfile.ZIP_STORED:
+            raise MapfileFormatError
+
+        with zf.open(name) as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            header_size = f.tell()
+
+    if dtype.hasobject:
+        raise MapfileFormatError
+
+    with open(filepath, 'rb') as f:
+        # local file header of the zip member: 30 bytes + name + extra field
+        f.seek(info.header_offset)
+        local = f.read(30)
+        name_size, extra_size = struct.unpack('<HH', local[26:30])
+
+    offset = info.header_offset + 30 + name_size + extra_size + header_size
+
+    return np.memmap(filepath, dtype=dtype, mode=mode, offset=offset, shape=shape,
+                     order='F' if fortran_order else 'C')
+
+
+def _check_map(r):
+    """ Checks the header values and the matrices of the map file, raise errors """
+
+    if not (_is_cell(r.get('size')) and _is_cell(r.get('hRobot_position'))
+            and (r.get('delay') is None or _is_number(r.get('delay')))
+            and r.get('robot_type') in ROBOT_TYPES):
+        raise MapfileFormatError
+
+    cells, tmap = r['cells'], r['tMap']
+    size = tuple(r['size'])
+    if cells.dtype != np.uint8 or cells.shape != size:
+        raise MapfileFormatError
+    if not np.issubdtype(tmap.dtype, np.integer) or tmap.shape != size:
+        raise MapfileFormatError
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _is_cell(value):
+    """ Two integers: the size of the field or the cell """
+    return (isinstance(value, (list, tuple)) and len(value) == 2
+            and all(isinstance(v, numbers.Integral) and not isinstance(v, bool) for v in value))
+
+
+class _MapUnpickler(pickle.Unpickler):
+    """ Unpickler of the legacy map files, it creates only numpy arrays and builtin values """
+
+    allowed = {
+        ('numpy', 'ndarray'),
+        ('numpy', 'dtype'),
+        ('numpy.core.multiarray', '_reconstruct'),
+        ('numpy.core.multiarray', 'scalar'),
+        ('numpy._core.multiarray', '_reconstruct'),
+        ('numpy._core.multiarray', 'scalar'),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) not in self.allowed:
+            raise pickle.UnpicklingError('global ' + module + '.' + name + ' is forbidden')
+        return super().find_class(module, name)
@@ -1,42 +1,121 @@
-import matplotlib.pyplot as plt
+import numpy as np
 import matplotlib.patches as mpatches
-from .star_control import add_star_to_end
+from matplotlib.collections import EllipseCollection
+from .layer import LayerRows
 
 
-class Marker:
+class Markers:
     """
-    Class Marker - cell marker
+    Class Markers - markers of the field cells
 
-    Methods: constructor, delete
-    Has the patch property of the corresponding graphic object
+    All markers are drawn by one collection, the offsets ( the centers of the cells )
+    are kept in the offsets of the collection ( see LayerRows.share, the free rows are NaN ),
+    so a marker is added or removed in place in constant time, the offsets are passed
+    again only when the array grows or all markers are replaced
+
+    Methods: add, remove, restore, clear, overlay, overlay_cells, new
+    Has the hMarks property of the corresponding graphic object
     """
 
-    def __init__(self, xf, yf, axes):
+    R = .15  # radius of the marker
+
+    def __init__(self, axes):
         """
-        :param xf, yf: - coordinates of the lower left corner of the cell
         :param axes: - matplotlib axes
         """
 
         self.hAxes = axes
-        # x0, y0 - the coordinates of the center of the cell
-        x0 = xf + 0.5
-        y0 = yf + 0.5
+        self.cells = LayerRows((2,))  # (i, j): [i + 0.5, j + 0.5]
+        self.shown = None  # the array of the offsets, that is drawn by the collection
+
+        self.hMarks = self._collection(picker=5)
+        self.hAxes.add_collection(self.hMarks, autolim=False)
+
+        # the new marker, it is drawn into the cached background of the field ( see Renderer.draw_static )
+        self.hNew = self._collection(animated=True)
+        self.hAxes.add_collection(self.hNew, autolim=False)
 
-        self.hPatch = mpatches.Circle((x0, y0), .15,
+        # the markers of the cells of several robots, they are drawn over the robots
+        self.hOver = self._collection(animated=True)
+        self.hAxes.add_collection(self.hOver, autolim=False)
+
+        # the marker of one cell, it is drawn over the robot ( see Renderer.overlay )
+        self.hPatch = mpatches.Circle((0.5, 0.5), self.R,
                                       facecolor='m',
                                       edgecolor='m',
                                       linewidth=0.5,
                                       clip_on=False,
                                       zorder=17,
-                                      picker=5)
-
+                                      animated=True)
         self.hAxes.add_patch(self.hPatch)
 
-    def delete(self):
+    def __contains__(self, cell):
+        return cell in self.cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add(self, i, j):
+        """ Add marker to the cell i, j """
+        if self.cells.add((i, j), [i + 0.5, j + 0.5]):
+            self._update()
+
+    def remove(self, i, j):
+        """ Remove marker from the cell i, j """
+        if self.cells.remove((i, j)):
+            self._update()
+
+    def restore(self, mark, x0=0, y0=0):
         """
-        Remove marker
-        Records the change of the scene (adds * to the end of the window title)
+        Replace all markers by the markers of the boolean matrix ( see FieldModel.hMark ),
+        the matrix can be a part of the field starting from the cell x0, y0
         """
+        cells = np.transpose(np.nonzero(mark)) + [x0, y0]
+        self.cells.replace(map(tuple, cells.tolist()), cells + 0.5)
+        self._update()
+
+    def clear(self):
+        """ Remove all markers """
+        self.cells.clear()
+        self._update()
+
+    def overlay(self, i, j):
+        """ Artists of the marker of the cell i, j ( to be drawn over the robot ) """
+        if (i, j) in self.cells:
+            self.hPatch.center = (i + 0.5, j + 0.5)
+            return [self.hPatch]
+        return []
+
+    def overlay_cells(self, cells):
+        """ Artists of the markers of the cells [ (i, j), ... ] ( to be drawn over the robots ) """
+        marked = [cell for cell in cells if cell in self.cells]
+        if not marked:
+            return []
+        self.hOver.set_offsets(np.array(marked, dtype=float) + 0.5)
+        return [self.hOver]
+
+    def new(self, i, j):
+        """ Artist of the single marker of the cell i, j, it is drawn exactly as the markers of the collection """
+        self.hNew.set_offsets([[i + 0.5, j + 0.5]])
+        return self.hNew
+
+    def _collection(self, **kwargs):
+        return EllipseCollection(2 * self.R, 2 * self.R, 0,
+                                 units='xy',
+                                 offsets=np.empty((0, 2)),
+                                 transOffset=self.hAxes.transData,
+                                 facecolors='m',
+                                 edgecolors='m',
+                                 linewidths=0.5,
+                                 clip_on=False,
+                                 zorder=17,
+                                 **kwargs)
 
-        self.hAxes.patches.remove(self.hPatch)
-        add_star_to_end(plt.gcf())
+    def _update(self):
+        data = self.cells.data
+        if data is not self.shown:
+            # the new array is passed to the collection once, the next edits change its offsets
+            self.hMarks.set_offsets(data)
+            if self.cells.share(self.hMarks.get_offsets()):
+                self.shown = self.cells.data
+        self.hMarks.stale = True
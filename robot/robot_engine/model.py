@@ -0,0 +1,412 @@
+import mmap
+import numpy as np
+
+# Bits of the cell mask ( index of the bit = index of the side, see helpers.encode_side )
+BORD_N = 1  # partition on the North side of the cell
+BORD_O = 2  # partition on the East side of the cell
+BORD_S = 4  # partition on the South side of the cell
+BORD_W = 8  # partition on the West side of the cell
+BORD_ALL = BORD_N | BORD_O | BORD_S | BORD_W
+MARK = 16  # marker in the cell
+
+BORD_BITS = (BORD_N, BORD_O, BORD_S, BORD_W)
+
+
+def is_mapped(a):
+    """ True - if the array is mapped into memory from the file ( the array or the array that it views ) """
+    while isinstance(a, np.ndarray):
+        if isinstance(a, np.memmap):
+            return True
+        a = a.base
+    return isinstance(a, mmap.mmap)
+
+
+def clear_frame_bits(cells):
+    """ Clear the frame bits of the edge cells of the matrix of cell masks ( in place ) """
+    cells[:, -1] &= ~BORD_N & 0xFF
+    cells[-1, :] &= ~BORD_O & 0xFF
+    cells[:, 0] &= ~BORD_S & 0xFF
+    cells[0, :] &= ~BORD_W & 0xFF
+
+
+class FieldModel:
+    """
+    Situation on the cellular field without graphics
+
+    Each cell is described by one byte of the cells matrix:
+        bits 0..3 - partitions on the North, East, South and West sides of the cell
+                    ( the frame of the field is stored in the same bits of the edge cells )
+        bit 4 - marker in the cell
+
+    So every partition is stored twice - in the masks of both adjacent cells,
+    and the check of a partition or a marker is a single array lookup
+
+    Properties:
+        size, cells, tMap, isFrame
+        hVerBord, hHorBord, hMark - boolean matrices ( the format of the map file )
+    """
+
+    def __init__(self, size, frame: bool = False, tmap=None, cells=None):
+        """
+        :param size: - [ number of columns, number of rows ]
+        :param frame: - whether the field frame is enabled
+        :param tmap: - matrix of temperatures ( is generated randomly by default )
+        :param cells: - matrix of cell masks without the frame bits ( empty field by default )
+        """
+
+        self.size = [int(size[0]), int(size[1])]
+        self.cells = np.zeros(self.size, dtype=np.uint8) if cells is None else cells
+        self.isFrame = False
+
+        if tmap is None:
+            tmap = np.random.randint(-10, 10, size=self.size)
+        self.tMap = tmap
+
+        if frame:
+            self.frame_create()
+
+    @classmethod
+    def from_arrays(cls, size, ver_bord, hor_bord, mark, tmap, frame: bool = False):
+        """
+        Create model from the matrices of the map file
+
+        :param ver_bord: - matrix of vertical partitions ( [i][j] - on the West side of the cell i,j )
+        :param hor_bord: - matrix of horizontal partitions ( [i][j] - on the South side of the cell i,j )
+        :param mark: - matrix of markers
+        """
+
+        model = cls(size, tmap=tmap)
+
+        ver = np.array(ver_bord, dtype=bool)
+        hor = np.array(hor_bord, dtype=bool)
+        ver[0, :] = False
+        hor[:, 0] = False
+
+        model.cells[ver] |= BORD_W
+        model.cells[:-1][ver[1:]] |= BORD_O
+        model.cells[hor] |= BORD_S
+        model.cells[:, :-1][hor[:, 1:]] |= BORD_N
+        model.cells[np.array(mark, dtype=bool)] |= MARK
+
+        if frame:
+            model.frame_create()
+
+        return model
+
+    @classmethod
+    def from_cells(cls, size, cells, tmap, frame: bool = False):
+        """
+        Create model from the matrix of cell masks ( the matrices are not copied,
+        so they can be mapped into memory from the map file )
+
+        :param cells: - uint8 matrix of cell masks
+        :param frame: - whether the frame bits are set in the cells
+        """
+
+        model = cls(size, tmap=tmap, cells=np.asarray(cells, dtype=np.uint8))
+        model.isFrame = bool(frame)
+
+        return model
+
+    def load_arrays(self):
+        """ Load the matrices mapped from the file into memory ( the file can be rewritten ) """
+
+        if is_mapped(self.cells):
+            self.cells = np.array(self.cells)
+        if is_mapped(self.tMap):
+            self.tMap = np.array(self.tMap)
+
+    @property
+    def hVerBord(self):
+        """ Boolean matrix of vertical partitions without the frame """
+        ver = (self.cells & BORD_W).astype(bool)
+        ver[0, :] = False
+        return ver
+
+    @property
+    def hHorBord(self):
+        """ Boolean matrix of horizontal partitions without the frame """
+        hor = (self.cells & BORD_S).astype(bool)
+        hor[:, 0] = False
+        return hor
+
+    @property
+    def hMark(self):
+        """ Boolean matrix of markers """
+        return (self.cells & MARK).astype(bool)
+
+    def window(self, x0, y0, w, h):
+        """
+        Boolean matrices of vertical and horizontal partitions and markers
+        of the part of the field: w columns and h rows starting from the cell x0, y0
+        ( the partitions on the right and upper edges of the part are included )
+
+        Only this part of the cells matrix is read
+        """
+
+        ver = (self.cells[x0:x0 + w + 1, y0:y0 + h] & BORD_W).astype(bool)
+        if x0 == 0:
+            ver[0, :] = False
+        hor = (self.cells[x0:x0 + w, y0:y0 + h + 1] & BORD_S).astype(bool)
+        if y0 == 0:
+            hor[:, 0] = False
+        mark = (self.cells[x0:x0 + w, y0:y0 + h] & MARK).astype(bool)
+
+        return ver, hor, mark
+
+    def reachable(self, x, y):
+        """
+        Cells reachable from the cell x, y without crossing partitions
+
+        The cells are joined into the vertical runs between the partitions, the runs of the
+        neighbour columns are joined by the passages to the East. The connected components
+        of the runs are found by the numpy passes over all passages: every root of a tree
+        is hooked to the smaller root of its neighbour and the trees are flattened
+        by the pointer jumping, so the number of passes does not depend on the length of the way
+
+        :return: boolean matrix of the field size
+        """
+
+        n, m = self.size
+        cells = self.cells
+
+        # the first cell of the run: the lower cell of the column or the partition on the South side
+        start = np.empty((n, m), dtype=bool)
+        start[:, 0] = True
+        np.not_equal(cells[:, :-1] & BORD_N, 0, out=start[:, 1:])
+        run = np.cumsum(start.ravel(), dtype=np.intp).reshape(n, m) - 1
+
+        # one passage for the pair of the runs: the passage from the first cells of the runs
+        # or after the partition
+        passage = cells[:-1, :] & BORD_O == 0
+        first = start[:-1, :] | start[1:, :]
+        first[:, 1:] |= ~passage[:, :-1]
+        passage &= first
+        u = run[:-1, :][passage]
+        v = run[1:, :][passage]
+
+        root = np.arange(run[-1, -1] + 1, dtype=np.intp)
+        while True:
+            ru = root[u]
+            rv = root[v]
+            other = ru != rv
+            if not other.any():
+                break
+            u, v, ru, rv = u[other], v[other], ru[other], rv[other]
+            root[np.maximum(ru, rv)] = np.minimum(ru, rv)
+            while True:
+                jump = root[root]
+                if np.array_equal(jump, root):
+                    break
+                root = jump
+
+        return root[run] == root[run[x, y]]
+
+    def is_reachable(self, start, finish):
+        """ Check the way from the cell start = (x, y) to the cell finish = (x, y) """
+        return bool(self.reachable(*start)[tuple(finish)])
+
+    def set_tmpr(self, i, j, value):
+        """ Set temperature of the cell i, j ( the matrix type is widened, if the value does not fit ) """
+
+        info = np.iinfo(self.tMap.dtype)
+        if not info.min <= value <= info.max:
+            self.tMap = np.array(self.tMap, dtype=int)
+        self.tMap[i, j] = value
+
+    def is_bord(self, x, y, side):
+        """
+        Checks for the presence of a partition ( or the frame ) on the side of the cell x, y
+        The cell can be outside of the field, then only the frame can be a border
+
+        :param side: 0 | 1 | 2 | 3 ( North, East, South, West )
+        """
+
+        n, m = self.size
+        if 0 <= x < n and 0 <= y < m:
+            return bool(self.cells.item(x, y) & BORD_BITS[side])
+
+        if not self.isFrame:
+            return False
+
+        if side == 0:
+            return 0 <= x < n and y == -1
+        elif side == 2:
+            return 0 <= x < n and y == m
+        elif side == 1:
+            return 0 <= y < m and x == -1
+        else:
+            return 0 <= y < m and x == n
+
+    def run(self, x, y, side, mark: bool = False, limit: int = None):
+        """
+        Walk from the cell x, y ( inside the field ) to the side till the partition ( or the marked cell,
+        if mark ) or the edge of the field, the cells are checked in one pass over the row ( column )
+
+        :param side: 0 | 1 | 2 | 3 ( North, East, South, West )
+        :param limit: - max number of the checked cells
+        :return: k, stop - number of the passed cells and the mask of the cell, where the walk is stopped
+                 ( 0 - the walk has reached the edge of the field or the limit )
+        """
+
+        if side == 0:
+            line = self.cells[x, y:]
+        elif side == 1:
+            line = self.cells[x:, y]
+        elif side == 2:
+            line = self.cells[x, y::-1]
+        else:
+            line = self.cells[x::-1, y]
+
+        if limit is not None:
+            line = line[:limit]
+
+        i = np.flatnonzero(line & (BORD_BITS[side] | (MARK if mark else 0)))
+        if not len(i):
+            return len(line), 0
+        return int(i[0]), int(line[i[0]])
+
+    def is_ver_bord(self, i, j):
+        """ Check the vertical partition on the West side of the cell i, j """
+        return 0 < i < self.size[0] and bool(self.cells.item(i, j) & BORD_W)
+
+    def is_hor_bord(self, i, j):
+        """ Check the horizontal partition on the South side of the cell i, j """
+        return 0 < j < self.size[1] and bool(self.cells.item(i, j) & BORD_S)
+
+    def set_ver_bord(self, i, j, value: bool = True):
+        """ Set ( or remove ) the vertical partition on the West side of the cell i, j """
+        if value:
+            self.cells[i, j] |= BORD_W
+            self.cells[i - 1, j] |= BORD_O
+        else:
+            self.cells[i, j] &= ~BORD_W & 0xFF
+            self.cells[i - 1, j] &= ~BORD_O & 0xFF
+
+    def set_hor_bord(self, i, j, value: bool = True):
+        """ Set ( or remove ) the horizontal partition on the South side of the cell i, j """
+        if value:
+            self.cells[i, j] |= BORD_S
+            self.cells[i, j - 1] |= BORD_N
+        else:
+            self.cells[i, j] &= ~BORD_S & 0xFF
+            self.cells[i, j - 1] &= ~BORD_N & 0xFF
+
+    def is_mark(self, i, j):
+        """ Check the marker in the cell i, j """
+        return bool(self.cells.item(i, j) & MARK)
+
+    def set_mark(self, i, j, value: bool = True):
+        """ Set ( or remove ) the marker in the cell i, j """
+        if value:
+            self.cells[i, j] |= MARK
+        else:
+            self.cells[i, j] &= ~MARK & 0xFF
+
+    def borders_clear(self):
+        """ Remove all partitions ( the frame remains ) """
+        self.cells &= ~BORD_ALL & 0xFF
+        if self.isFrame:
+            self.isFrame = False
+            self.frame_create()
+
+    def markers_clear(self):
+        """ Remove all markers """
+        self.cells &= ~MARK & 0xFF
+
+    def frame_create(self):
+        """ Set the frame bits of the edge cells """
+        if not self.isFrame:
+            self.cells[:, -1] |= BORD_N
+            self.cells[-1, :] |= BORD_O
+            self.cells[:, 0] |= BORD_S
+            self.cells[0, :] |= BORD_W
+            self.isFrame = True
+
+    def frame_delete(self):
+        """ Clear the frame bits of the edge cells """
+        if self.isFrame:
+            clear_frame_bits(self.cells)
+            self.isFrame = False
+
+
+class MarkSet:
+    """
+    Markers of the cells outside of the field
+
+    The cells are kept in the hash table, so the insert and the check of a marker
+    take constant time. The order of insertion is kept
+
+    Methods:
+        add, is_mark, clear, to_array
+    """
+
+    def __init__(self, cells=()):
+        """
+        :param cells: - initial cells [ [x, y], ... ]
+        """
+        self.cells = dict.fromkeys((int(x), int(y)) for x, y in cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return tuple(cell) in self.cells
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def add(self, x, y):
+        """
+        Set marker in the cell x, y
+
+        :return: True - if the marker is new
+        """
+        if (x, y) in self.cells:
+            return False
+        self.cells[(x, y)] = None
+        return True
+
+    def is_mark(self, x, y):
+        """ Check the marker in the cell x, y """
+        return (x, y) in self.cells
+
+    def clear(self):
+        """ Remove all markers """
+        self.cells.clear()
+
+    def to_array(self):
+        """ Cells with markers as the matrix N x 2 ( in the order of insertion ) """
+        if not self.cells:
+            return np.empty((0, 2), int)
+        return np.array(list(self.cells), dtype=int)
+
+
+class Occupancy:
+    """
+    Cells of the field occupied by the robots ( several robots on one field )
+
+    The numbers of the robots ( 1, 2, ... ) are kept in the hash table of the cells
+    ( as in MarkSet ), so the check of a cell takes constant time inside and outside
+    of the field, and the memory does not depend on the size of the field
+
+    Methods:
+        move, get
+    """
+
+    def __init__(self):
+        self.cells = {}  # {(x, y): number}
+        self.positions = {}  # {number: (x, y)}
+
+    def move(self, number, x, y):
+        """ Move the robot number to the cell x, y """
+
+        old = self.positions.get(number)
+        if old is not None and self.cells.get(old) == number:
+            del self.cells[old]
+        self.positions[number] = (x, y)
+        self.cells[(x, y)] = number
+
+    def get(self, x, y):
+        """ Number of the robot in the cell x, y ( 0 - the cell is free ) """
+        return self.cells.get((x, y), 0)
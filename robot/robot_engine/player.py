@@ -0,0 +1,317 @@
+import os
+import time
+import bisect
+import tempfile
+from array import array
+import numpy as np
+from .robot_engine import RobotEngine
+from .model import FieldModel, MarkSet
+from .trace import TraceReader, OPCODES, SIDES, NO_SIDE, OP_STEP, OP_ROT, OP_MARK
+
+# shifts of the sides: North, East, South, West
+DX = (0, 1, 0, -1)
+DY = (1, 0, -1, 0)
+
+# turns of the rot sides: Left, Right, Back
+TURN = {4: -1, 5: 1, 6: 2}
+
+ERROR = 8  # the command raised an error
+EFFECT = 16  # the step broke the robot or the mark set a new marker
+
+
+class TracePlayer:
+    """
+    Player of the trace of the robot commands ( see trace ) in the window of the field
+
+    The trace is indexed once: the records are kept in compact arrays, the state of the robot
+    ( position, direction, serviceability, number of markers ) is saved every snapshot_every records,
+    so seeking to any command replays not more than snapshot_every records from the nearest snapshot
+
+    SYNTAX:
+        p = TracePlayer( 'run.trace' )
+        p.play(), p.pause(), p.toggle()
+        p.set_speed( 100 ) - 1x .. 1000x, 1x - the speed of the run with the delay of the trace
+        p.seek( 900000 ) - show the situation after the given number of commands
+
+    Keys of the window:
+        space - play / pause, up / down - speed x10 / x0.1,
+        right / left - one second forward / back, home / end - the first / the last command
+
+    Properties:
+        engine, total, position, speed, isPlaying
+    """
+
+    def __init__(self, filepath, speed: float = 1, snapshot_every: int = 4096, fps: float = 25):
+        """
+        :param filepath: - path to the trace file
+        :param speed: - speed of the playing ( 1 .. 1000 )
+        :param snapshot_every: - number of the records between the snapshots of the state
+        :param fps: - max number of frames per second, the commands between the frames are skipped
+        """
+
+        self.trace = TraceReader(filepath)
+        meta = self.trace.meta
+
+        # the field is created from the initial situation of the trace
+        fd, mapfile = tempfile.mkstemp(suffix='.map')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.trace.mapData)
+            self.engine = RobotEngine(mapfile, meta['robot_type'])
+            self.engine.hField.model.load_arrays()
+        finally:
+            os.remove(mapfile)
+
+        self.engine.fPath = os.path.dirname(filepath)
+        self.engine.fName = os.path.basename(filepath)
+        self.engine.delay_off()
+        self.engine.effects_off()
+        self.engine.hField.set_title('Player - ' + filepath)
+        self.engine.hField.hFig.canvas.mpl_connect('key_press_event', self.key_press)
+        self.statusBar = getattr(getattr(self.engine.hField.hFig.canvas, 'manager', None), 'statusbar', None)
+
+        self.rate = 1 / (meta.get('delay') or 0.5)  # commands per second at 1x
+        self.speed = 1
+        self.fps = fps
+        self.isPlaying = False
+        self.timer = None
+        self.playStart = (0, 0)  # time and command, when the playing was started
+
+        x, y = self.trace.map['hRobot_position']
+        self.initState = [int(x), int(y), int(meta.get('side', 0)), bool(meta.get('isServiceable', True)), 0]
+        self._index(max(int(snapshot_every), 1))
+
+        self.position = 0  # number of the shown commands
+        self.state = list(self.initState)
+        self.shownMarks = 0
+        self._show(self.initState, True)
+        self.set_speed(speed)
+
+    def play(self):
+        """ Start playing from the current command """
+
+        if self.position >= self.total:
+            self.seek(0)
+
+        self.isPlaying = True
+        self.playStart = (time.perf_counter(), self.position)
+
+        if self.timer is None:
+            self.timer = self.engine.hField.hFig.canvas.new_timer(interval=max(int(1000 / self.fps), 1))
+            self.timer.add_callback(self.tick)
+        self.timer.start()
+
+    def pause(self):
+        """ Stop playing """
+
+        self.isPlaying = False
+        if self.timer is not None:
+            self.timer.stop()
+        self._set_status()
+
+    def toggle(self):
+        """ Play / pause """
+        if self.isPlaying:
+            self.pause()
+        else:
+            self.play()
+
+    def set_speed(self, speed: float):
+        """ Set speed of the playing: 1x .. 1000x """
+
+        self.speed = min(max(float(speed), 1), 1000)
+        self.playStart = (time.perf_counter(), self.position)
+        self._set_status()
+
+    def tick(self):
+        """ Show the command, that is due by the time ( the commands between the frames are skipped ) """
+
+        t, k = self.playStart
+        k += int((time.perf_counter() - t) * self.speed * self.rate)
+        self.seek(k)
+        if self.position >= self.total:
+            self.pause()
+
+    def seek(self, k: int):
+        """
+        Show the situation after k commands
+
+        :param k: - number of commands ( 0 .. total )
+        """
+
+        k = min(max(int(k), 0), self.total)
+        if k == self.position:
+            return
+
+        i = bisect.bisect_right(self.snapCommands, k) - 1
+        if not self.snapCommands[i] <= self.position <= k:
+            # from the nearest snapshot
+            self.position = self.snapCommands[i]
+            self.state = list(self.snapshots[i])
+
+        self._advance(self.state, self.position, k)
+        self.position = k
+        self._show(self.state)
+
+    def key_press(self, event):
+        """ Keys of the player ( see the class description ) """
+
+        if event.key == ' ':
+            self.toggle()
+        elif event.key == 'up':
+            self.set_speed(self.speed * 10)
+        elif event.key == 'down':
+            self.set_speed(self.speed / 10)
+        elif event.key in ('right', 'left'):
+            step = int(self.speed * self.rate) or 1
+            self.seek(self.position + (step if event.key == 'right' else -step))
+            self.playStart = (time.perf_counter(), self.position)
+        elif event.key == 'home':
+            self.seek(0)
+            self.playStart = (time.perf_counter(), self.position)
+        elif event.key == 'end':
+            self.seek(self.total)
+
+    def _index(self, snapshot_every):
+        """
+        Read the trace into the arrays of the records, find the effects of the commands
+        ( broken robot, new markers ) and save the snapshots of the state
+        """
+
+        m = self.trace.map
+        model = FieldModel.from_cells(m['size'], np.array(m['cells']), m['tMap'], m['isFrame'])
+        n, mm = model.size
+        outMarks = MarkSet()
+
+        self.ops = array('B')  # opcode | ERROR | EFFECT
+        self.sides = array('B')
+        self.counts = array('L')
+        self.starts = array('q')  # number of commands before the record
+        self.markX = array('q')  # cells of the new markers in order of setting
+        self.markY = array('q')
+        self.snapshots = []
+        self.snapCommands = []
+
+        state = list(self.initState)
+        total = 0
+        for record in self.trace:
+            if len(self.ops) % snapshot_every == 0:
+                self.snapshots.append(tuple(state))
+                self.snapCommands.append(total)
+
+            op = OPCODES[record.command]
+            code = SIDES.get(record.side, NO_SIDE)
+            x, y, side, serviceable = state[:4]
+            effect = False
+
+            if op == OP_STEP and record.error and serviceable and code < 4:
+                # the robot has driven into a partition
+                effect = model.is_bord(x, y, code)
+            elif op == OP_MARK and not record.error:
+                if x < 0 or x >= n or y < 0 or y >= mm:
+                    effect = outMarks.add(x, y)
+                elif not model.is_mark(x, y):
+                    model.set_mark(x, y)
+                    effect = True
+                if effect:
+                    self.markX.append(x)
+                    self.markY.append(y)
+
+            self.ops.append(op | record.error * ERROR | effect * EFFECT)
+            self.sides.append(code)
+            self.counts.append(record.count)
+            self.starts.append(total)
+            self._apply(state, len(self.ops) - 1, record.count)
+            total += record.count
+
+        self.total = total
+        if not self.snapshots:
+            self.snapshots.append(tuple(state))
+            self.snapCommands.append(0)
+
+    def _apply(self, state, r, count):
+        """ Change the state by the first count commands of the record r """
+
+        op = self.ops[r]
+        code = self.sides[r]
+        command = op & 7
+
+        # the run of steps is read as the step with the count,
+        # the queries and the sense ( OP_SENSE ) do not change the state
+        if command == OP_STEP and code < 4:
+            if not op & ERROR:
+                state[0] += DX[code] * count
+                state[1] += DY[code] * count
+            elif op & EFFECT:
+                state[0] += DX[code] / 4
+                state[1] += DY[code] / 4
+                state[3] = False
+        elif command == OP_ROT and not op & ERROR and code in TURN:
+            state[2] = (state[2] + TURN[code]) % 4
+        elif command == OP_MARK and op & EFFECT:
+            state[4] += 1
+
+    def _advance(self, state, k0, k1):
+        """ Change the state after k0 commands to the state after k1 commands """
+
+        r = bisect.bisect_right(self.starts, k0) - 1
+        k = k0
+        while k < k1:
+            count = min(self.starts[r] + self.counts[r], k1) - k
+            self._apply(state, r, count)
+            k += count
+            r += 1
+
+    def _show(self, state, full=False):
+        """ Show the state in the window """
+
+        engine = self.engine
+        field = engine.hField
+        body = engine.hRobot
+        x, y, side, serviceable, marks = state
+
+        px, py = body.position.tolist()
+        if px != x or py != y:
+            body.shift([x - px, y - py], 'vector')
+
+        if hasattr(body, 'side'):
+            turn = (side - int(body.side)) % 4
+            if turn:
+                body.rot(('R', 'B', 'L')[turn - 1])
+
+        if marks != self.shownMarks:
+            n, m = field.size
+            value = marks > self.shownMarks
+            isOut = False
+            for i in range(min(marks, self.shownMarks), max(marks, self.shownMarks)):
+                mx, my = self.markX[i], self.markY[i]
+                if 0 <= mx < n and 0 <= my < m:
+                    field.model.set_mark(mx, my, value)
+                else:
+                    isOut = True
+
+            if isOut:
+                engine.outMarkPos.clear()
+                for i in range(marks):
+                    mx, my = self.markX[i], self.markY[i]
+                    if not (0 <= mx < n and 0 <= my < m):
+                        engine.outMarkPos.add(mx, my)
+
+            self.shownMarks = marks
+            field.markers_restore()
+            full = True
+
+        engine.isServiceable = serviceable
+
+        if full:
+            field.renderer.draw()
+        else:
+            field.renderer.update()
+        field.renderer.flush()
+        self._set_status()
+
+    def _set_status(self):
+        """ Show the command number and the speed in the status bar of the window """
+        if self.statusBar:
+            self.statusBar.set_message('Command {} / {}, speed {:g}x{}'.format(
+                self.position, self.total, self.speed, '' if self.isPlaying else ', paused'))
@@ -0,0 +1,121 @@
+import json
+import time
+import bisect
+
+# Commands of the robot, that are measured
+COMMANDS = ('step', 'rot', 'is_bord', 'mark', 'is_mark', 'get_tmpr', 'get_side', 'sense')
+
+# Upper bounds of the histogram bins ( seconds ), the last bin is unbounded
+BINS = (1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 0.1, 0.3, 1, 3)
+
+PARTS = ('total', 'model', 'render', 'sleep')
+
+
+class CommandStats:
+    """
+    Statistics of one command: number of calls and errors,
+    total time and histogram of the latencies for each part of the command:
+        total - whole time of the command
+        render - drawing of the window ( full redraw or blitting )
+        sleep - delays of the command and of the visual effects
+        model - the rest of the time ( checks and changes of the situation on the field )
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.time = dict.fromkeys(PARTS, 0.0)
+        self.hist = {part: [0] * (len(BINS) + 1) for part in PARTS}
+
+    def add(self, total, render, sleep, error=False):
+        """ Add the measurement of one call """
+
+        self.count += 1
+        self.errors += error
+        for part, value in zip(PARTS, (total, max(total - render - sleep, 0.0), render, sleep)):
+            self.time[part] += value
+            self.hist[part][bisect.bisect_left(BINS, value)] += 1
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'time': dict(self.time),
+            'mean': {part: value / self.count if self.count else 0.0 for part, value in self.time.items()},
+            'hist': {part: list(hist) for part, hist in self.hist.items()}
+        }
+
+
+class Profiler:
+    """
+    Profiler of the robot commands
+
+    It is switched on by RobotEngine.profile_on, the commands call it only when it is switched on,
+    so the disabled profiler costs nothing but the check of the attribute
+
+    Methods:
+        command, render, sleep, stats, dump, reset
+    """
+
+    def __init__(self):
+        self.commands = {name: CommandStats() for name in COMMANDS}
+        self.renderTime = 0.0  # render time of the current command
+        self.sleepTime = 0.0  # sleep time of the current command
+        self.depth = 0  # commands call each other ( for example, step of RobotOrt calls is_bord )
+
+    def command(self, name, func, *args, **kwargs):
+        """ Call the command and measure it ( the nested commands are measured as a part of the outer one ) """
+
+        if self.depth:
+            return func(*args, **kwargs)
+
+        self.renderTime = self.sleepTime = 0.0
+        self.depth = 1
+        error = True
+        t = time.perf_counter()
+        try:
+            r = func(*args, **kwargs)
+            error = False
+            return r
+        finally:
+            total = time.perf_counter() - t
+            self.depth = 0
+            if name not in self.commands:
+                self.commands[name] = CommandStats()
+            self.commands[name].add(total, self.renderTime, self.sleepTime, error)
+
+    def render(self, func, *args):
+        """ Call the drawing function and add its time to the render time of the command """
+
+        t = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.renderTime += time.perf_counter() - t
+
+    def sleep(self, seconds):
+        """ Sleep and add the time to the sleep time of the command """
+
+        t = time.perf_counter()
+        time.sleep(seconds)
+        self.sleepTime += time.perf_counter() - t
+
+    def stats(self):
+        """
+        :return: dict {command: {count, errors, time, mean, hist}}, where time, mean and hist
+                 are dicts {total, model, render, sleep} ( seconds and numbers of calls in the bins )
+        """
+        return {name: stats.to_dict() for name, stats in self.commands.items()}
+
+    def to_json(self):
+        """ Statistics and histogram bins as JSON string """
+        return json.dumps({'bins': list(BINS), 'commands': self.stats()}, indent=2)
+
+    def dump(self, filepath):
+        """ Save statistics to the JSON file """
+        with open(filepath, 'w') as f:
+            f.write(self.to_json())
+
+    def reset(self):
+        """ Clear statistics """
+        self.commands = {name: CommandStats() for name in COMMANDS}
@@ -0,0 +1,204 @@
+import time
+
+
+class Renderer:
+    """
+    Renderer - draws the field in the graphic window
+
+    The static part of the field ( grid, partitions, frame, markers ) is drawn
+    by the full redraw of the figure, after that the image is cached as a background.
+    The animated artists ( robot body and legs ) are not drawn by the full redraw,
+    they are drawn over the cached background by blitting, so the robot commands
+    do not redraw the whole field
+
+    The cached background is refreshed only by the full redraw ( editing of the field,
+    moving of the visible window ), the new static artists ( for example, a new marker )
+    are drawn into the cached background by draw_static without the full redraw
+
+    Rendering policy: the requested frames can be coalesced - the frame is rendered
+    only for every K-th request and / or not more often than N frames per second.
+    The skipped frame remains pending and is rendered by flush ( by the timer of
+    the graphic window, by the next allowed request or explicitly )
+
+    The rendering can be paused ( the batch of the robot commands, the batches of several
+    robots on one field ), all requested frames remain pending and the last one is rendered by resume
+
+    Methods:
+        add_artist, remove_artist, clear, draw, draw_static, update, flush, set_policy, hold, pause, resume
+    """
+
+    def __init__(self, fig, axes):
+        """
+        :param fig: - matplotlib figure
+        :param axes: - matplotlib axes
+        """
+
+        self.hFig = fig
+        self.hAxes = axes
+        self.artists = []  # animated artists
+        self.overlay = None  # function, returns artists to be drawn over the animated ones
+        self.camera = None  # function, moves the visible part of the field, returns True if it was moved
+        self.background = None
+
+        self.every = 1  # render every K-th requested frame
+        self.fps = None  # max number of frames per second ( None - unlimited )
+        self.count = 0  # number of requested frames
+        self.lastTime = 0  # time of the last rendered frame
+        self.isPending = False  # there is a requested frame that was not rendered
+        self.isFull = False  # the pending frame needs the full redraw
+        self.paused = 0  # number of the nested pauses, the frames are not rendered till resume
+        self.timer = None
+        self.profiler = None  # Profiler of the robot commands, measures render and sleep time
+
+        self.cid = self.hFig.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def add_artist(self, artist):
+        """ Add animated artist """
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def remove_artist(self, artist):
+        """ Remove animated artist """
+        if artist in self.artists:
+            self.artists.remove(artist)
+
+    def clear(self):
+        """ Forget all animated artists ( after the axes have been cleared ) """
+        self.artists = []
+        self.background = None
+
+    def set_policy(self, every: int = 1, fps: float = None):
+        """
+        Set rendering policy
+
+        :param every: - render every K-th requested frame
+        :param fps: - render not more often than fps frames per second ( None - unlimited )
+        """
+
+        self.flush()
+
+        self.every = max(int(every), 1)
+        self.fps = fps if fps else None
+        self.count = 0
+
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None
+
+        if self.is_coalesced():
+            # the pending frame is rendered, when the window has processed its events
+            interval = 1000 / self.fps if self.fps else 100
+            self.timer = self.hFig.canvas.new_timer(interval=max(int(interval), 1))
+            self.timer.add_callback(self.flush)
+            self.timer.start()
+
+    def is_coalesced(self):
+        """ True - if frames can be skipped """
+        return self.every > 1 or self.fps is not None
+
+    def on_draw(self, event=None):
+        """ Cache the background after the full redraw and draw animated artists over it """
+
+        if self.hFig.canvas.supports_blit:
+            self.background = self.hFig.canvas.copy_from_bbox(self.hFig.bbox)
+        self._draw_artists()
+
+        # the figure is up to date
+        self.isPending = False
+        self.isFull = False
+
+    def draw(self):
+        """ Request the full redraw of the figure ( the static part of the field is changed ) """
+        self.isFull = True
+        self._request()
+
+    def draw_static(self, *artists):
+        """
+        Draw the artists of the static part of the field into the cached background
+        ( the artists must not overlap other static artists, that are drawn over them )
+        """
+
+        if self.background is None or self.isFull or self.paused:
+            self.draw()
+            return
+
+        canvas = self.hFig.canvas
+        canvas.restore_region(self.background)
+        for artist in artists:
+            self.hAxes.draw_artist(artist)
+        self.background = canvas.copy_from_bbox(self.hFig.bbox)
+        self.update()
+
+    def update(self):
+        """ Request to redraw only the animated artists over the cached background """
+        self._request()
+
+    def flush(self):
+        """ Render the pending frame """
+
+        if not self.isPending or self.paused:
+            return
+
+        if self.profiler is not None:
+            self.profiler.render(self._flush)
+        else:
+            self._flush()
+
+    def pause(self):
+        """ Stop rendering of the frames, they remain pending ( the pauses can be nested ) """
+        self.paused += 1
+
+    def resume(self):
+        """ Render the pending frame and continue rendering after the last pause """
+        self.paused = max(self.paused - 1, 0)
+        self.flush()
+
+    def hold(self, seconds):
+        """ Show the rendered frame during the given time ( the delay of the visual effect ) """
+
+        if self.profiler is not None:
+            self.profiler.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _flush(self):
+        """ Render the pending frame: full redraw or blitting """
+
+        self.lastTime = time.perf_counter()
+
+        if self.camera and self.camera():
+            self.isFull = True
+
+        canvas = self.hFig.canvas
+        if self.isFull or self.background is None:
+            canvas.draw()
+            return
+
+        canvas.restore_region(self.background)
+        self._draw_artists()
+        canvas.blit(self.hFig.bbox)
+        canvas.flush_events()
+        self.isPending = False
+
+    def _request(self):
+        """ Request a frame, it is rendered or is left pending according to the policy """
+
+        self.isPending = True
+        self.count += 1
+
+        if self.every > 1 and self.count % self.every:
+            return
+        if self.fps is not None and time.perf_counter() - self.lastTime < 1 / self.fps:
+            return
+
+        self.flush()
+
+    def _draw_artists(self):
+        """ Draw animated artists and overlay """
+
+        for artist in self.artists:
+            self.hAxes.draw_artist(artist)
+
+        if self.overlay:
+            for artist in self.overlay():
+                self.hAxes.draw_artist(artist)
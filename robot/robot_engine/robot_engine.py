@@ -1,17 +1,45 @@
 import os
 import time
+import functools
+import contextlib
+from collections import namedtuple
 import numpy as np
-import matplotlib
-import matplotlib.pyplot as plt
-from .body import BodyUndirected
-from .body import BodyOriented
-from .marker import Marker
-from .helpers import decode_side
-from .star_control import is_star_to_end, add_star_to_end
+from .helpers import decode_side, encode_side
 from ..exceptions import *
-from .field import Field
+from .headless import HeadlessField
+from .model import MarkSet, MARK, BORD_N, BORD_O, BORD_S, BORD_W
+from .profiler import Profiler
+from .trace import TraceWriter
 
-matplotlib.rcParams['toolbar'] = 'toolmanager'
+# Displacement vectors of the sides: North, East, South, West
+VECTORS = ([0, 1], [1, 0], [0, -1], [-1, 0])
+SIDE_CODES = {'n': 0, 'o': 1, 's': 2, 'w': 3}
+
+# Result of the sense command: partitions on the North, East, South, West sides,
+# marker and temperature of the cell
+Surroundings = namedtuple('Surroundings', 'n o s w mark tmpr')
+
+# The same for the oriented robots: partitions in front of the robot, to the right, behind and to the left
+SurroundingsRel = namedtuple('SurroundingsRel', 'forward right back left mark tmpr')
+
+
+def render_on_error(command):
+    """
+    The pending frame is rendered before the error of the command is raised,
+    the command is measured and recorded, if the profiler and the trace are switched on
+    """
+
+    @functools.wraps(command)
+    def wrapper(self, *args, **kwargs):
+        try:
+            if self.profiler is None and self.tracer is None:
+                return command(self, *args, **kwargs)
+            return self._instrumented(command, *args, **kwargs)
+        except Exception:
+            self.render()
+            raise
+
+    return wrapper
 
 
 class RobotEngine:
@@ -57,8 +85,9 @@ class RobotEngine:
     ( the absence of a marker in the cell means or an empty value
     the corresponding array element or value of an already DELETED Robot class object.Marker )
 
-    outMarkPos [] | double matrix, in the rows containing the position of the robot corresponding to cells with markers,
-    to be installed outside of the visible part of the field (Aktualno unless the property outside == 'nomark')
+    outMarkPos - set of the positions of the robot corresponding to cells with markers ( object of class MarkSet ),
+    to be installed outside of the visible part of the field (Aktualno unless the property outside == 'nomark'),
+    outMarkPos.to_array() - the same positions as the matrix N x 2
     outside = 'none';
     print
     outside
@@ -95,7 +124,7 @@ class RobotEngine:
 
     """
 
-    def __init__(self, mapfile=None, robot_type=None, delay: int = None, **params):
+    def __init__(self, mapfile=None, robot_type=None, delay: int = None, headless: bool = False, **params):
         """
         Robot class constructor
         Creates (or creates, if in the dialogue there is a failure) box with a robot
@@ -108,6 +137,13 @@ class RobotEngine:
         GIVEN:
             - mapfile - [] | the name of the file ( mat-file, although the extension name is
             to be another ) in which the previously stored certain situation on the field
+            - headless - True | False - the field is created without graphic window,
+            dialogs, visual effects and delays ( only the situation arrays are kept )
+            - view - [ columns, rows ] - max size of the visible window of the field,
+            the window follows the robot ( 100 x 100 by default )
+            - field - robot ( or object of class RobotEngine ), the new robot is put on its field:
+            the robots share the partitions, the markers and the window ( see Field.robot_add ),
+            position = [ x, y ], side = 0 | 1 | 2 | 3 - free cell and direction of the new robot
 
         RESULT:
             - possible (map file = [] ) user dialog
@@ -126,44 +162,71 @@ class RobotEngine:
 
         self.delay = self.delay_def
 
-        self.isEffectOn = True
+        self.headless = headless
+        self.isEffectOn = not headless
+        self.hProfiler = Profiler()
+        self.profiler = None  # hProfiler, when profiling is on
+        self.tracer = None  # TraceWriter, when the commands are recorded
+        self.batchDepth = 0  # number of the nested batches of the commands ( see batch )
+        self.batchState = None  # delay and effects of the robot, that are restored after the batch
 
         self.isServiceable = True
         self.diameter = 40
         self.robotType = robot_type
-        self.outMarkPos = np.empty((0, 2), int)
+        self.outMarkPos = MarkSet()
         self.outside = 'none'
         self.hRobot = None
+        self.number = 1  # number of the robot on the field
         self.fPath = ''
         self.fName = ''
 
-        if robot_type == 'Robot':
-            body = BodyUndirected
-        elif robot_type in ['RobotOrt', 'RobotRot']:
-            body = BodyOriented
-        else:
+        if robot_type not in ['Robot', 'RobotOrt', 'RobotRot']:
             raise RobotTypeValueError
 
-        self.fhBody = body
-
-        self.hField = Field(self, body=body, size=params.get('size', None))
+        owner = params.get('field')
+        if owner is not None:
+            # one more robot on the field of another robot
+            owner = getattr(owner, 'hRobotEngine', owner)
+            self.headless = owner.headless
+            self.isEffectOn = owner.isEffectOn
+            self.outMarkPos = owner.outMarkPos
+            self.fPath = owner.fPath
+            self.fName = owner.fName
+            self.is_init_save = owner.is_init_save
+            self.hField = owner.hField
+            self.hField.robot_add(self, params.get('position', (0, 0)), params.get('side', 0))
+            self.number = len(self.hField.robots)
+            self.hRobot.delay = self.delay_def
+            return
+
+        if headless:
+            self.hField = HeadlessField(self, size=params.get('size', None), frame=params.get('frame', True))
+        else:
+            # matplotlib and the graphic window are imported only for the graphic field
+            from .field import Field
+            self.hField = Field(self, body=self.fhBody, size=params.get('size', None), view=params.get('view', None))
         self.hRobot.delay = self.delay_def
         self.is_init_save = True
 
         if not mapfile:
             self.fName = 'untitled.map'
-            if not self.hField.load(is_delay):  # User press "Cancel"
+            if headless:
+                self.is_init_save = False
+            elif not self.hField.load(is_delay):  # User press "Cancel"
                 if not self.hField.save():  # User press "Cancel"
-                    add_star_to_end(self.hField.hFig)
+                    self.hField.set_modified()
                     self.is_init_save = False
         else:
             self.fPath = os.path.dirname(mapfile)
             self.fName = os.path.basename(mapfile)
             self.hField.restore(is_delay, **params)
-            self.hField.hFig.canvas.set_window_title(self.robotType + ' - ' + mapfile)
+            if not headless:
+                self.hField.set_title(self.robotType + ' - ' + mapfile)
 
-        plt.show(block=False)
+        if not headless:
+            self.hField.show()
 
+    @render_on_error
     def step(self, side=None):
         """
         Move the robot to the next cell in the given direction
@@ -183,30 +246,31 @@ class RobotEngine:
         self._pause()
 
         if side and isinstance(side, str):
-            side = side.lower()
+            code = SIDE_CODES.get(side.lower())
         else:
             raise SideValueError
 
-        if side == 'n':
-            vect = [0, 1]  # при коррекции индексов, этот вектор нужно переворачивать
-        elif side == 's':
-            vect = [0, -1]
-
-        elif side == 'o':
-            vect = [1, 0]
-
-        elif side == 'w':
-            vect = [-1, 0]
-        else:
+        if code is None:
             raise SideValueError
 
-        if not self.is_bord_without_effects(side):
-            self.hRobot.shift(vect, 'vector')
+        vect = VECTORS[code]
+        x, y = self.hRobot.xy
+
+        if not self.hField.model.is_bord(x, y, code):
+            if len(self.hField.robots) > 1:
+                x, y = self.cell()
+                if self.hField.occupancy.get(x + vect[0], y + vect[1]) not in (0, self.number):
+                    raise CollisionError
+                self.hRobot.shift(vect, 'vector')
+                self.hField.occupancy.move(self.number, *self.cell())
+            else:
+                self.hRobot.shift(vect, 'vector')
         else:
-            self.hRobot.shift(np.array(vect) / 4, 'vector')
+            self.hRobot.shift([vect[0] / 4, vect[1] / 4], 'vector')
             self.isServiceable = False
             raise BrokenError
 
+    @render_on_error
     def rot(self, side=None):
         """
         Rotates the robot in the specified direction with a delay
@@ -229,6 +293,7 @@ class RobotEngine:
         self._pause()
         self.hRobot.rot(side)
 
+    @render_on_error
     def is_bord(self, side=None):
         """
         Command to check partitions in a given direction
@@ -244,19 +309,17 @@ class RobotEngine:
 
         self.state_check()
 
-        if not str.lower(side) in ['n', 's', 'o', 'w']:
+        code = SIDE_CODES.get(str.lower(side))
+        if code is None:
             raise SideValueError
 
         if self.isEffectOn:
-            if isinstance(self.hRobot, BodyOriented):
-                self.hRobot.is_bord()
-            elif isinstance(self.hRobot, BodyUndirected):
-                self.hRobot.is_bord(side)
-            else:
-                raise RobotTypeError
+            self.hRobot.is_bord(side)
 
-        return self.is_bord_without_effects(side)
+        x, y = self.hRobot.xy
+        return self.hField.model.is_bord(x, y, code)
 
+    @render_on_error
     def mark(self):
         """
         Command to put a marker in a cell with a robot
@@ -275,22 +338,20 @@ class RobotEngine:
 
         self.state_check()
 
-        pos = self.hRobot.position
+        x, y = self.hRobot.xy
 
         if self.is_out():
             # robot is outside the visible part of the field
-            if not any(np.equal(self.outMarkPos, pos).all(1)):
-                self.outMarkPos = np.append(self.outMarkPos, [pos], axis=0)
+            self.outMarkPos.add(x, y)
         else:
             # robot is in the visible part of the field
-            if not self.hField.hMark[pos[0]][pos[1]]:
-                self.hField.hMark[pos[0]][pos[1]] = Marker(pos[0], pos[1], self.hField.hAxes)
+            if not self.hField.model.is_mark(x, y):
+                self.hField.marker_create(x, y)
 
             if self.isEffectOn:
                 self.hRobot.mark()
 
-            self.hField.hFig.canvas.draw()
-
+    @render_on_error
     def is_mark(self):
         """
         Verify the presence of the marker field of the cell
@@ -307,16 +368,17 @@ class RobotEngine:
 
         self.state_check()
 
-        pos = self.hRobot.position
+        x, y = self.hRobot.xy
         if self.is_out():  # robot is outside the visible part of the field
-            return any(np.equal(self.outMarkPos, pos).all(1))
+            return self.outMarkPos.is_mark(x, y)
         else:  # robot is in the visible part of the field
 
             if self.isEffectOn:
                 self.hRobot.is_mark()
 
-            return True if self.hField.hMark[pos[0]][pos[1]] else False
+            return self.hField.model.is_mark(x, y)
 
+    @render_on_error
     def get_tmpr(self):
         """
         Command to measure and report the "temperature" of the current cell
@@ -338,19 +400,20 @@ class RobotEngine:
 
         self.state_check()
 
-        position = self.hRobot.position
+        x, y = self.hRobot.xy
+        n, m = self.hField.size
 
-        for i in range(len(position)):
-            if position[i] < 0:
-                position[i] = 0
-            elif position[i] >= self.hField.size[i]:
-                position[i] = self.hField.size[i] - 1
+        if not (0 <= x < n and 0 <= y < m):
+            # the robot outside of the field is moved to the nearest cell of the field
+            x, y = min(max(x, 0), n - 1), min(max(y, 0), m - 1)
+            self.hRobot.position = np.array([x, y])
 
         if self.isEffectOn:
             self.hRobot.meas()
 
-        return self.hField.tMap[position[0], position[1]]
+        return int(self.hField.tMap[x, y])
 
+    @render_on_error
     def get_side(self):
         """
         Command to communicate the current direction of the robot
@@ -370,6 +433,153 @@ class RobotEngine:
 
         return decode_side(self.hRobot.side)
 
+    @render_on_error
+    def sense(self):
+        """
+        Command to check all partitions around the cell, the marker and the temperature at once
+        ( one visual effect and one delay instead of the is_bord, is_mark, get_tmpr commands )
+
+        SYNTAX:
+            res = r.sense()
+
+        GIVEN:
+            - r = reference to the Robot class object:
+                        a robot in a cage
+
+        RESULT:
+            - res = Surroundings( n, o, s, w, mark, tmpr ) - partitions on the sides,
+              marker and "temperature" of the robot cell
+        """
+
+        self.state_check()
+
+        x, y = self.hRobot.xy
+        model = self.hField.model
+        n, m = self.hField.size
+
+        if self.isEffectOn:
+            self.hRobot.sense()
+
+        if 0 <= x < n and 0 <= y < m:
+            # the partitions and the marker are the bits of one cell mask
+            c = model.cells.item(x, y)
+            return Surroundings(bool(c & BORD_N), bool(c & BORD_O), bool(c & BORD_S), bool(c & BORD_W),
+                                bool(c & MARK), int(self.hField.tMap[x, y]))
+
+        return Surroundings(model.is_bord(x, y, 0), model.is_bord(x, y, 1),
+                            model.is_bord(x, y, 2), model.is_bord(x, y, 3),
+                            self.outMarkPos.is_mark(x, y),
+                            int(self.hField.tMap[min(max(x, 0), n - 1), min(max(y, 0), m - 1)]))
+
+    @render_on_error
+    def walk_until_border(self, side=None):
+        """
+        Move the robot in the given direction until the partition ( the same as
+        while not r.is_bord( side ): r.step( side ), but by one smooth shift with one delay )
+
+        SYNTAX:
+            k = r.walk_until_border( side )
+
+        GIVEN:
+            - side = 'n' | 's' | ' o ' | ' w ' - given direction
+
+        RESULT:
+            - k = number of the passed cells
+        """
+
+        self.state_check()
+        code = self._side_code(side)
+
+        k, stop = self._collide(code, *self._scan(code))
+        if stop is None:
+            raise EndlessWalkError
+
+        if self.tracer is not None:
+            for _ in range(k):
+                self.tracer.record('is_bord', side, False)
+                self.tracer.record('step', side, None)
+            if stop == 'robot':
+                self.tracer.record('is_bord', side, False)
+                self.tracer.record('step', side, None, True)
+            else:
+                self.tracer.record('is_bord', side, True)
+
+        # the partition ahead only stops the robot
+        self._walk(code, k, stop if stop == 'robot' else None)
+        return k
+
+    @render_on_error
+    def walk(self, side=None, n: int = 1):
+        """
+        Move the robot on n cells in the given direction ( the same as
+        for _ in range( n ): r.step( side ), but by one smooth shift with one delay )
+
+        SYNTAX:
+            k = r.walk( side, n )
+
+        GIVEN:
+            - side = 'n' | 's' | ' o ' | ' w ' - given direction
+            - n = number of the steps
+
+        RESULT:
+            - k = n - number of the passed cells, the robot breaks, if there is
+              a partition on the way ( BrokenError )
+        """
+
+        self.state_check()
+        code = self._side_code(side)
+
+        if not isinstance(n, int) or isinstance(n, bool) or n < 0:
+            raise StepsValueError
+
+        k, stop = self._collide(code, *self._scan(code, limit=n))
+
+        if self.tracer is not None:
+            for _ in range(k):
+                self.tracer.record('step', side, None)
+            if stop in ('bord', 'robot'):
+                self.tracer.record('step', side, None, True)
+
+        self._walk(code, k, stop)
+        return k
+
+    @render_on_error
+    def walk_until_mark(self, side=None):
+        """
+        Move the robot in the given direction until the cell with the marker ( the same as
+        while not r.is_mark(): r.step( side ), but by one smooth shift with one delay )
+
+        SYNTAX:
+            k = r.walk_until_mark( side )
+
+        GIVEN:
+            - side = 'n' | 's' | ' o ' | ' w ' - given direction
+
+        RESULT:
+            - k = number of the passed cells, the robot breaks, if there is
+              a partition on the way ( BrokenError )
+        """
+
+        self.state_check()
+        code = self._side_code(side)
+
+        k, stop = self._collide(code, *self._scan(code, to_mark=True))
+        if stop is None:
+            raise EndlessWalkError
+
+        if self.tracer is not None:
+            for _ in range(k):
+                self.tracer.record('is_mark', None, False)
+                self.tracer.record('step', side, None)
+            if stop in ('bord', 'robot'):
+                self.tracer.record('is_mark', None, False)
+                self.tracer.record('step', side, None, True)
+            else:
+                self.tracer.record('is_mark', None, True)
+
+        self._walk(code, k, stop)
+        return k
+
     def get_side_(self):
         """
         Returns the current direction of the robot without visualizations
@@ -392,8 +602,8 @@ class RobotEngine:
         Check robot is out of the field
         :return: True - if robot is out
         """
-        pos = self.hRobot.position
-        return pos[0] < 0 or pos[0] >= self.hField.size[0] or pos[1] < 0 or pos[1] >= self.hField.size[1]
+        x, y = self.hRobot.xy
+        return x < 0 or x >= self.hField.size[0] or y < 0 or y >= self.hField.size[1]
 
     def is_bord_without_effects(self, side=None):
         """
@@ -403,67 +613,134 @@ class RobotEngine:
         :param side = ' n '(North) | ' o '(East) | ' s '(South) | ' w ' (West)
         """
 
-        x, y = self.hRobot.position  # x - row index, y - col index
-
-        side = side.upper()
-        if side == 'N':
-            # robot is out of the field
-            if x < 0 or x >= self.hField.size[0]:
-                return False
-
-            if y < -1 or y > self.hField.size[1] - 1:
-                return False
-            elif y == -1 or y == self.hField.size[1] - 1:  # y = -1 - robot outside near frame
-                return True if self.hField.hFrame else False  # Frame is a border
+        x, y = self.hRobot.xy  # x - row index, y - col index
 
-            return True if self.hField.hHorBord[x][y + 1] else False
+        return self.hField.model.is_bord(x, y, encode_side(side))
 
-        elif side == 'S':
-            # robot is out of the field
-            if x < 0 or x >= self.hField.size[0]:
-                return False
-
-            if y < 0 or y > self.hField.size[1]:
-                return False
-            elif y == 0 or y == self.hField.size[1]:
-                return True if self.hField.hFrame else False
+    @staticmethod
+    def _side_code(side):
+        """ Index of the side 'n' | 'o' | 's' | 'w', raise errors """
+        if not isinstance(side, str) or side.lower() not in ('n', 'o', 's', 'w'):
+            raise SideValueError
+        return encode_side(side)
 
-            return True if self.hField.hHorBord[x][y] else False
+    def _scan(self, code, limit: int = None, to_mark: bool = False):
+        """
+        Check the cells from the robot to the side code ( without effects )
 
-        elif side == 'O':
-            # robot is out of the field
-            if y < 0 or y >= self.hField.size[1]:
-                return False
+        :param limit: - max number of the steps
+        :param to_mark: - the walk is stopped by the cell with the marker
+        :return: k, stop - number of the free steps and the reason of the stop:
+                 'limit' | 'bord' ( partition ) | 'mark' ( marker ) | None ( the walk would be endless )
+        """
 
-            if x < -1 or x > self.hField.size[0] - 1:
-                return False
-            elif x == -1 or x == self.hField.size[0] - 1:
-                return True if self.hField.hFrame else False  # Frame is a border
+        model = self.hField.model
+        n, m = self.hField.size
+        dx, dy = VECTORS[code]
+        x, y = self.hRobot.xy
+
+        k = 0
+        while limit is None or k < limit:
+            if 0 <= x < n and 0 <= y < m:
+                # the cells of the field are checked in one pass
+                i, mask = model.run(x, y, code, to_mark, None if limit is None else limit - k)
+                k += i
+                if mask:
+                    return k, 'mark' if to_mark and mask & MARK else 'bord'
+                x += dx * i
+                y += dy * i
+                continue
+
+            if to_mark and self.outMarkPos.is_mark(x, y):
+                return k, 'mark'
+            if model.is_bord(x, y, code):
+                return k, 'bord'
+
+            if dy == 0:
+                away = not 0 <= y < m or (x >= n if dx > 0 else x < 0)
+            else:
+                away = not 0 <= x < n or (y >= m if dy > 0 else y < 0)
+
+            if away:
+                # there are no cells of the field ahead, only the markers outside of the field
+                if limit is not None:
+                    return limit, 'limit'
+                if to_mark:
+                    ahead = [(cx - x) * dx + (cy - y) * dy for cx, cy in self.outMarkPos
+                             if (cx - x) * dy == (cy - y) * dx and (cx - x) * dx + (cy - y) * dy > 0]
+                    if ahead:
+                        return k + min(ahead), 'mark'
+                return k, None
+
+            x += dx
+            y += dy
+            k += 1
+
+        return limit, 'limit'
+
+    def _collide(self, code, k, stop):
+        """ The walk of k cells to the side code is stopped before the nearest robot on the way ( see _scan ) """
+
+        if len(self.hField.robots) == 1:
+            return k, stop
+
+        dx, dy = VECTORS[code]
+        x, y = self.cell()
+        ahead = []
+        for robot in self.hField.robots:
+            cx, cy = robot.cell()
+            if robot is not self and (cx - x) * dy == (cy - y) * dx and (cx - x) * dx + (cy - y) * dy > 0:
+                ahead.append((cx - x) * dx + (cy - y) * dy)
+
+        if ahead and (stop is None or min(ahead) <= k):
+            return min(ahead) - 1, 'robot'
+        return k, stop
+
+    def _walk(self, code, k, stop=None):
+        """
+        Move the robot on k cells to the side code by one smooth shift,
+        break it, if it is stopped by the partition ( stop = 'bord' ), raise errors
+        """
 
-            return True if self.hField.hVerBord[x + 1][y] else False
+        vect = VECTORS[code]
+        if k:
+            self.hRobot.tween([vect[0] * k, vect[1] * k])
+            if len(self.hField.robots) > 1:
+                self.hField.occupancy.move(self.number, *self.cell())
+        elif stop in ('bord', 'robot'):
+            self._pause()
 
-        elif side == 'W':
-            # robot is out of the field
-            if y < 0 or y >= self.hField.size[1]:
-                return False
+        if stop == 'bord':
+            self.hRobot.shift([vect[0] / 4, vect[1] / 4], 'vector')
+            self.isServiceable = False
+            raise BrokenError
+        if stop == 'robot':
+            raise CollisionError
 
-            if x < 0 or x > self.hField.size[0]:
-                return False
-            elif x == 0 or x == self.hField.size[0]:
-                return True if self.hField.hFrame else False
+    @property
+    def fhBody(self):
+        """ Constructor of the graphical body of the robot ( matplotlib is imported only for the graphic field ) """
+        from .body import BodyUndirected, BodyOriented
+        return BodyUndirected if self.robotType == 'Robot' else BodyOriented
 
-            return True if self.hField.hVerBord[x][y] else False
+    def cell(self):
+        """ Cell of the robot ( the broken robot remains in its cell ) """
+        x, y = self.hRobot.xy
+        return int(round(x)), int(round(y))
 
     def _pause(self):
         """ Add delay"""
         if self.hRobot.delay != 0:
-            time.sleep(self.hRobot.delay)
+            if self.profiler is None:
+                time.sleep(self.hRobot.delay)
+            else:
+                self.profiler.sleep(self.hRobot.delay)
 
     def state_check(self):
         """
         Checks robot and field state, raise errors
         """
-        if is_star_to_end(self.hField.hFig):
+        if not self.headless and not self.batchDepth and self.hField.isModified:
             raise NotSaveError
 
         if not self.isServiceable:
@@ -486,3 +763,131 @@ class RobotEngine:
     def effects_on(self):
         """ Enable visual effects """
         self.isEffectOn = True
+
+    def set_render_policy(self, every: int = 1, fps: float = None):
+        """
+        Set rendering policy: the model is updated by every command,
+        but the window is redrawn only for every K-th frame and / or
+        not more often than fps frames per second
+
+        SYNTAX:
+            r.set_render_policy( every=100 )
+            r.set_render_policy( fps=25 )
+            r.set_render_policy() - render every frame ( by default )
+
+        The skipped frame is rendered by the timer of the window, before the error
+        of a command is raised and by the render method
+        """
+        if not self.headless:
+            self.hField.renderer.set_policy(every, fps)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Batch of the commands: the commands are executed without delays, visual effects
+        and checks of the window, the window is rendered once after the batch
+
+        SYNTAX:
+            with r.batch():
+                r.step( 'n' )
+                ...
+
+        The window can not be edited during the batch, so it is checked only before the batch
+        """
+
+        self.batchDepth += 1
+        if self.batchDepth == 1:
+            self.batchState = (self.hRobot.delay, self.isEffectOn)
+            self.hRobot.delay = 0
+            self.isEffectOn = False
+            if not self.headless:
+                self.hField.renderer.pause()
+        try:
+            yield self
+        finally:
+            self.batchDepth -= 1
+            if not self.batchDepth:
+                self.hRobot.delay, self.isEffectOn = self.batchState
+                if not self.headless:
+                    self.hField.renderer.resume()
+
+    def render(self):
+        """ Render the pending frame, the window shows the current situation """
+        if not self.headless:
+            self.hField.renderer.flush()
+
+    def _instrumented(self, command, *args, **kwargs):
+        """ Call the command with the profiler and / or record it into the trace """
+
+        if self.tracer is None:
+            return self.profiler.command(command.__name__, command, self, *args, **kwargs)
+
+        side = args[0] if args else kwargs.get('side')
+        try:
+            if self.profiler is None:
+                r = command(self, *args, **kwargs)
+            else:
+                r = self.profiler.command(command.__name__, command, self, *args, **kwargs)
+        except Exception:
+            if self.tracer is not None:
+                self.tracer.record(command.__name__, side, None, True)
+            raise
+
+        if self.tracer is not None:
+            self.tracer.record(command.__name__, side, r)
+        return r
+
+    def trace_on(self, filepath):
+        """
+        Record the commands into the trace file ( see trace.TraceWriter ), the initial situation
+        on the field is saved in the trace. The edits of the field by the mouse are not recorded
+
+        SYNTAX:
+            r.trace_on( 'run.trace' )
+        """
+
+        self.trace_off()
+        self.tracer = TraceWriter(filepath, self.hField.model, self.robotType, self.hRobot.position,
+                                  getattr(self.hRobot, 'side', 0), self.isServiceable, self.delay_def)
+
+    def trace_off(self):
+        """ Stop recording of the commands, the trace file is closed """
+        if self.tracer is not None:
+            self.tracer.close()
+            self.tracer = None
+
+    def profile_on(self, reset: bool = False):
+        """
+        Switch on the profiler of the commands: numbers of calls and histograms
+        of the latencies split into model, render and sleep time
+
+        SYNTAX:
+            r.profile_on()
+            r.profile_on( reset=True ) - clear the collected statistics
+
+        :return: Profiler object
+        """
+        self.profiler = self.hProfiler
+        if reset:
+            self.profiler.reset()
+        if not self.headless:
+            self.hField.renderer.profiler = self.profiler
+        return self.profiler
+
+    def profile_off(self):
+        """ Switch off the profiler, the collected statistics are kept """
+        self.profiler = None
+        if not self.headless:
+            self.hField.renderer.profiler = None
+
+    def profile_stats(self):
+        """
+        Statistics of the commands ( see Profiler.stats )
+
+        :return: dict {command: {count, errors, time, mean, hist}}
+        """
+        return self.hProfiler.stats()
+
+    def profile_dump(self, filepath):
+        """ Save statistics of the commands to the JSON file """
+        self.hProfiler.dump(filepath)
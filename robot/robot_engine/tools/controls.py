@@ -1,7 +1,6 @@
 import os
 from matplotlib.backend_tools import ToolBase, ToolToggleBase
 from matplotlib.backend_managers import ToolEvent
-from ...robot import *
 
 ICON_DIR = os.path.dirname(os.path.abspath(__file__))  # Current dir
 
@@ -9,13 +8,15 @@ ICON_DIR = os.path.dirname(os.path.abspath(__file__))  # Current dir
 class RobotTool(object):
     @property
     def r(self):
-        gca = plt.gca()
-        return gca.robotdata['r']
+        return self._robotdata()['r']
 
     @property
     def f(self):
-        gca = plt.gca()
-        return gca.robotdata['f']
+        return self._robotdata()['f']
+
+    def _robotdata(self):
+        """ Robot and field of the window of the tool """
+        return self.toolmanager.figure.axes[0].robotdata
 
 
 class ToolBaseCustom(ToolBase, RobotTool):
@@ -0,0 +1,317 @@
+"""
+Trace of the robot commands
+
+The trace file is append-only:
+    magic b'RTRC', version ( uint8 )
+    meta - uint32 length + json: robot_type, side, isServiceable, delay, time
+    map - uint32 length + the initial situation on the field ( map file of the version 2, see mapfile )
+    records ...
+
+Record - one byte: opcode | side << 3 | result << 6 | error << 7
+    opcode: 0 - step, 1 - rot, 2 - is_bord, 3 - mark, 4 - is_mark, 5 - get_tmpr, 6 - get_side,
+            7 - run of the successful steps to the same side, sense ( side 7 )
+    side: 0..3 - 'n', 'o', 's', 'w' ( for get_side - the result ), 4..6 - 'L', 'R', 'B' ( rot ),
+          7 - no side or wrong side
+    result: result of is_bord and is_mark
+    error: the command raised an error
+The temperature of get_tmpr ( zigzag varint ) follows the record without error,
+the number of steps ( varint ) follows the run of steps,
+the sense without error is followed by the byte n | o << 1 | s << 2 | w << 3 | mark << 4
+and the temperature ( zigzag varint )
+"""
+
+import io
+import json
+import time
+import atexit
+import struct
+from collections import namedtuple
+from .mapfile import save_map, load_map
+from ..exceptions import TraceFormatError
+
+MAGIC = b'RTRC'
+VERSION = 2
+VERSIONS = (1, 2)  # versions, that are read ( 1 - without sense )
+
+COMMANDS = ('step', 'rot', 'is_bord', 'mark', 'is_mark', 'get_tmpr', 'get_side', 'sense')
+OPCODES = {name: i for i, name in enumerate(COMMANDS)}
+OP_STEP, OP_ROT, OP_IS_BORD, OP_MARK, OP_IS_MARK, OP_GET_TMPR, OP_GET_SIDE, OP_RUN = range(8)
+OP_SENSE = OP_RUN  # the run has always a side, so the sense is the run without side
+
+SIDE_NAMES = ('n', 'o', 's', 'w', 'L', 'R', 'B', None)
+NO_SIDE = 7
+
+
+def _side_codes():
+    """ Codes of all spellings of the sides, that are accepted by the commands """
+    codes = {}
+    for code, names in enumerate((('n',), ('o',), ('s',), ('w',), ('l', 'left'), ('r', 'right'), ('b', 'back'))):
+        for name in names:
+            for spelling in (name, name.upper(), name.capitalize()):
+                codes[spelling] = code
+    return codes
+
+
+SIDES = _side_codes()
+
+TraceRecord = namedtuple('TraceRecord', 'command side result error count')
+
+
+class TraceWriter:
+    """
+    Writer of the trace of the robot commands
+
+    The records are put into the preallocated buffer, that is written to the file when it is full,
+    so the commands do not create objects. The steps to the same side are written as one run
+
+    Methods:
+        record, flush, close
+    """
+
+    def __init__(self, filepath, model, robot_type, position, side=0, is_serviceable=True, delay=0,
+                 buffer_size=65536):
+        """
+        :param filepath: - path to the trace file
+        :param model: - object of class FieldModel, the initial situation on the field
+        :param robot_type: - 'Robot' | 'RobotOrt' | 'RobotRot'
+        :param position: - initial position of the robot
+        :param side: - initial direction of the robot = 0 | 1 | 2 | 3
+        :param buffer_size: - size of the buffer of the records ( bytes )
+        """
+
+        meta = json.dumps({
+            'robot_type': robot_type,
+            'side': int(side),
+            'isServiceable': bool(is_serviceable),
+            'delay': delay,
+            'time': time.time()
+        }).encode()
+
+        data = io.BytesIO()
+        save_map(data, model, robot_type, position, delay)
+        data = data.getvalue()
+
+        self.file = open(filepath, 'wb')
+        self.file.write(MAGIC + struct.pack('<BI', VERSION, len(meta)) + meta + struct.pack('<I', len(data)) + data)
+
+        self.buffer = bytearray(max(buffer_size, 64))
+        self.limit = len(self.buffer) - 24  # free space for the longest record
+        self.pos = 0
+        self.runSide = 0
+        self.runCount = 0  # number of the steps of the current run
+
+        atexit.register(self.close)
+
+    def record(self, command, side, result, error=False):
+        """
+        Put the command into the trace
+
+        :param command: - name of the command ( see COMMANDS, other commands are not recorded )
+        :param side: - argument of the command
+        :param result: - result of the command
+        :param error: - the command raised an error
+        """
+
+        op = OPCODES.get(command)
+        if op is None:
+            return
+
+        code = self._side_code(side)
+
+        if op == OP_STEP and not error:
+            if self.runCount and self.runSide == code:
+                self.runCount += 1
+            else:
+                self._end_run()
+                self.runSide = code
+                self.runCount = 1
+            return
+
+        self._end_run()
+
+        if op == OP_GET_SIDE and not error:
+            code = self._side_code(result)
+        elif op == OP_SENSE:
+            code = NO_SIDE
+
+        self.buffer[self.pos] = op | code << 3 | (result is True) << 6 | bool(error) << 7
+        self.pos += 1
+
+        if op == OP_GET_TMPR and not error:
+            self._put_zigzag(int(result))
+        elif op == OP_SENSE and not error:
+            n, o, s, w, mark, tmpr = result
+            self.buffer[self.pos] = bool(n) | bool(o) << 1 | bool(s) << 2 | bool(w) << 3 | bool(mark) << 4
+            self.pos += 1
+            self._put_zigzag(int(tmpr))
+
+        if self.pos > self.limit:
+            self.flush()
+
+    def flush(self):
+        """ Write the buffer to the file ( the current run of steps remains in the memory ) """
+
+        if self.file is None:
+            return
+
+        if self.pos:
+            self.file.write(memoryview(self.buffer)[:self.pos])
+            self.pos = 0
+        self.file.flush()
+
+    def close(self):
+        """ Write all records and close the file """
+
+        if self.file is None:
+            return
+
+        self._end_run()
+        self.flush()
+        self.file.close()
+        self.file = None
+        atexit.unregister(self.close)
+
+    @staticmethod
+    def _side_code(side):
+        try:
+            return SIDES.get(side, NO_SIDE)
+        except TypeError:  # unhashable argument
+            return NO_SIDE
+
+    def _end_run(self):
+        """ Put the current run of steps into the buffer """
+
+        if not self.runCount:
+            return
+
+        if self.runCount == 1:
+            self.buffer[self.pos] = OP_STEP | self.runSide << 3
+            self.pos += 1
+        else:
+            self.buffer[self.pos] = OP_RUN | self.runSide << 3
+            self.pos += 1
+            self._put_varint(self.runCount)
+        self.runCount = 0
+
+        if self.pos > self.limit:
+            self.flush()
+
+    def _put_zigzag(self, value):
+        self._put_varint(value << 1 if value >= 0 else (-value << 1) - 1)
+
+    def _put_varint(self, value):
+        while value > 0x7F:
+            self.buffer[self.pos] = value & 0x7F | 0x80
+            self.pos += 1
+            value >>= 7
+        self.buffer[self.pos] = value
+        self.pos += 1
+
+
+class TraceReader:
+    """
+    Reader of the trace of the robot commands
+
+    SYNTAX:
+        trace = TraceReader( filepath )
+        trace.meta - dict: robot_type, side, isServiceable, delay, time
+        trace.map - the initial situation on the field ( dict, see mapfile.load_map )
+        trace.mapData - the initial situation as the content of the map file
+        for record in trace: ... - records ( command, side, result, error, count ),
+                                   count > 1 - the run of steps,
+                                   result of sense - ( n, o, s, w, mark, tmpr )
+        for record in trace.commands(): ... - one record for every command
+    """
+
+    def __init__(self, filepath, chunk_size=65536):
+        self.filepath = filepath
+        self.chunkSize = chunk_size
+
+        with open(filepath, 'rb') as f:
+            try:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise TraceFormatError
+                version, length = struct.unpack('<BI', f.read(5))
+                if version not in VERSIONS:
+                    raise TraceFormatError
+                self.meta = json.loads(f.read(length).decode())
+                length, = struct.unpack('<I', f.read(4))
+                self.mapData = f.read(length)
+                self.map = load_map(io.BytesIO(self.mapData))
+            except (struct.error, ValueError):
+                raise TraceFormatError
+            self.offset = f.tell()
+
+    def __iter__(self):
+        """ Generator of the records, the file is read by chunks """
+
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.offset)
+            data = b''
+            pos = 0
+            while True:
+                chunk = f.read(self.chunkSize)
+                eof = len(chunk) < self.chunkSize
+                data = data[pos:] + chunk
+                pos = 0
+                # the last record can be continued in the next chunk, at the end of the file
+                # the rest of the data is decoded to its end
+                end = len(data) if eof else len(data) - 20
+                while pos < end:
+                    byte = data[pos]
+                    pos += 1
+                    op = byte & 7
+                    side = SIDE_NAMES[byte >> 3 & 7]
+                    error = bool(byte & 0x80)
+                    if op == OP_SENSE and side is None:
+                        if error:
+                            yield TraceRecord('sense', None, None, True, 1)
+                        else:
+                            bits, pos = self._get_varint(data, pos)  # one byte, bits < 0x80
+                            value, pos = self._get_zigzag(data, pos)
+                            yield TraceRecord('sense', None, (bool(bits & 1), bool(bits & 2), bool(bits & 4),
+                                                             bool(bits & 8), bool(bits & 16), value), False, 1)
+                    elif op == OP_RUN:
+                        count, pos = self._get_varint(data, pos)
+                        yield TraceRecord('step', side, None, False, count)
+                    elif op == OP_GET_SIDE:
+                        yield TraceRecord('get_side', None, None if error else side, error, 1)
+                    elif op == OP_GET_TMPR and not error:
+                        value, pos = self._get_zigzag(data, pos)
+                        yield TraceRecord('get_tmpr', None, value, False, 1)
+                    elif op in (OP_IS_BORD, OP_IS_MARK) and not error:
+                        yield TraceRecord(COMMANDS[op], side, bool(byte & 0x40), False, 1)
+                    else:
+                        yield TraceRecord(COMMANDS[op], side, None, error, 1)
+                if eof:
+                    return
+
+    def commands(self):
+        """ Generator of the records, the runs of steps are split into single steps """
+
+        for record in self:
+            if record.count == 1:
+                yield record
+            else:
+                step = record._replace(count=1)
+                for _ in range(record.count):
+                    yield step
+
+    @classmethod
+    def _get_zigzag(cls, data, pos):
+        value, pos = cls._get_varint(data, pos)
+        return value >> 1 if not value & 1 else -((value + 1) >> 1), pos
+
+    @staticmethod
+    def _get_varint(data, pos):
+        value = shift = 0
+        while True:
+            try:
+                byte = data[pos]
+            except IndexError:
+                raise TraceFormatError
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, pos
+            shift += 7
@@ -22,5 +22,8 @@ setuptools.setup(
     install_requires=[
         'numpy==1.17.4',
         'matplotlib==3.1.1'
-    ]
+    ],
+    extras_require={
+        'export': ['Pillow']  # GIF export ( MP4 export needs ffmpeg )
+    }
 )
\ No newline at end of file
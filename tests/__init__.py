@@ -0,0 +1,4 @@
+import os
+
+# the windows of the fields are drawn offscreen
+os.environ.setdefault('MPLBACKEND', 'Agg')
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from robot import Robot, RobotOrt
+from robot.exceptions import BatchCommandError, BrokenError
+from robot.robot_engine.model import FieldModel
+from robot.robot_engine.mapfile import save_map
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        model = FieldModel((6, 6), frame=True, tmap=[[k] * 6 for k in range(6)])
+        model.set_hor_bord(2, 4)
+        self.filepath = os.path.join(self.dir, 'field.map')
+        save_map(self.filepath, model, 'Robot', (2, 0), 0.5)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_run(self):
+        r = Robot(self.filepath, headless=True)
+        res = r.run(['n', ('step', 'o'), 'mark', ('walk', 'w', 2), 'is_mark', ('walk_until_mark', 'o'),
+                     ('is_bord', 's'), 'get_tmpr'])
+        self.assertEqual(res, [None, None, None, 2, False, 2, False, 3])
+        self.assertEqual(r.hRobotEngine.hRobot.xy, [3, 1])
+
+    def test_run_checked(self):
+        # the commands are checked before the execution
+        r = Robot(self.filepath, headless=True)
+        for commands in (['n', 'x'], ['n', ('walk', 'q', 1)], ['n', ('rot', 'l')], ['n', ('step',)],
+                         ['n', ('mark', 1)], ['n', 5]):
+            with self.subTest(commands=commands):
+                with self.assertRaises(BatchCommandError):
+                    r.run(commands)
+                self.assertEqual(r.hRobotEngine.hRobot.xy, [2, 0])
+
+        r = RobotOrt(self.filepath, headless=True)
+        self.assertEqual(r.run(['forward', 'right', 'get_side', ('walk', 2)]), [None, None, 'o', 2])
+        with self.assertRaises(BatchCommandError):
+            r.run(['n'])
+
+    def test_batch(self):
+        r = Robot(self.filepath)
+        engine = r.hRobotEngine
+        renderer = engine.hField.renderer
+        self.assertEqual(engine.hRobot.delay, 0.5)
+
+        with r.batch():
+            with r.batch():
+                self.assertEqual(engine.hRobot.delay, 0)
+                self.assertFalse(engine.isEffectOn)
+                self.assertEqual(renderer.paused, 1)
+                r.step('n')
+            # the nested batch does not restore the state
+            self.assertEqual(engine.hRobot.delay, 0)
+            r.step('n')
+
+        self.assertEqual(engine.hRobot.delay, 0.5)
+        self.assertTrue(engine.isEffectOn)
+        self.assertEqual(renderer.paused, 0)
+        self.assertEqual(engine.hRobot.xy, [2, 2])
+
+        # the state is restored after the error
+        engine.delay_off()
+        with self.assertRaises(BrokenError):
+            r.run(['n', 'n', 'n'])
+        self.assertEqual(engine.batchDepth, 0)
+        self.assertTrue(engine.isEffectOn)
+        self.assertEqual(renderer.paused, 0)
+        self.assertEqual(engine.hRobot.xy, [2, 3.25])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from robot.bug import Bug, NoWayToExitError, NoFrameError
+from robot.robot_engine.model import FieldModel
+from robot.robot_engine.mapfile import save_map
+
+
+class TestBug(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def field(self, model):
+        """ Path to the map file of the model """
+        filepath = os.path.join(self.dir, 'bug.map')
+        save_map(filepath, model, 'Robot', (0, 0), 0.5)
+        return filepath
+
+    @staticmethod
+    def maze(size, density, seed):
+        """ Field with random partitions """
+        rng = np.random.RandomState(seed)
+        n, m = size
+        return FieldModel.from_arrays(size, rng.rand(n, m) < density, rng.rand(n, m) < density,
+                                      np.zeros(size, bool), np.zeros(size, int), True)
+
+    @staticmethod
+    def run_bug(filepath, fast):
+        """ Count of steps and the cell of the bug at the end, or the error """
+        bug = Bug(filepath, delay=0)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                n = bug.go(fast=fast)
+        except (NoWayToExitError, NoFrameError) as e:
+            return type(e)
+        return n, [int(v) for v in bug.r.hRobotEngine.hRobot.xy]
+
+    def test_fast(self):
+        # the computed way is the same as the way of the robot step by step
+        for size, density, seed in (((5, 4), 0, 0), ((6, 5), 0.2, 1), ((7, 6), 0.3, 2), ((8, 8), 0.35, 5)):
+            model = self.maze(size, density, seed)
+            with self.subTest(size=size, seed=seed, exit=model.is_reachable((0, size[1] - 1), (size[0] - 1, 0))):
+                filepath = self.field(model)
+                self.assertEqual(self.run_bug(filepath, True), self.run_bug(filepath, False))
+
+    def test_no_exit(self):
+        model = FieldModel((6, 5), frame=True)
+        # the lower right cell is closed
+        model.set_ver_bord(5, 0)
+        model.set_hor_bord(5, 1)
+        filepath = self.field(model)
+        self.assertEqual(self.run_bug(filepath, True), NoWayToExitError)
+        self.assertEqual(self.run_bug(filepath, False), NoWayToExitError)
+
+        filepath = self.field(FieldModel((6, 5), frame=False))
+        self.assertEqual(self.run_bug(filepath, True), NoFrameError)
+        self.assertEqual(self.run_bug(filepath, False), NoFrameError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported(code):
+    """ Runs the code in a clean interpreter, returns its output """
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.check_output([sys.executable, '-c', code], env=env, cwd=ROOT).decode().split()
+
+
+class TestImport(unittest.TestCase):
+
+    def test_lazy(self):
+        # the graphics are loaded by the first window, not by the import
+        code = "import sys, robot; print('matplotlib' in sys.modules, 'tkinter' in sys.modules)"
+        self.assertEqual(imported(code), ['False', 'False'])
+
+    def test_headless(self):
+        code = "import sys; from robot import Robot; Robot; print('matplotlib' in sys.modules)"
+        self.assertEqual(imported(code), ['False'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from robot.robot_engine.layer import LayerRows
+
+
+class TestLayerRows(unittest.TestCase):
+
+    def rows(self, layer):
+        """ Rows of the layer by the keys """
+        return {key: tuple(row) for key, row in zip(layer, layer.array())}
+
+    def test_add_remove(self):
+        layer = LayerRows((2,))
+        for k in range(40):
+            self.assertTrue(layer.add(k, (k, -k)))
+        self.assertFalse(layer.add(3, (30, -30)))
+        self.assertEqual(len(layer), 40)
+        self.assertEqual(layer.array().shape, (40, 2))
+
+        # the removed rows are replaced by the last ones, the rows of the other keys are kept
+        for k in range(0, 40, 3):
+            self.assertTrue(layer.remove(k))
+        self.assertFalse(layer.remove(0))
+        self.assertNotIn(0, layer)
+        self.assertIn(1, layer)
+
+        expected = {k: (k, -k) for k in range(40) if k % 3}
+        self.assertEqual(self.rows(layer), expected)
+
+        for k in range(0, 40, 3):
+            layer.add(k, (k, -k))
+        self.assertEqual(self.rows(layer), {k: (k, -k) for k in range(40)})
+
+    def test_replace_clear(self):
+        layer = LayerRows((3, 2))
+        layer.add('a', np.zeros((3, 2)))
+
+        rows = np.arange(12).reshape(2, 3, 2)
+        layer.replace(['b', 'c'], rows)
+        self.assertNotIn('a', layer)
+        np.testing.assert_array_equal(layer.array(), rows)
+
+        layer.remove('b')
+        np.testing.assert_array_equal(layer.array(), rows[1:])
+
+        layer.clear()
+        self.assertEqual(len(layer), 0)
+        self.assertEqual(layer.array().shape, (0, 3, 2))
+        layer.add('d', rows[0])
+        np.testing.assert_array_equal(layer.array(), rows[:1])
+
+    def test_free_rows(self):
+        # the free rows are not drawn
+        layer = LayerRows((2,))
+        for k in range(5):
+            layer.add(k, (k, k))
+        layer.remove(1)
+        self.assertTrue(np.isnan(layer.data[4:]).all())
+        self.assertFalse(np.isnan(layer.data[:4]).any())
+        layer.clear()
+        self.assertTrue(np.isnan(layer.data).all())
+
+    def test_share(self):
+        layer = LayerRows((3, 2))
+        for k in range(3):
+            layer.add(k, np.full((3, 2), k))
+
+        # the artist keeps its own copy of the array, the edits are written into it
+        artist = layer.data.reshape(-1, 2).copy()
+        self.assertTrue(layer.share(artist))
+        layer.remove(0)
+        layer.add(5, np.full((3, 2), 5))
+        np.testing.assert_array_equal(artist.reshape(-1, 3, 2)[:3], layer.array())
+        np.testing.assert_array_equal(artist.reshape(-1, 3, 2)[layer.index[5]], np.full((3, 2), 5))
+
+        self.assertFalse(layer.share(np.zeros(3)))
+        readonly = layer.data.copy()
+        readonly.flags.writeable = False
+        self.assertFalse(layer.share(readonly))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from robot.exceptions import MapfileFormatError
+from robot.robot_engine.model import FieldModel, is_mapped
+from robot.robot_engine.mapfile import save_map, load_map, convert_map
+
+
+class Forbidden:
+    """ Object of the legacy map file, that calls a function on unpickling """
+
+    def __reduce__(self):
+        return os.getcwd, ()
+
+
+class TestMapFile(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.dir, 'field.map')
+
+        self.model = FieldModel((6, 5), frame=True, tmap=np.arange(30, dtype=np.int8).reshape(6, 5) - 15)
+        self.model.set_ver_bord(3, 2)
+        self.model.set_hor_bord(1, 4)
+        self.model.set_mark(5, 0)
+        self.model.set_mark(2, 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def check(self, r, version=2):
+        self.assertEqual(r['version'], version)
+        self.assertEqual(list(r['size']), [6, 5])
+        self.assertTrue(r['isFrame'])
+        self.assertEqual(r['robot_type'], 'RobotOrt')
+        self.assertEqual(list(r['hRobot_position']), [4, 1])
+        self.assertEqual(r['delay'], 0.25)
+        np.testing.assert_array_equal(r['cells'], self.model.cells)
+        np.testing.assert_array_equal(r['tMap'], self.model.tMap)
+
+    def test_round_trip(self):
+        save_map(self.filepath, self.model, 'RobotOrt', np.array([4, 1]), 0.25)
+        r = load_map(self.filepath)
+        self.check(r)
+        self.assertEqual(r['tMap'].dtype, np.int8)
+
+        model = FieldModel.from_cells(r['size'], r['cells'], r['tMap'], r['isFrame'])
+        self.assertTrue(model.is_ver_bord(3, 2))
+        self.assertTrue(model.is_hor_bord(1, 4))
+        self.assertTrue(model.is_mark(5, 0))
+        self.assertTrue(model.is_bord(0, 0, 3))
+
+    def test_round_trip_file_object(self):
+        self.model.set_tmpr(0, 0, 100000)
+        f = io.BytesIO()
+        save_map(f, self.model, 'RobotOrt', (4, 1), 0.25)
+        f.seek(0)
+        r = load_map(f)
+        self.check(r)
+        self.assertEqual(int(r['tMap'][0, 0]), 100000)
+
+    def test_memmap(self):
+        save_map(self.filepath, self.model, 'RobotOrt', (4, 1), 0.25)
+        r = load_map(self.filepath, mmap_mode='c')
+        self.check(r)
+        self.assertTrue(is_mapped(r['cells']))
+        self.assertTrue(is_mapped(r['tMap']))
+
+        # the changes of the copy on write are not written to the file
+        r['cells'][0, 0] = 0xFF
+        del r
+        self.check(load_map(self.filepath))
+
+        # the mapped matrices are loaded into memory before the file is rewritten
+        r = load_map(self.filepath, mmap_mode='r')
+        model = FieldModel.from_cells(r['size'], r['cells'], r['tMap'], r['isFrame'])
+        save_map(self.filepath, model, 'RobotOrt', (4, 1), 0.25)
+        self.assertFalse(is_mapped(model.cells))
+        self.check(load_map(self.filepath))
+
+    def legacy(self, **values):
+        """ Write the map file of the version 1 """
+
+        r = {
+            'hVerBord': self.model.hVerBord,
+            'hHorBord': self.model.hHorBord,
+            'hMark': self.model.hMark,
+            'tMap': np.array(self.model.tMap),
+            'hRobot_position': np.array([4, 1]),
+            'robot_type': 'RobotOrt',
+            'isFrame': True,
+            'size': [6, 5],
+            'delay': 0.25
+        }
+        r.update(values)
+        with open(self.filepath, 'wb') as f:
+            pickle.dump(r, f)
+
+    def test_legacy(self):
+        self.legacy()
+        self.check(load_map(self.filepath), version=1)
+
+        self.assertTrue(convert_map(self.filepath))
+        self.check(load_map(self.filepath))
+        self.assertFalse(convert_map(self.filepath))
+
+    def test_legacy_forbidden(self):
+        self.legacy(delay=Forbidden())
+        with self.assertRaises(MapfileFormatError):
+            load_map(self.filepath)
+
+    def write(self, header=None, **arrays):
+        """ Write the map file of the version 2 with the changed header values or matrices """
+
+        save_map(self.filepath, self.model, 'RobotOrt', (4, 1), 0.25)
+        with np.load(self.filepath) as data:
+            r = {name: data[name] for name in data.files}
+        r['header'] = np.frombuffer(json.dumps(dict(json.loads(r['header'].tobytes().decode()), **(header or {})))
+                                    .encode(), dtype=np.uint8)
+        r.update(arrays)
+        with open(self.filepath, 'wb') as f:
+            np.savez(f, **r)
+
+    def test_bad_dtype(self):
+        for arrays in ({'tMap': np.full((6, 5), 'x')}, {'tMap': np.zeros((6, 5))},
+                       {'cells': np.zeros((6, 5), dtype=np.int32)}, {'cells': np.zeros((5, 6), dtype=np.uint8)}):
+            with self.subTest(arrays=list(arrays)):
+                self.write(**arrays)
+                with self.assertRaises(MapfileFormatError):
+                    load_map(self.filepath)
+                with self.assertRaises(MapfileFormatError):
+                    load_map(self.filepath, mmap_mode='r')
+
+    def test_bad_header(self):
+        for header in ({'delay': 'fast'}, {'delay': True}, {'size': [6]}, {'size': [6.0, 5]},
+                       {'hRobot_position': None}, {'hRobot_position': [1, '2']}, {'robot_type': 'Bug'}):
+            with self.subTest(header=header):
+                self.write(header)
+                with self.assertRaises(MapfileFormatError):
+                    load_map(self.filepath)
+
+        self.write({'delay': None})
+        self.assertIsNone(load_map(self.filepath)['delay'])
+
+    def test_broken_robot(self):
+        # the cell of the broken robot is saved
+        save_map(self.filepath, self.model, 'RobotOrt', np.array([4.25, 0.75]), 0.25)
+        self.check(load_map(self.filepath))
+
+    def test_not_map(self):
+        with open(self.filepath, 'wb') as f:
+            f.write(b'not a map file')
+        with self.assertRaises(MapfileFormatError):
+            load_map(self.filepath)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+import numpy as np
+from robot.robot_engine.model import FieldModel, Occupancy
+
+
+def reachable(model, x, y):
+    """ Reference: breadth-first search by the checks of the partitions """
+
+    n, m = model.size
+    seen = np.zeros((n, m), dtype=bool)
+    seen[x, y] = True
+    queue = [(x, y)]
+    for x, y in queue:
+        for side, (dx, dy) in enumerate(((0, 1), (1, 0), (0, -1), (-1, 0))):
+            i, j = x + dx, y + dy
+            if 0 <= i < n and 0 <= j < m and not seen[i, j] and not model.is_bord(x, y, side):
+                seen[i, j] = True
+                queue.append((i, j))
+    return seen
+
+
+class TestReachable(unittest.TestCase):
+
+    def test_random(self):
+        rnd = np.random.RandomState(0)
+        for size in ((1, 1), (1, 9), (9, 1), (2, 3), (17, 11), (40, 40)):
+            for density in (0, 0.2, 0.45, 1):
+                n, m = size
+                model = FieldModel.from_arrays(size, rnd.rand(n, m) < density, rnd.rand(n, m) < density,
+                                               np.zeros(size, bool), np.zeros(size, int), frame=True)
+                x, y = rnd.randint(n), rnd.randint(m)
+                with self.subTest(size=size, density=density):
+                    np.testing.assert_array_equal(model.reachable(x, y), reachable(model, x, y))
+
+    def test_snake(self):
+        # the way through all columns, it turns at the top and at the bottom of the field
+        n, m = 30, 8
+        model = FieldModel((n, m), frame=True)
+        for x in range(1, n):
+            for y in range(m):
+                if y != (m - 1 if x % 2 else 0):
+                    model.set_ver_bord(x, y)
+        # the last column is entered at the top, its lower part is closed
+        model.set_hor_bord(n - 1, 4)
+
+        expected = reachable(model, 0, 0)
+        self.assertFalse(expected[n - 1, 0])
+        np.testing.assert_array_equal(model.reachable(0, 0), expected)
+        self.assertTrue(model.is_reachable((0, 0), (n - 1, 4)))
+        self.assertFalse(model.is_reachable((0, 0), (n - 1, 3)))
+
+    def test_random_walls(self):
+        rnd = random.Random(1)
+        model = FieldModel((25, 25), frame=True)
+        for _ in range(300):
+            if rnd.random() < 0.5:
+                model.set_ver_bord(rnd.randrange(1, 25), rnd.randrange(25))
+            else:
+                model.set_hor_bord(rnd.randrange(25), rnd.randrange(1, 25))
+            x, y = rnd.randrange(25), rnd.randrange(25)
+            np.testing.assert_array_equal(model.reachable(x, y), reachable(model, x, y))
+
+
+class TestOccupancy(unittest.TestCase):
+
+    def test_move(self):
+        occupancy = Occupancy()
+        occupancy.move(1, 0, 0)
+        occupancy.move(2, -3, 5)
+        self.assertEqual(occupancy.get(0, 0), 1)
+        self.assertEqual(occupancy.get(-3, 5), 2)
+
+        occupancy.move(1, 0, 1)
+        self.assertEqual(occupancy.get(0, 0), 0)
+        self.assertEqual(occupancy.get(0, 1), 1)
+
+        # the cell, that is taken by another robot, is not freed by the move
+        occupancy.move(2, 0, 1)
+        occupancy.move(1, 4, 4)
+        self.assertEqual(occupancy.get(0, 1), 2)
+        self.assertEqual(occupancy.cells, {(0, 1): 2, (4, 4): 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+from robot import Robot, RobotOrt
+from robot.exceptions import CollisionError
+from robot.robot_engine.model import FieldModel
+from robot.robot_engine.mapfile import save_map
+
+
+class TestRobots(unittest.TestCase):
+    """ Several robots on one field, for the headless and the offscreen graphic field """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def field(self, model, position=(0, 0)):
+        """ Path to the map file of the model """
+        filepath = os.path.join(self.dir, 'field.map')
+        save_map(filepath, model, 'Robot', position, 0)
+        return filepath
+
+    def robots(self, headless, model, *positions):
+        """ The first robot from the map file and the other robots on its field, without delays """
+        r = Robot(self.field(model, positions[0]), headless=headless)
+        robots = [r] + [Robot(field=r, position=p) for p in positions[1:]]
+        for robot in robots:
+            robot.hRobotEngine.delay_off()
+        return robots
+
+    @staticmethod
+    def xy(r):
+        return [float(v) for v in r.hRobotEngine.hRobot.xy]
+
+    def test_step(self):
+        for headless in (True, False):
+            with self.subTest(headless=headless):
+                a, b = self.robots(headless, FieldModel((5, 5), frame=True), (1, 1), (2, 1))
+
+                with self.assertRaises(CollisionError):
+                    a.step('o')
+                self.assertEqual(self.xy(a), [1, 1])
+                # the robot is still serviceable, the cell is free after the other robot goes away
+                b.step('n')
+                a.step('o')
+                self.assertEqual(self.xy(a), [2, 1])
+                with self.assertRaises(CollisionError):
+                    b.step('s')
+                self.assertEqual(self.xy(b), [2, 2])
+
+    def test_add(self):
+        for headless in (True, False):
+            with self.subTest(headless=headless):
+                a, b = self.robots(headless, FieldModel((5, 5), frame=True), (1, 1), (3, 3))
+
+                with self.assertRaises(CollisionError):
+                    Robot(field=a, position=(1, 1))
+                with self.assertRaises(CollisionError):
+                    RobotOrt(field=a, position=(3, 3), side=1)
+                # the robot took the cell of a robot, that left it
+                a.step('s')
+                c = Robot(field=a, position=(1, 1))
+                self.assertEqual(self.xy(c), [1, 1])
+
+    def test_walk(self):
+        for headless in (True, False):
+            with self.subTest(headless=headless):
+                model = FieldModel((8, 5), frame=True)
+                model.set_mark(6, 2)
+                a, b = self.robots(headless, model, (0, 2), (5, 2))
+
+                # the macros stop in the cell before the other robot
+                with self.assertRaises(CollisionError):
+                    a.walk('o', 7)
+                self.assertEqual(self.xy(a), [4, 2])
+                with self.assertRaises(CollisionError):
+                    a.walk_until_border('o')
+                with self.assertRaises(CollisionError):
+                    a.walk_until_mark('o')
+                self.assertEqual(self.xy(a), [4, 2])
+                # the walk shorter than the distance to the robot is not stopped
+                self.assertEqual(a.walk('w', 4), 4)
+                self.assertEqual(a.walk('o', 4), 4)
+                # the robot in the other row does not stop the walk
+                b.step('n')
+                self.assertEqual(a.walk_until_mark('o'), 2)
+                self.assertEqual(a.walk_until_border('o'), 1)
+                self.assertEqual(self.xy(a), [7, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
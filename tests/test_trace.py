@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+from robot import Robot
+from robot.robot_engine.model import FieldModel
+from robot.robot_engine.mapfile import save_map
+from robot.robot_engine.player import TracePlayer
+from robot.robot_engine.trace import TraceWriter, TraceReader
+
+
+class TestTraceRoundTrip(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.dir, 'run.trace')
+        self.model = FieldModel((8, 8), frame=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, records):
+        trace = TraceWriter(self.filepath, self.model, 'Robot', (0, 0))
+        for record in records:
+            trace.record(*record)
+        trace.close()
+
+    def test_chunk_boundary(self):
+        # the records of one byte end exactly on the boundary of the chunks
+        for n in (32, 64, 65536):
+            records = [('is_bord', 'nosw'[k % 4], k % 3 == 0) for k in range(n)]
+            self.write(records)
+            for chunk_size in (32, 64, 65536):
+                with self.subTest(records=n, chunk_size=chunk_size):
+                    read = [(r.command, r.side, r.result) for r in TraceReader(self.filepath, chunk_size)]
+                    self.assertEqual(read, records)
+
+    def test_varints(self):
+        records = [('get_tmpr', None, t) for t in (0, 1, -1, 63, -64, 300, -70000, 2 ** 40)]
+        self.write(records)
+        for chunk_size in (1, 2, 3, 64):
+            with self.subTest(chunk_size=chunk_size):
+                read = [(r.command, r.side, r.result) for r in TraceReader(self.filepath, chunk_size)]
+                self.assertEqual(read, records)
+
+    def test_runs_and_errors(self):
+        self.write([('step', 'n', None)] * 5 + [('step', 'o', None), ('rot', 'L', None),
+                                                  ('step', 's', None, True), ('get_side', None, 'w')])
+        read = [tuple(r) for r in TraceReader(self.filepath)]
+        self.assertEqual(read, [('step', 'n', None, False, 5), ('step', 'o', None, False, 1),
+                                ('rot', 'L', None, False, 1), ('step', 's', None, True, 1),
+                                ('get_side', None, 'w', False, 1)])
+
+    def test_sense(self):
+        records = [('sense', None, (True, False, False, True, True, -300)), ('sense', None, None, True),
+                   ('sense', None, (False, True, True, False, False, 7))]
+        self.write(records)
+        read = [tuple(r) for r in TraceReader(self.filepath)]
+        self.assertEqual(read, [('sense', None, records[0][2], False, 1), ('sense', None, None, True, 1),
+                                ('sense', None, records[2][2], False, 1)])
+
+    def test_player_sense(self):
+        mapfile = os.path.join(self.dir, 'field.map')
+        self.model.set_hor_bord(2, 1)  # the partition on the North side of the cell 2, 0
+        self.model.set_tmpr(2, 0, 5)
+        save_map(mapfile, self.model, 'Robot', (2, 0), 0.5)
+
+        r = Robot(mapfile, headless=True)
+        r._trace_on(self.filepath)
+        r.sense()
+        r.step('o')
+        r.mark()
+        self.assertEqual(tuple(r.sense()), (False, False, True, False, True, int(self.model.tMap[3, 0])))
+        r.step('n')
+        r._trace_off()
+
+        sense = [record.result for record in TraceReader(self.filepath) if record.command == 'sense']
+        self.assertEqual(sense, [(True, False, True, False, False, 5),
+                                 (False, False, True, False, True, int(self.model.tMap[3, 0]))])
+
+        p = TracePlayer(self.filepath)
+        self.assertEqual(p.total, 5)
+        p.seek(p.total)
+        self.assertEqual(p.state, [3, 1, 0, True, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from robot import Robot, RobotOrt
+from robot.exceptions import BrokenError, ServiceError, EndlessWalkError, StepsValueError
+from robot.robot_engine.model import FieldModel
+from robot.robot_engine.mapfile import save_map
+
+
+class TestWalk(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def field(self, model, position=(0, 0), robot_type='Robot'):
+        """ Path to the map file of the model """
+        filepath = os.path.join(self.dir, 'field.map')
+        save_map(filepath, model, robot_type, position, 0.5)
+        return filepath
+
+    def test_same_as_steps(self):
+        # the macros give the same cells and errors as the loops of the commands
+        rnd = random.Random(1)
+        for seed in range(20):
+            model = FieldModel((12, 9), frame=True)
+            for _ in range(15):
+                model.set_ver_bord(rnd.randrange(1, 12), rnd.randrange(9))
+                model.set_hor_bord(rnd.randrange(12), rnd.randrange(1, 9))
+                model.set_mark(rnd.randrange(12), rnd.randrange(9))
+            filepath = self.field(model, (rnd.randrange(12), rnd.randrange(9)))
+            a = Robot(filepath, headless=True)
+            b = Robot(filepath, headless=True)
+
+            for _ in range(20):
+                kind, side, n = rnd.choice(('border', 'mark', 'walk')), rnd.choice('nosw'), rnd.randrange(5)
+                with self.subTest(seed=seed, kind=kind, side=side, n=n):
+                    self.assertEqual(self.macro(a, kind, side, n), self.loop(b, kind, side, n))
+                    self.assertEqual(a.hRobotEngine.hRobot.xy, b.hRobotEngine.hRobot.xy)
+                if not b.hRobotEngine.isServiceable:
+                    break
+
+    @staticmethod
+    def macro(r, kind, side, n):
+        try:
+            if kind == 'border':
+                return r.walk_until_border(side)
+            if kind == 'mark':
+                return r.walk_until_mark(side)
+            return r.walk(side, n)
+        except BrokenError:
+            return 'broken'
+
+    @staticmethod
+    def loop(r, kind, side, n):
+        k = 0
+        try:
+            if kind == 'border':
+                while not r.is_bord(side):
+                    r.step(side)
+                    k += 1
+            elif kind == 'mark':
+                while not r.is_mark():
+                    r.step(side)
+                    k += 1
+            else:
+                for k in range(n):
+                    r.step(side)
+                k = n
+        except BrokenError:
+            return 'broken'
+        return k
+
+    def test_broken(self):
+        model = FieldModel((5, 5), frame=True)
+        model.set_ver_bord(3, 1)
+        r = Robot(self.field(model, (0, 1)), headless=True)
+
+        self.assertEqual(r.walk('o', 2), 2)
+        with self.assertRaises(BrokenError):
+            r.walk('o', 2)
+        self.assertEqual(r.hRobotEngine.hRobot.xy, [2.25, 1])
+        with self.assertRaises(ServiceError):
+            r.walk('w')
+
+    def test_errors(self):
+        r = Robot(self.field(FieldModel((5, 5))), headless=True)
+
+        with self.assertRaises(StepsValueError):
+            r.walk('n', -1)
+        # there is no frame and no markers ahead
+        with self.assertRaises(EndlessWalkError):
+            r.walk_until_border('s')
+        with self.assertRaises(EndlessWalkError):
+            r.walk_until_mark('w')
+        self.assertEqual(r.hRobotEngine.hRobot.xy, [0, 0])
+
+    def test_outside(self):
+        r = Robot(self.field(FieldModel((5, 5))), headless=True)
+
+        self.assertEqual(r.walk('w', 3), 3)
+        r.mark()
+        self.assertEqual(r.walk('o', 7), 7)
+        self.assertEqual(r.walk_until_mark('w'), 7)
+        self.assertEqual(r.hRobotEngine.hRobot.xy, [-3, 0])
+
+    def test_relative(self):
+        model = FieldModel((6, 6), frame=True)
+        model.set_mark(0, 4)
+        r = RobotOrt(self.field(model, (0, 0), 'RobotOrt'), headless=True)
+
+        self.assertEqual(r.walk_until_mark(), 4)
+        self.assertEqual(r.walk_until_border(), 1)
+        r.right()
+        self.assertEqual(r.walk(3), 3)
+        self.assertEqual(r.hRobotEngine.hRobot.xy, [3, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()